@@ -4,7 +4,7 @@ Combines all v1 API routers
 """
 from fastapi import APIRouter
 
-from app.api.v1 import candidates, admin, scraper, proxy
+from app.api.v1 import candidates, admin, scraper, proxy, metrics
 
 # Create main API router
 api_router = APIRouter(prefix="/api")
@@ -14,3 +14,4 @@ api_router.include_router(candidates.router)
 api_router.include_router(admin.router)
 api_router.include_router(scraper.router)
 api_router.include_router(proxy.router)
+api_router.include_router(metrics.router)
@@ -2,88 +2,165 @@
 Admin API Routes
 Handles admin dashboard operations
 """
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
-from typing import Dict, Any, Optional
+from fastapi import APIRouter, HTTPException, Query, UploadFile, File, Form, Depends, Request
+from fastapi.responses import StreamingResponse
+from typing import Dict, Any, Literal, Optional
+import asyncio
 import httpx
 
 from app.config import settings
+from app.services.upstream import UpstreamClients, get_upstream
+from app.services.cache import admin_cache, LIST_KEY, MISSING, record_key
+from app.services.mirror import mirror_store
+from app.services.listing import ADMIN_TABLE, list_records
+from app.services.admin_stats import admin_stats, current_stats
+from app.models.listing import ListQuery, StatusFilter
+from app.utils.http_cache import json_with_etag
+from app.services.airtable import (
+    NDJSON_MEDIA_TYPE,
+    iter_record_pages,
+    list_all_records,
+    ndjson_from_list,
+    ndjson_lines,
+)
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
 @router.get("/candidates")
-async def get_admin_candidates():
-    """Get all candidates for admin dashboard"""
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://api.airtable.com/v0/{settings.AIRTABLE_BASE_ID_ADMIN}/{settings.AIRTABLE_TABLE_ID_ADMIN}",
+async def get_admin_candidates(
+    request: Request,
+    stream: bool = False,
+    sort: Optional[str] = None,
+    direction: Literal["asc", "desc"] = "desc",
+    q: Optional[str] = None,
+    status: Optional[StatusFilter] = None,
+    position: Optional[str] = None,
+    since_days: Optional[int] = Query(None, ge=0),
+    page_size: Optional[int] = Query(None, ge=1, le=100),
+    cursor: Optional[str] = None,
+    upstream: UpstreamClients = Depends(get_upstream),
+):
+    """
+    Get all candidates for admin dashboard; `stream=true` returns NDJSON as pages arrive.
+    With any sort, filter or page option, returns one page and the `offset`
+    cursor for the next one instead.
+    """
+    query = ListQuery(
+        sort=sort, direction=direction, q=q, status=status, position=position,
+        since_days=since_days, page_size=page_size, cursor=cursor,
+    )
+    if not query.is_empty():
+        try:
+            mirrored = await asyncio.to_thread(mirror_store.records, "admin")
+            page = await list_records(
+                upstream.airtable_admin,
+                settings.AIRTABLE_TABLE_ID_ADMIN,
+                query,
+                ADMIN_TABLE,
                 params={"view": settings.AIRTABLE_VIEW_ID_ADMIN},
-                headers={
-                    "Authorization": f"Bearer {settings.AIRTABLE_API_KEY_ADMIN}",
-                    "Content-Type": "application/json",
-                },
+                local=mirrored,
+                cache=admin_cache,
             )
-            response.raise_for_status()
-            return response.json()
+            return json_with_etag(request, page)
+        except httpx.HTTPError as error:
+            print(f"Error fetching admin candidates: {error}")
+            raise HTTPException(status_code=500, detail="Failed to fetch data from Airtable")
+
+    mirrored = await asyncio.to_thread(mirror_store.records, "admin")
+    if mirrored is not None:
+        if stream:
+            return StreamingResponse(ndjson_from_list(mirrored), media_type=NDJSON_MEDIA_TYPE)
+        return json_with_etag(request, {"records": mirrored})
+
+    cached = admin_cache.get(LIST_KEY)
+    if cached is not MISSING:
+        if stream:
+            return StreamingResponse(ndjson_from_list(cached["records"]), media_type=NDJSON_MEDIA_TYPE)
+        return json_with_etag(request, cached)
+
+    try:
+        params = {"view": settings.AIRTABLE_VIEW_ID_ADMIN}
+        if stream:
+            pages = iter_record_pages(upstream.airtable_admin, settings.AIRTABLE_TABLE_ID_ADMIN, params)
+            first_page = await anext(pages)
+            return StreamingResponse(ndjson_lines(first_page, pages), media_type=NDJSON_MEDIA_TYPE)
+
+        records = await list_all_records(upstream.airtable_admin, settings.AIRTABLE_TABLE_ID_ADMIN, params)
+        data = {"records": records}
+        admin_cache.set(LIST_KEY, data)
+        return json_with_etag(request, data)
     except httpx.HTTPError as error:
         print(f"Error fetching admin candidates: {error}")
         raise HTTPException(status_code=500, detail="Failed to fetch data from Airtable")
 
 
+@router.get("/stats")
+async def get_admin_stats(request: Request, upstream: UpstreamClients = Depends(get_upstream)):
+    """Dashboard summary: counts, averages, score distribution and the 30-day trend"""
+    try:
+        return json_with_etag(request, await current_stats(admin_stats, upstream))
+    except httpx.HTTPError as error:
+        print(f"Error computing admin stats: {error}")
+        raise HTTPException(status_code=500, detail="Failed to fetch data from Airtable")
+
+
 @router.get("/candidates/{id}")
-async def get_admin_candidate(id: str):
+async def get_admin_candidate(id: str, request: Request, upstream: UpstreamClients = Depends(get_upstream)):
     """Get a specific candidate for admin dashboard"""
+    mirrored = await asyncio.to_thread(mirror_store.get, "admin", id)
+    if mirrored is not None:
+        return json_with_etag(request, mirrored)
+
+    cached = admin_cache.get(record_key(id))
+    if cached is not MISSING:
+        return json_with_etag(request, cached)
+
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://api.airtable.com/v0/{settings.AIRTABLE_BASE_ID_ADMIN}/{settings.AIRTABLE_TABLE_ID_ADMIN}/{id}",
-                headers={
-                    "Authorization": f"Bearer {settings.AIRTABLE_API_KEY_ADMIN}",
-                    "Content-Type": "application/json",
-                },
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await upstream.airtable_admin.get(f"/{settings.AIRTABLE_TABLE_ID_ADMIN}/{id}")
+        response.raise_for_status()
+        data = response.json()
+        admin_cache.set(record_key(id), data)
+        return json_with_etag(request, data)
     except httpx.HTTPError as error:
         print(f"Error fetching admin candidate {id}: {error}")
         raise HTTPException(status_code=500, detail="Failed to fetch candidate from Airtable")
 
 
 @router.patch("/candidates/{id}")
-async def update_admin_candidate(id: str, body: Dict[str, Any]):
+async def update_admin_candidate(
+    id: str, body: Dict[str, Any], upstream: UpstreamClients = Depends(get_upstream)
+):
     """Update candidate in admin dashboard"""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.patch(
-                f"https://api.airtable.com/v0/{settings.AIRTABLE_BASE_ID_ADMIN}/{settings.AIRTABLE_TABLE_ID_ADMIN}/{id}",
-                json=body,
-                headers={
-                    "Authorization": f"Bearer {settings.AIRTABLE_API_KEY_ADMIN}",
-                    "Content-Type": "application/json",
-                },
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await upstream.airtable_admin.patch(
+            f"/{settings.AIRTABLE_TABLE_ID_ADMIN}/{id}",
+            json=body,
+        )
+        response.raise_for_status()
+        data = response.json()
+        # PATCH returns the full updated record, so refresh it in place
+        admin_cache.set(record_key(id), data)
+        admin_cache.delete(LIST_KEY)
+        await asyncio.to_thread(mirror_store.upsert, "admin", [data])
+        admin_stats.apply(data)
+        return data
     except httpx.HTTPError as error:
         print(f"Error updating admin candidate: {error}")
         raise HTTPException(status_code=500, detail="Failed to update candidate")
 
 
 @router.delete("/candidates/{id}")
-async def delete_admin_candidate(id: str):
+async def delete_admin_candidate(id: str, upstream: UpstreamClients = Depends(get_upstream)):
     """Delete candidate from admin dashboard"""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.delete(
-                f"https://api.airtable.com/v0/{settings.AIRTABLE_BASE_ID_ADMIN}/{settings.AIRTABLE_TABLE_ID_ADMIN}/{id}",
-                headers={
-                    "Authorization": f"Bearer {settings.AIRTABLE_API_KEY_ADMIN}",
-                    "Content-Type": "application/json",
-                },
-            )
-            response.raise_for_status()
-            return {"message": "Candidate deleted successfully"}
+        response = await upstream.airtable_admin.delete(f"/{settings.AIRTABLE_TABLE_ID_ADMIN}/{id}")
+        response.raise_for_status()
+        admin_cache.delete(record_key(id))
+        admin_cache.delete(LIST_KEY)
+        await asyncio.to_thread(mirror_store.delete, "admin", id)
+        admin_stats.remove(id)
+        return {"message": "Candidate deleted successfully"}
     except httpx.HTTPError as error:
         print(f"Error deleting admin candidate: {error}")
         raise HTTPException(status_code=500, detail="Failed to delete candidate")
@@ -95,6 +172,7 @@ async def upload_resume(
     recordId: str = Form(...),
     name: Optional[str] = Form(None),
     email: Optional[str] = Form(None),
+    upstream: UpstreamClients = Depends(get_upstream),
 ):
     """Upload resume to N8N webhook"""
     try:
@@ -105,31 +183,31 @@ async def upload_resume(
         if email:
             data["email"] = email
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                settings.N8N_RESUME_WEBHOOK_URL,
-                files=files,
-                data=data,
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await upstream.n8n.post(
+            settings.N8N_RESUME_WEBHOOK_URL,
+            files=files,
+            data=data,
+        )
+        response.raise_for_status()
+        return response.json()
     except Exception as error:
         print(f"Error uploading resume: {error}")
         raise HTTPException(status_code=500, detail="Failed to upload resume")
 
 
 @router.post("/regenerate-questions")
-async def regenerate_questions(body: Dict[str, Any]):
+async def regenerate_questions(
+    body: Dict[str, Any], upstream: UpstreamClients = Depends(get_upstream)
+):
     """Regenerate interview questions via N8N webhook"""
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                settings.N8N_REGENERATE_WEBHOOK_URL,
-                json=body,
-                headers={"Content-Type": "application/json"},
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await upstream.n8n.post(
+            settings.N8N_REGENERATE_WEBHOOK_URL,
+            json=body,
+            headers={"Content-Type": "application/json"},
+        )
+        response.raise_for_status()
+        return response.json()
     except Exception as error:
         print(f"Error regenerating questions: {error}")
         raise HTTPException(status_code=500, detail="Failed to regenerate questions")
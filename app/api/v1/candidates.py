@@ -2,87 +2,135 @@
 Candidate API Routes
 Handles user-facing candidate operations
 """
-from fastapi import APIRouter, HTTPException
-from typing import Dict, Any
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
+from fastapi.responses import StreamingResponse
+from typing import Dict, Any, Literal, Optional
+import asyncio
 import httpx
 
 from app.config import settings
+from app.services.upstream import UpstreamClients, get_upstream
+from app.services.cache import user_cache, LIST_KEY, MISSING
+from app.services.mirror import mirror_store
+from app.services.listing import USER_TABLE, list_records
+from app.models.listing import ListQuery
+from app.utils.http_cache import json_with_etag
+from app.services.airtable import (
+    NDJSON_MEDIA_TYPE,
+    iter_record_pages,
+    list_all_records,
+    ndjson_from_list,
+    ndjson_lines,
+)
 
 router = APIRouter(prefix="/candidates", tags=["candidates"])
 
 
 @router.get("")
-async def get_candidates():
-    """Get all candidates (User)"""
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://api.airtable.com/v0/{settings.AIRTABLE_BASE_ID_USER}/{settings.AIRTABLE_TABLE_ID_USER}",
-                headers={
-                    "Authorization": f"Bearer {settings.AIRTABLE_API_KEY_USER}",
-                    "Content-Type": "application/json",
-                },
+async def get_candidates(
+    request: Request,
+    stream: bool = False,
+    sort: Optional[str] = None,
+    direction: Literal["asc", "desc"] = "desc",
+    q: Optional[str] = None,
+    page_size: Optional[int] = Query(None, ge=1, le=100),
+    cursor: Optional[str] = None,
+    upstream: UpstreamClients = Depends(get_upstream),
+):
+    """
+    Get all candidates (User); `stream=true` returns NDJSON as pages arrive.
+    With `sort`, `q`, `page_size` or `cursor`, returns one sorted, filtered
+    page and the `offset` cursor for the next one instead.
+    """
+    query = ListQuery(sort=sort, direction=direction, q=q, page_size=page_size, cursor=cursor)
+    if not query.is_empty():
+        try:
+            mirrored = await asyncio.to_thread(mirror_store.records, "user")
+            page = await list_records(
+                upstream.airtable_user,
+                settings.AIRTABLE_TABLE_ID_USER,
+                query,
+                USER_TABLE,
+                local=mirrored,
+                cache=user_cache,
             )
-            response.raise_for_status()
-            return response.json()
+            return json_with_etag(request, page)
+        except httpx.HTTPError as error:
+            print(f"Error fetching candidates: {error}")
+            raise HTTPException(status_code=500, detail="Failed to fetch candidates")
+
+    mirrored = await asyncio.to_thread(mirror_store.records, "user")
+    if mirrored is not None:
+        if stream:
+            return StreamingResponse(ndjson_from_list(mirrored), media_type=NDJSON_MEDIA_TYPE)
+        return json_with_etag(request, {"records": mirrored})
+
+    cached = user_cache.get(LIST_KEY)
+    if cached is not MISSING:
+        if stream:
+            return StreamingResponse(ndjson_from_list(cached["records"]), media_type=NDJSON_MEDIA_TYPE)
+        return json_with_etag(request, cached)
+
+    try:
+        if stream:
+            pages = iter_record_pages(upstream.airtable_user, settings.AIRTABLE_TABLE_ID_USER)
+            first_page = await anext(pages)
+            return StreamingResponse(ndjson_lines(first_page, pages), media_type=NDJSON_MEDIA_TYPE)
+
+        records = await list_all_records(upstream.airtable_user, settings.AIRTABLE_TABLE_ID_USER)
+        data = {"records": records}
+        user_cache.set(LIST_KEY, data)
+        return json_with_etag(request, data)
     except httpx.HTTPError as error:
         print(f"Error fetching candidates: {error}")
         raise HTTPException(status_code=500, detail="Failed to fetch candidates")
 
 
 @router.get("/{id}")
-async def get_candidate(id: str):
+async def get_candidate(id: str, request: Request, upstream: UpstreamClients = Depends(get_upstream)):
     """Get a specific candidate (User)"""
+    mirrored = await asyncio.to_thread(mirror_store.get, "user", id)
+    if mirrored is not None:
+        return json_with_etag(request, mirrored)
+
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://api.airtable.com/v0/{settings.AIRTABLE_BASE_ID_USER}/{settings.AIRTABLE_TABLE_ID_USER}/{id}",
-                headers={
-                    "Authorization": f"Bearer {settings.AIRTABLE_API_KEY_USER}",
-                    "Content-Type": "application/json",
-                },
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await upstream.airtable_user.get(f"/{settings.AIRTABLE_TABLE_ID_USER}/{id}")
+        response.raise_for_status()
+        return json_with_etag(request, response.json())
     except httpx.HTTPError as error:
         print(f"Error fetching candidate {id}: {error}")
         raise HTTPException(status_code=500, detail="Failed to fetch candidate")
 
 
 @router.patch("/{id}")
-async def update_candidate(id: str, body: Dict[str, Any]):
+async def update_candidate(
+    id: str, body: Dict[str, Any], upstream: UpstreamClients = Depends(get_upstream)
+):
     """Update candidate (User)"""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.patch(
-                f"https://api.airtable.com/v0/{settings.AIRTABLE_BASE_ID_USER}/{settings.AIRTABLE_TABLE_ID_USER}/{id}",
-                json=body,
-                headers={
-                    "Authorization": f"Bearer {settings.AIRTABLE_API_KEY_USER}",
-                    "Content-Type": "application/json",
-                },
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await upstream.airtable_user.patch(
+            f"/{settings.AIRTABLE_TABLE_ID_USER}/{id}",
+            json=body,
+        )
+        response.raise_for_status()
+        data = response.json()
+        user_cache.delete(LIST_KEY)
+        await asyncio.to_thread(mirror_store.upsert, "user", [data])
+        return data
     except httpx.HTTPError as error:
         print(f"Error updating candidate: {error}")
         raise HTTPException(status_code=500, detail="Failed to update candidate")
 
 
 @router.delete("/{id}")
-async def delete_candidate(id: str):
+async def delete_candidate(id: str, upstream: UpstreamClients = Depends(get_upstream)):
     """Delete candidate (User)"""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.delete(
-                f"https://api.airtable.com/v0/{settings.AIRTABLE_BASE_ID_USER}/{settings.AIRTABLE_TABLE_ID_USER}/{id}",
-                headers={
-                    "Authorization": f"Bearer {settings.AIRTABLE_API_KEY_USER}",
-                    "Content-Type": "application/json",
-                },
-            )
-            response.raise_for_status()
-            return {"message": "Candidate deleted successfully"}
+        response = await upstream.airtable_user.delete(f"/{settings.AIRTABLE_TABLE_ID_USER}/{id}")
+        response.raise_for_status()
+        user_cache.delete(LIST_KEY)
+        await asyncio.to_thread(mirror_store.delete, "user", id)
+        return {"message": "Candidate deleted successfully"}
     except httpx.HTTPError as error:
         print(f"Error deleting candidate: {error}")
         raise HTTPException(status_code=500, detail="Failed to delete candidate")
@@ -0,0 +1,40 @@
+"""
+Metrics API Routes
+Exposes runtime counters for caches, upstream clients, the browser pool, scrape jobs and the Airtable mirror
+"""
+from fastapi import APIRouter, Depends
+
+from app.services.cache import cache_stats
+from app.services.candidate_index import candidate_index
+from app.services.html_cache import html_cache
+from app.services.llm_cache import extraction_cache
+from app.services.upstream import UpstreamClients, get_upstream
+from app.services.browser_pool import BrowserPool, get_browser_pool
+from app.services.jobs import JobQueue, get_job_queue
+from app.services.pdf import PdfRenderer, get_pdf_renderer
+from app.services.mirror import MirrorSync, get_mirror_sync
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("")
+async def get_metrics(
+    upstream: UpstreamClients = Depends(get_upstream),
+    pool: BrowserPool = Depends(get_browser_pool),
+    jobs: JobQueue = Depends(get_job_queue),
+    pdf: PdfRenderer = Depends(get_pdf_renderer),
+    mirror: MirrorSync = Depends(get_mirror_sync),
+):
+    """Get runtime metrics"""
+    return {
+        "cache": cache_stats(),
+        "airtable": upstream.airtable_stats(),
+        "browser_pool": pool.stats(),
+        "jobs": jobs.stats(),
+        "html_cache": html_cache.stats(),
+        "llm_cache": extraction_cache.stats(),
+        "openai": upstream.openai.stats(),
+        "pdf": pdf.stats(),
+        "candidate_index": candidate_index.stats(),
+        "airtable_mirror": mirror.stats(),
+    }
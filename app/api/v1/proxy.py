@@ -2,17 +2,17 @@
 Proxy API Routes
 Handles proxying requests to external services (Retell)
 """
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request, Depends
 from fastapi.responses import JSONResponse
-import httpx
 
 from app.config import settings
+from app.services.upstream import UpstreamClients, get_upstream
 
 router = APIRouter(prefix="/proxy", tags=["proxy"])
 
 
 @router.post("/retell/register-call")
-async def register_call(request: Request):
+async def register_call(request: Request, upstream: UpstreamClients = Depends(get_upstream)):
     """Proxy request to Retell API to register a call"""
     try:
         body = await request.json()
@@ -20,14 +20,9 @@ async def register_call(request: Request):
         # Add agent_id to the request body
         body["agent_id"] = settings.RETELL_AGENT_ID
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.retellai.com/v2/create-web-call",
-                json=body,
-                headers={"Content-Type": "application/json"},
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await upstream.retell.post("/v2/create-web-call", json=body)
+        response.raise_for_status()
+        return response.json()
     except Exception as error:
         print(f"Error proxying to Retell: {error}")
         raise HTTPException(status_code=500, detail="Failed to register call with Retell")
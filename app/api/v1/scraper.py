@@ -2,344 +2,263 @@
 LinkedIn Scraper API Routes
 Handles LinkedIn profile scraping and candidate management
 """
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
-from typing import Dict, Any
-import httpx
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from typing import Dict, Any, Optional
 import asyncio
-import io
-import json
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
 
 from app.config import settings
-from app.utils.scraper.login import scrape_linkedin
-from app.utils.scraper.search import search_candidates
-from app.utils.reader.process_html import linkedin_clean
-from app.utils.reader.extract_profile import extract_profile
+from app.utils.timing import PhaseTimer, server_timing
+from app.utils.http_cache import json_with_etag
+from app.services.upstream import UpstreamClients, get_upstream
+from app.services.jobs import JobQueue, get_job_queue, SUCCEEDED
+from app.services.pdf import PdfRenderer, get_pdf_renderer, resume_filename
+from app.services.cache import scraper_cache, LIST_KEY, MISSING
+from app.services.airtable import (
+    NDJSON_MEDIA_TYPE,
+    iter_record_pages,
+    list_all_records,
+    ndjson_from_list,
+    ndjson_lines,
+)
+from app.services.profiles import record_to_candidate
+from app.services.export import fetch_candidates, zip_resumes
+from app.services.candidate_index import candidate_index
+from app.services.mirror import mirror_store
 
 router = APIRouter(prefix="/scraper", tags=["scraper"])
 
 
-@router.post("/scrape")
-async def scrape_profile(body: Dict[str, Any]):
-    """Scrape single LinkedIn profile and save to Airtable"""
-    try:
-        url = body.get("url")
-        if not url:
-            raise HTTPException(status_code=400, detail="URL is required")
-
-        # STEP 1: SCRAPE LINKEDIN (run in thread to avoid async conflict)
-        html = await asyncio.to_thread(scrape_linkedin, url)
-
-        # STEP 2: CLEAN HTML (run in thread)
-        clean_text = await asyncio.to_thread(linkedin_clean, html)
-
-        # Save cleaned text
-        import os
-        os.makedirs("reader", exist_ok=True)
-        with open("reader/clean_profile.md", "w", encoding="utf-8") as f:
-            f.write(clean_text)
-
-        # STEP 3: AI EXTRACTION (run in thread)
-        profile_data = await asyncio.to_thread(extract_profile)
-
-        # STEP 4: Save to Airtable
-        if profile_data:
-            try:
-                # Convert skills to string
-                skills_str = ""
-                if "Skills" in profile_data:
-                    skills = profile_data["Skills"]
-                    if isinstance(skills, list):
-                        skills_str = ", ".join(str(s) for s in skills)
-                    else:
-                        skills_str = str(skills)
-                
-                # Use exact Airtable field names (lowercase with underscores)
-                airtable_fields = {
-                    "full_name": str(profile_data.get("Full Name", ""))[:100],
-                    "email": str(profile_data.get("Email", ""))[:100],
-                    "phone": str(profile_data.get("Phone", ""))[:50],
-                    "linkedin_url": url[:500],
-                    "skills": skills_str[:1000] if skills_str else "",
-                }
-                
-                # Only add optional fields if they have data
-                if profile_data.get("Education"):
-                    airtable_fields["education"] = json.dumps(profile_data["Education"])[:1000]
-                if profile_data.get("Experience"):
-                    airtable_fields["experience"] = json.dumps(profile_data["Experience"])[:2000]
-                if profile_data.get("Projects"):
-                    airtable_fields["projects"] = str(profile_data["Projects"])[:1000]
-                if profile_data.get("URLs"):
-                    airtable_fields["urls"] = str(profile_data["URLs"])[:500]
-
-                print(f"Saving to Airtable with fields: {list(airtable_fields.keys())}")
-                
-                async with httpx.AsyncClient() as client:
-                    response = await client.post(
-                        f"https://api.airtable.com/v0/{settings.AIRTABLE_BASE_ID_SCRAPER}/{settings.AIRTABLE_TABLE_ID_SCRAPER}",
-                        json={"fields": airtable_fields},
-                        headers={
-                            "Authorization": f"Bearer {settings.AIRTABLE_API_KEY_SCRAPER}",
-                            "Content-Type": "application/json",
-                        },
-                        timeout=30.0,
-                    )
-                    
-                    if response.status_code != 200:
-                        error_detail = response.text
-                        print(f"Airtable error response: {error_detail}")
-                        print(f"Attempted to save fields: {airtable_fields}")
-                    
-                    response.raise_for_status()
-                    print("Successfully saved to Airtable!")
-                    
-            except Exception as e:
-                print(f"Error saving to Airtable: {e}")
-                # Don't fail the whole request if Airtable save fails
-
-        return profile_data
+def _job_response(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Public view of a job: status, partial results and the final result or error"""
+    return {
+        "job_id": job["id"],
+        "type": job["kind"],
+        "status": job["status"],
+        "payload": job["payload"],
+        "partial_results": job["partial"],
+        "result": job["result"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+    }
+
+
+def _validate_scrape(body: Dict[str, Any]) -> Dict[str, Any]:
+    url = body.get("url")
+    if not url:
+        raise HTTPException(status_code=400, detail="URL is required")
+    return {"url": url, "force_refresh": bool(body.get("force_refresh", False))}
+
+
+def _validate_search(body: Dict[str, Any]) -> Dict[str, Any]:
+    payload = {key: body.get(key) for key in ("role", "skills", "location", "experience")}
+    if not payload["role"] and not payload["skills"]:
+        raise HTTPException(status_code=400, detail="Role or Skills are required")
+    payload["force_refresh"] = bool(body.get("force_refresh", False))
+    return payload
+
+
+def _count(body: Dict[str, Any], key: str, default: int) -> int:
+    value = body.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise HTTPException(status_code=400, detail=f"{key} must be a non-negative integer")
+    return value
+
+
+async def _run_job(jobs: JobQueue, kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Submit a job and wait for it, so synchronous callers still share the worker limit"""
+    job = await jobs.wait((await jobs.submit(kind, payload))["id"])
+    if job["status"] != SUCCEEDED:
+        raise HTTPException(status_code=500, detail=job["error"] or f"Job {job['status']}")
+    return job["result"]
+
+
+@router.post("/scrape", deprecated=True)
+async def scrape_profile(body: Dict[str, Any], jobs: JobQueue = Depends(get_job_queue)):
+    """
+    Scrape single LinkedIn profile and save to Airtable, holding the request
+    open until done. Kept for old clients; use POST /jobs/scrape instead.
+    """
+    payload = _validate_scrape(body)
+    result = await _run_job(jobs, "scrape", payload)
+    return JSONResponse(result["profile"], headers={"Server-Timing": server_timing(result["timings"])})
+
+
+@router.post("/search", deprecated=True)
+async def search_candidates_route(body: Dict[str, Any], jobs: JobQueue = Depends(get_job_queue)):
+    """
+    Search for candidates on LinkedIn and save to Airtable, holding the request
+    open until done. Kept for old clients; use POST /jobs/search instead.
+    """
+    payload = _validate_search(body)
+    return await _run_job(jobs, "search", payload)
+
+
+@router.post("/search/local")
+async def search_local_candidates(body: Dict[str, Any], jobs: JobQueue = Depends(get_job_queue)):
+    """
+    Ranked matches from the local index of scraped candidates. A LinkedIn
+    search job is only queued when fewer than `min_results` are found.
+    """
+    payload = _validate_search(body)
+    min_results = _count(body, "min_results", settings.LOCAL_SEARCH_MIN_RESULTS)
+    limit = min(_count(body, "limit", settings.LOCAL_SEARCH_LIMIT), settings.LOCAL_SEARCH_MAX_LIMIT)
+
+    timer = PhaseTimer()
+    with timer.phase("index"):
+        candidates = await asyncio.to_thread(
+            candidate_index.search, payload["role"], payload["skills"], payload["location"], limit
+        )
+    result = {"source": "local", "candidates": candidates, "job": None}
+    if len(candidates) < min_results:
+        result["source"] = "linkedin"
+        result["job"] = _job_response(await jobs.submit("search", payload))
+    return JSONResponse(result, headers={"Server-Timing": server_timing(timer.as_dict())})
 
-    except Exception as e:
-        print(f"Error scraping profile: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/jobs/scrape", status_code=202)
+async def submit_scrape_job(body: Dict[str, Any], jobs: JobQueue = Depends(get_job_queue)):
+    """Queue a profile scrape and return its job ID immediately"""
+    return _job_response(await jobs.submit("scrape", _validate_scrape(body)))
 
-@router.post("/search")
-async def search_candidates_route(body: Dict[str, Any]):
-    """Search for candidates on LinkedIn and save to Airtable"""
-    try:
-        role = body.get("role")
-        skills = body.get("skills")
-        location = body.get("location")
-        experience = body.get("experience")
-
-        if not role and not skills:
-            raise HTTPException(status_code=400, detail="Role or Skills are required")
-
-        # Run search in thread to avoid async conflict
-        profiles = await asyncio.to_thread(search_candidates, role, skills, location, experience)
-
-        # Save all profiles to Airtable
-        if profiles:
-            async with httpx.AsyncClient() as client:
-                for profile in profiles:
-                    try:
-                        # Convert skills to string
-                        skills_str = ""
-                        if "Skills" in profile:
-                            skills = profile["Skills"]
-                            if isinstance(skills, list):
-                                skills_str = ", ".join(str(s) for s in skills)
-                            else:
-                                skills_str = str(skills)
-                        
-                        # Use exact Airtable field names (lowercase with underscores)
-                        airtable_fields = {
-                            "full_name": str(profile.get("Full Name", ""))[:100],
-                            "email": str(profile.get("Email", ""))[:100],
-                            "phone": str(profile.get("Phone", ""))[:50],
-                            "linkedin_url": str(profile.get("linkedin_url", ""))[:500],
-                            "skills": skills_str[:1000] if skills_str else "",
-                        }
-                        
-                        # Only add optional fields if they have data
-                        if profile.get("Education"):
-                            airtable_fields["education"] = json.dumps(profile["Education"])[:1000]
-                        if profile.get("Experience"):
-                            airtable_fields["experience"] = json.dumps(profile["Experience"])[:2000]
-                        if profile.get("Projects"):
-                            airtable_fields["projects"] = str(profile["Projects"])[:1000]
-                        if profile.get("URLs"):
-                            airtable_fields["urls"] = str(profile["URLs"])[:500]
-                        
-                        response = await client.post(
-                            f"https://api.airtable.com/v0/{settings.AIRTABLE_BASE_ID_SCRAPER}/{settings.AIRTABLE_TABLE_ID_SCRAPER}",
-                            json={"fields": airtable_fields},
-                            headers={
-                                "Authorization": f"Bearer {settings.AIRTABLE_API_KEY_SCRAPER}",
-                                "Content-Type": "application/json",
-                            },
-                            timeout=30.0,
-                        )
-                        
-                        if response.status_code != 200:
-                            error_detail = response.text
-                            print(f"Airtable error for profile: {error_detail}")
-                        
-                        response.raise_for_status()
-                        print(f"Saved profile: {profile.get('Full Name', 'Unknown')}")
-                        
-                    except Exception as e:
-                        print(f"Error saving profile to Airtable: {e}")
-                        # Continue with next profile even if one fails
-                        continue
-
-        return profiles
 
-    except Exception as e:
-        print(f"Error searching candidates: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+@router.post("/jobs/search", status_code=202)
+async def submit_search_job(body: Dict[str, Any], jobs: JobQueue = Depends(get_job_queue)):
+    """Queue a LinkedIn search and return its job ID immediately"""
+    return _job_response(await jobs.submit("search", _validate_search(body)))
+
+
+@router.get("/jobs")
+async def list_jobs(status: Optional[str] = None, limit: int = 50, jobs: JobQueue = Depends(get_job_queue)):
+    """List recent scrape jobs"""
+    return [_job_response(job) for job in await asyncio.to_thread(jobs.store.list, status, limit)]
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str, jobs: JobQueue = Depends(get_job_queue)):
+    """Poll a job's status and partial results"""
+    job = await asyncio.to_thread(jobs.store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_response(job)
+
+
+@router.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str, jobs: JobQueue = Depends(get_job_queue)):
+    """Cancel a queued or running job"""
+    job = await jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_response(job)
 
 
 @router.get("/candidates")
-async def get_scraped_candidates():
-    """Get all scraped candidates from Airtable"""
+async def get_scraped_candidates(
+    request: Request, stream: bool = False, upstream: UpstreamClients = Depends(get_upstream)
+):
+    """Get all scraped candidates from Airtable; `stream=true` returns NDJSON as pages arrive"""
+    mirrored = await asyncio.to_thread(mirror_store.records, "scraper")
+    if mirrored is not None:
+        candidates = [record_to_candidate(record) for record in mirrored]
+        if stream:
+            return StreamingResponse(ndjson_from_list(candidates), media_type=NDJSON_MEDIA_TYPE)
+        return json_with_etag(request, candidates)
+
+    cached = scraper_cache.get(LIST_KEY)
+    if cached is not MISSING:
+        if stream:
+            return StreamingResponse(ndjson_from_list(cached), media_type=NDJSON_MEDIA_TYPE)
+        return json_with_etag(request, cached)
+
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://api.airtable.com/v0/{settings.AIRTABLE_BASE_ID_SCRAPER}/{settings.AIRTABLE_TABLE_ID_SCRAPER}",
-                headers={
-                    "Authorization": f"Bearer {settings.AIRTABLE_API_KEY_SCRAPER}",
-                    "Content-Type": "application/json",
-                },
+        if stream:
+            pages = iter_record_pages(upstream.airtable_scraper, settings.AIRTABLE_TABLE_ID_SCRAPER)
+            first_page = await anext(pages)
+            return StreamingResponse(
+                ndjson_lines(first_page, pages, record_to_candidate),
+                media_type=NDJSON_MEDIA_TYPE,
             )
-            response.raise_for_status()
-            data = response.json()
-            
-            # Transform Airtable records to match frontend expectations
-            candidates = []
-            for record in data.get("records", []):
-                fields = record.get("fields", {})
-                candidate = {
-                    "id": record.get("id"),
-                    "Full Name": fields.get("full_name", ""),
-                    "Email": fields.get("email", ""),
-                    "Phone": fields.get("phone", ""),
-                    "linkedin_url": fields.get("linkedin_url", ""),
-                    "Skills": fields.get("skills", "").split(", ") if fields.get("skills") else [],
-                    "Education": json.loads(fields.get("education", "[]")) if fields.get("education") else [],
-                    "Experience": json.loads(fields.get("experience", "[]")) if fields.get("experience") else [],
-                    "Projects": fields.get("projects", ""),
-                }
-                candidates.append(candidate)
-            
-            return candidates
+
+        records = await list_all_records(upstream.airtable_scraper, settings.AIRTABLE_TABLE_ID_SCRAPER)
+        candidates = [record_to_candidate(record) for record in records]
+        
+        scraper_cache.set(LIST_KEY, candidates)
+        return json_with_etag(request, candidates)
     except Exception as e:
         print(f"Error fetching scraped candidates: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.delete("/candidates/{candidate_id}")
-async def delete_scraped_candidate(candidate_id: str):
+async def delete_scraped_candidate(
+    candidate_id: str, upstream: UpstreamClients = Depends(get_upstream)
+):
     """Delete scraped candidate from Airtable"""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.delete(
-                f"https://api.airtable.com/v0/{settings.AIRTABLE_BASE_ID_SCRAPER}/{settings.AIRTABLE_TABLE_ID_SCRAPER}/{candidate_id}",
-                headers={
-                    "Authorization": f"Bearer {settings.AIRTABLE_API_KEY_SCRAPER}",
-                    "Content-Type": "application/json",
-                },
-            )
-            response.raise_for_status()
-            return {"message": "Candidate deleted successfully"}
+        response = await upstream.airtable_scraper.delete(
+            f"/{settings.AIRTABLE_TABLE_ID_SCRAPER}/{candidate_id}"
+        )
+        response.raise_for_status()
+        scraper_cache.delete(LIST_KEY)
+        await asyncio.to_thread(candidate_index.remove, candidate_id)
+        await asyncio.to_thread(mirror_store.delete, "scraper", candidate_id)
+        return {"message": "Candidate deleted successfully"}
     except Exception as e:
         print(f"Error deleting candidate: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/generate-pdf")
-async def generate_pdf(body: Dict[str, Any]):
+async def generate_pdf(body: Dict[str, Any], renderer: PdfRenderer = Depends(get_pdf_renderer)):
     """Generate PDF resume from candidate data"""
-    try:
-        # Extract candidate data - define all variables at the start
-        name = body.get("Full Name", body.get("Name", "Candidate"))
-        email = body.get("Email", "")
-        phone = body.get("Phone", "")
-        linkedin_url = body.get("linkedin_url", "")
-        skills = body.get("Skills", [])
-        education = body.get("Education", "")
-        experience = body.get("Experience", "")
-        projects = body.get("Projects", "")
-        
-        if not body or not isinstance(body, dict):
-            raise HTTPException(status_code=400, detail="Invalid profile data")
-
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter)
-        styles = getSampleStyleSheet()
-        story = []
-
-        story.append(Paragraph(f"<b>{name}</b>", styles["Title"]))
-        story.append(Spacer(1, 12))
-
-        # Contact Info
-        if email or phone:
-            contact_text = f"<b>Contact:</b> {email}"
-            if phone:
-                contact_text += f" | {phone}"
-            story.append(Paragraph(contact_text, styles["Normal"]))
-            story.append(Spacer(1, 12))
-
-        # LinkedIn
-        if linkedin_url:
-            story.append(Paragraph(f"<b>LinkedIn:</b> {linkedin_url}", styles["Normal"]))
-            story.append(Spacer(1, 12))
-
-        # Skills
-        if skills:
-            skills_text = ", ".join(skills) if isinstance(skills, list) else str(skills)
-            story.append(Paragraph("<b>Skills:</b>", styles["Heading2"]))
-            story.append(Paragraph(skills_text, styles["Normal"]))
-            story.append(Spacer(1, 12))
-
-        # Education
-        if education:
-            story.append(Paragraph("<b>Education:</b>", styles["Heading2"]))
-            if isinstance(education, list):
-                for edu in education:
-                    if isinstance(edu, dict):
-                        edu_text = f"{edu.get('Institution', '')} - {edu.get('Degree', '')} ({edu.get('Start Date', '')} - {edu.get('End Date', '')})"
-                    else:
-                        edu_text = str(edu)
-                    story.append(Paragraph(edu_text, styles["Normal"]))
-                    story.append(Spacer(1, 6))
-            else:
-                edu_text = str(education).replace("\n", "<br/>")
-                story.append(Paragraph(edu_text, styles["Normal"]))
-            story.append(Spacer(1, 12))
-
-        # Experience
-        if experience:
-            story.append(Paragraph("<b>Experience:</b>", styles["Heading2"]))
-            if isinstance(experience, list):
-                for exp in experience:
-                    if isinstance(exp, dict):
-                        exp_text = f"{exp.get('Job Title', '')} at {exp.get('Company', '')} ({exp.get('Start Date', '')} - {exp.get('End Date', '')})"
-                    else:
-                        exp_text = str(exp)
-                    story.append(Paragraph(exp_text, styles["Normal"]))
-                    story.append(Spacer(1, 6))
-            else:
-                exp_text = str(experience).replace("\n", "<br/>")
-                story.append(Paragraph(exp_text, styles["Normal"]))
-            story.append(Spacer(1, 12))
-
-        # Projects
-        if projects:
-            story.append(Paragraph("<b>Projects:</b>", styles["Heading2"]))
-            proj_text = str(projects).replace("\n", "<br/>")
-            story.append(Paragraph(proj_text, styles["Normal"]))
-
-        # Build PDF
-        doc.build(story)
-        buffer.seek(0)
-
-        # Create safe filename from candidate name
-        safe_name = "".join(c for c in name if c.isalnum() or c in (' ', '-', '_')).strip()
-        safe_name = safe_name.replace(' ', '_')
-        filename = f"{safe_name}_Resume.pdf"
-
-        return StreamingResponse(
-            buffer,
-            media_type="application/pdf",
-            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
-        )
+    if not body or not isinstance(body, dict):
+        raise HTTPException(status_code=400, detail="Invalid profile data")
 
+    try:
+        # Rendered in the worker pool, or served from the cache for a repeat payload
+        pdf = await renderer.render(body)
     except Exception as e:
         print(f"Error generating PDF: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+    return Response(
+        content=pdf,
+        media_type="application/pdf",
+        headers={"Content-Disposition": f'attachment; filename="{resume_filename(body)}"'}
+    )
+
+
+@router.post("/export-pdfs")
+async def export_pdfs(
+    body: Dict[str, Any],
+    upstream: UpstreamClients = Depends(get_upstream),
+    renderer: PdfRenderer = Depends(get_pdf_renderer),
+):
+    """
+    Stream a ZIP of resume PDFs for the given candidate `ids`, or for every
+    candidate matching an Airtable `filter` formula
+    """
+    ids, formula = body.get("ids"), body.get("filter")
+    if ids is not None and (not isinstance(ids, list) or not all(isinstance(i, str) for i in ids)):
+        raise HTTPException(status_code=400, detail="ids must be a list of candidate IDs")
+    if not ids and not formula:
+        raise HTTPException(status_code=400, detail="Candidate ids or a filter are required")
+
+    try:
+        candidates = await fetch_candidates(upstream, ids=ids or None, formula=formula)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"Error fetching candidates for export: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if not candidates:
+        raise HTTPException(status_code=404, detail="No matching candidates")
+
+    return StreamingResponse(
+        zip_resumes(candidates, renderer),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="resumes.zip"'}
+    )
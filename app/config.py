@@ -42,6 +42,80 @@ class Settings:
     LINKEDIN_EMAIL: str = os.getenv("LINKEDIN_EMAIL", "")
     LINKEDIN_PASSWORD: str = os.getenv("LINKEDIN_PASSWORD", "")
 
+    # Upstream HTTP connection pools (one pool per upstream service)
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", 20))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", 10))
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", 60.0))
+    HTTP_CONNECT_TIMEOUT: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5.0))
+    HTTP_TIMEOUT: float = float(os.getenv("HTTP_TIMEOUT", 30.0))
+    N8N_TIMEOUT: float = float(os.getenv("N8N_TIMEOUT", 60.0))
+
+    # Airtable read cache
+    CACHE_TTL_SECONDS: float = float(os.getenv("CACHE_TTL_SECONDS", 30.0))
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", 256))
+
+    # Airtable rate limiting (Airtable allows 5 requests/second per base)
+    AIRTABLE_RATE_LIMIT: float = float(os.getenv("AIRTABLE_RATE_LIMIT", 5.0))
+    AIRTABLE_BURST: float = float(os.getenv("AIRTABLE_BURST", 5.0))
+    AIRTABLE_MAX_RETRIES: int = int(os.getenv("AIRTABLE_MAX_RETRIES", 5))
+    AIRTABLE_BACKOFF_BASE: float = float(os.getenv("AIRTABLE_BACKOFF_BASE", 1.0))
+    AIRTABLE_BACKOFF_MAX: float = float(os.getenv("AIRTABLE_BACKOFF_MAX", 30.0))
+
+    # LinkedIn scraper browser pool
+    BROWSER_POOL_SIZE: int = int(os.getenv("BROWSER_POOL_SIZE", 2))
+    BROWSER_CONTEXT_MAX_USES: int = int(os.getenv("BROWSER_CONTEXT_MAX_USES", 25))
+    BROWSER_HEADLESS: bool = os.getenv("BROWSER_HEADLESS", "true").lower() == "true"
+    SCRAPER_CONCURRENCY: int = int(os.getenv("SCRAPER_CONCURRENCY", 3))
+
+    # Background scrape jobs
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", os.getenv("BROWSER_POOL_SIZE", 2)))
+    JOB_DB_PATH: str = os.getenv("JOB_DB_PATH", "data/jobs.db")
+
+    # Raw profile HTML cache
+    HTML_CACHE_DIR: str = os.getenv("HTML_CACHE_DIR", "data/html_cache")
+    HTML_CACHE_MAX_AGE_HOURS: float = float(os.getenv("HTML_CACHE_MAX_AGE_HOURS", 24.0))
+    HTML_CACHE_MAX_MB: int = int(os.getenv("HTML_CACHE_MAX_MB", 500))
+
+    # LLM extraction result cache
+    LLM_CACHE_PATH: str = os.getenv("LLM_CACHE_PATH", "data/llm_cache.db")
+    LLM_CACHE_MAX_AGE_DAYS: float = float(os.getenv("LLM_CACHE_MAX_AGE_DAYS", 30.0))
+    LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 5000))
+
+    # OpenAI extraction client
+    OPENAI_MAX_CONCURRENCY: int = int(os.getenv("OPENAI_MAX_CONCURRENCY", 4))
+    OPENAI_TPM_LIMIT: int = int(os.getenv("OPENAI_TPM_LIMIT", 200000))
+    OPENAI_COMPLETION_TOKENS_ESTIMATE: int = int(os.getenv("OPENAI_COMPLETION_TOKENS_ESTIMATE", 1500))
+    OPENAI_MAX_RETRIES: int = int(os.getenv("OPENAI_MAX_RETRIES", 5))
+    OPENAI_BACKOFF_BASE: float = float(os.getenv("OPENAI_BACKOFF_BASE", 1.0))
+    OPENAI_BACKOFF_MAX: float = float(os.getenv("OPENAI_BACKOFF_MAX", 60.0))
+    OPENAI_TIMEOUT: float = float(os.getenv("OPENAI_TIMEOUT", 120.0))
+
+    # PDF resume rendering
+    PDF_WORKERS: int = int(os.getenv("PDF_WORKERS", 2))
+    PDF_CACHE_MAX_ENTRIES: int = int(os.getenv("PDF_CACHE_MAX_ENTRIES", 128))
+    PDF_CACHE_TTL_SECONDS: float = float(os.getenv("PDF_CACHE_TTL_SECONDS", 3600.0))
+
+    # Local SQLite mirror of the Airtable tables
+    AIRTABLE_MIRROR_ENABLED: bool = os.getenv("AIRTABLE_MIRROR_ENABLED", "true").lower() == "true"
+    AIRTABLE_MIRROR_PATH: str = os.getenv("AIRTABLE_MIRROR_PATH", "data/airtable_mirror.db")
+    AIRTABLE_MIRROR_POLL_SECONDS: float = float(os.getenv("AIRTABLE_MIRROR_POLL_SECONDS", 30.0))
+    AIRTABLE_MIRROR_SWEEP_SECONDS: float = float(os.getenv("AIRTABLE_MIRROR_SWEEP_SECONDS", 900.0))
+    AIRTABLE_MIRROR_OVERLAP_SECONDS: float = float(os.getenv("AIRTABLE_MIRROR_OVERLAP_SECONDS", 60.0))
+
+    # Local full-text index of scraped candidates
+    CANDIDATE_INDEX_PATH: str = os.getenv("CANDIDATE_INDEX_PATH", "data/candidate_index.db")
+    LOCAL_SEARCH_MIN_RESULTS: int = int(os.getenv("LOCAL_SEARCH_MIN_RESULTS", 5))
+    LOCAL_SEARCH_LIMIT: int = int(os.getenv("LOCAL_SEARCH_LIMIT", 20))
+    LOCAL_SEARCH_MAX_LIMIT: int = int(os.getenv("LOCAL_SEARCH_MAX_LIMIT", 100))
+
+    # Response compression and static asset caching
+    GZIP_MIN_SIZE: int = int(os.getenv("GZIP_MIN_SIZE", 1024))
+    GZIP_LEVEL: int = int(os.getenv("GZIP_LEVEL", 6))
+    STATIC_MAX_AGE_SECONDS: int = int(os.getenv("STATIC_MAX_AGE_SECONDS", 31536000))
+
+    # When set, each scrape's cleaned text and extracted profile are written here
+    SCRAPE_DEBUG_DIR: str = os.getenv("SCRAPE_DEBUG_DIR", "")
+
 
 # Create settings instance
 settings = Settings()
@@ -2,18 +2,76 @@
 FastAPI Interview Application
 Main application entry point with modular router structure
 """
+from contextlib import asynccontextmanager
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
 from app.config import settings
 from app.api.router import api_router
+from app.services.upstream import UpstreamClients
+from app.services.browser_pool import BrowserPool
+from app.services.candidate_index import backfill_index, candidate_index
+from app.services.jobs import JobQueue, JobStore
+from app.services.mirror import MirrorSync, mirror_store
+from app.services.pdf import PdfRenderer
+from app.services.scrape_pipeline import job_handlers
+from app.utils.compression import CompressionMiddleware
+from app.utils.static_assets import AssetFiles
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared resources on startup and release them on shutdown"""
+    app.state.upstream = UpstreamClients()
+    app.state.browser_pool = BrowserPool(
+        size=settings.BROWSER_POOL_SIZE,
+        max_uses=settings.BROWSER_CONTEXT_MAX_USES,
+        headless=settings.BROWSER_HEADLESS,
+    )
+    app.state.job_queue = JobQueue(
+        JobStore(settings.JOB_DB_PATH),
+        job_handlers(app.state.upstream, app.state.browser_pool),
+        workers=settings.JOB_WORKERS,
+    )
+    await app.state.job_queue.start()
+    app.state.pdf_renderer = PdfRenderer(
+        workers=settings.PDF_WORKERS,
+        cache_size=settings.PDF_CACHE_MAX_ENTRIES,
+        cache_ttl=settings.PDF_CACHE_TTL_SECONDS,
+    )
+    await app.state.pdf_renderer.start()
+    app.state.mirror_sync = MirrorSync(
+        mirror_store,
+        app.state.upstream,
+        interval=settings.AIRTABLE_MIRROR_POLL_SECONDS,
+        sweep_interval=settings.AIRTABLE_MIRROR_SWEEP_SECONDS,
+    )
+    if settings.AIRTABLE_MIRROR_ENABLED:
+        app.state.mirror_sync.start()
+    backfill = asyncio.create_task(backfill_index(candidate_index, app.state.upstream))
+    await asyncio.to_thread(static_files.precompress)
+    try:
+        yield
+    finally:
+        backfill.cancel()
+        await app.state.mirror_sync.stop()
+        app.state.pdf_renderer.close()
+        await app.state.job_queue.stop()
+        app.state.job_queue.store.close()
+        await app.state.browser_pool.close()
+        await app.state.upstream.aclose()
+        candidate_index.close()
+        mirror_store.close()
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Interview Management System",
     description="AI-powered interview management with LinkedIn scraping capabilities",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -25,11 +83,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses; streamed NDJSON and binary downloads pass through as-is
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.GZIP_MIN_SIZE,
+    compresslevel=settings.GZIP_LEVEL,
+)
+
 # Include API router
 app.include_router(api_router)
 
 # Mount static files (must be last)
-app.mount("/", StaticFiles(directory="public", html=True), name="static")
+static_files = AssetFiles(
+    directory="public",
+    html=True,
+    min_size=settings.GZIP_MIN_SIZE,
+    max_age=settings.STATIC_MAX_AGE_SECONDS,
+)
+app.mount("/", static_files, name="static")
 
 
 # Run the application
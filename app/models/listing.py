@@ -0,0 +1,27 @@
+"""
+Record Listing Models
+Query options accepted by the paged candidate list routes
+"""
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+StatusFilter = Literal["recommended", "not-recommended", "pending"]
+
+
+class ListQuery(BaseModel):
+    """Sort, filter and page options; with none set a route returns every record as before"""
+
+    sort: Optional[str] = None
+    direction: Literal["asc", "desc"] = "desc"
+    q: Optional[str] = None
+    status: Optional[StatusFilter] = None
+    position: Optional[str] = None
+    since_days: Optional[int] = None
+    page_size: Optional[int] = None
+    cursor: Optional[str] = None
+
+    def is_empty(self) -> bool:
+        return not any(
+            value is not None for name, value in self.model_dump().items() if name != "direction"
+        )
@@ -0,0 +1,63 @@
+"""
+Candidate Profile Models
+Extraction schema keyed by the field names used across the app, and the scrape pipeline record
+"""
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+
+class EducationEntry(BaseModel):
+    school: Optional[str] = None
+    degree: Optional[str] = None
+    field_of_study: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+
+
+class ExperienceEntry(BaseModel):
+    title: Optional[str] = None
+    company: Optional[str] = None
+    location: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    description: Optional[str] = None
+
+
+class CandidateProfile(BaseModel):
+    """A LinkedIn profile as extracted by the LLM"""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    full_name: Optional[str] = Field(None, alias="Full Name")
+    headline: Optional[str] = Field(None, alias="Headline")
+    email: Optional[str] = Field(None, alias="Email")
+    phone: Optional[str] = Field(None, alias="Phone")
+    skills: List[str] = Field(default_factory=list, alias="Skills")
+    education: List[EducationEntry] = Field(default_factory=list, alias="Education")
+    experience: List[ExperienceEntry] = Field(default_factory=list, alias="Experience")
+    projects: List[str] = Field(default_factory=list, alias="Projects")
+    urls: List[str] = Field(default_factory=list, alias="URLs")
+
+    @field_validator("skills", "projects", "urls", mode="before")
+    @classmethod
+    def split_text(cls, value: Any) -> Any:
+        """Accept a single comma-separated string where a list is expected"""
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(",") if item.strip()]
+        return value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict keyed by display names, as stored and returned by the API"""
+        return self.model_dump(by_alias=True, exclude_none=True)
+
+
+class ScrapedProfile(BaseModel):
+    """One profile as it moves through scrape -> clean -> extract -> save"""
+
+    url: str
+    html: Optional[str] = None
+    clean_text: Optional[str] = None
+    known_fields: Dict[str, Any] = Field(default_factory=dict)
+    profile: Optional[Dict[str, Any]] = None
+    timings: Dict[str, float] = Field(default_factory=dict)
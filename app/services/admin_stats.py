@@ -0,0 +1,176 @@
+"""
+Admin Dashboard Statistics
+Running aggregates over the admin table, updated per record instead of recomputed from the full list
+"""
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+import asyncio
+import re
+import threading
+import time
+
+from app.config import settings
+from app.services.airtable import list_all_records
+from app.services.cache import admin_cache, LIST_KEY, MISSING
+from app.services.listing import status_class
+from app.services.mirror import mirror_store
+from app.services.upstream import UpstreamClients
+
+SCORE_BUCKETS = (("excellent", 45), ("good", 35), ("fair", 25), ("poor", float("-inf")))
+DURATION = re.compile(r"(\d+):(\d+)")
+
+# Minutes assumed for an interview whose duration can't be read, as the dashboard always has
+DEFAULT_DURATION = 25
+TREND_DAYS = 30
+
+
+def _score(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def contribution(record: Dict[str, Any]) -> Dict[str, Any]:
+    """What one admin record adds to the aggregates"""
+    fields = record.get("fields", {})
+    score = _score(fields.get("overallScore"))
+
+    duration = None
+    if fields.get("interviewDuration"):
+        match = DURATION.search(str(fields["interviewDuration"]))
+        duration = int(match.group(1)) if match else DEFAULT_DURATION
+
+    date = fields.get("reportGeneratedAt")
+    return {
+        "recommended": status_class(fields.get("status")) == "recommended",
+        "score": score,
+        "bucket": next(name for name, floor in SCORE_BUCKETS if score >= floor),
+        "duration": duration,
+        "date": str(date).split("T")[0] if date else None,
+    }
+
+
+class AdminStats:
+    """
+    Keeps each record's contribution so a changed or deleted record adjusts
+    the totals in place. Records come from the Airtable mirror when it has
+    loaded the admin table, which then keeps the stats current through its
+    change listener; otherwise from the admin list, reloaded every
+    CACHE_TTL_SECONDS. Listener calls arrive from worker threads, so updates
+    take a lock.
+    """
+
+    def __init__(self):
+        self.source: Optional[str] = None
+        self.loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        self.recommended = 0
+        self.score_sum = 0.0
+        self.duration_sum = 0
+        self.duration_count = 0
+        self.buckets: Counter = Counter()
+        self.by_date: Counter = Counter()
+        self.recommended_by_date: Counter = Counter()
+
+    def _add(self, row: Dict[str, Any], sign: int):
+        self.recommended += sign * row["recommended"]
+        self.score_sum += sign * row["score"]
+        self.buckets[row["bucket"]] += sign
+        if row["duration"] is not None:
+            self.duration_sum += sign * row["duration"]
+            self.duration_count += sign
+        if row["date"]:
+            self.by_date[row["date"]] += sign
+            self.recommended_by_date[row["date"]] += sign * row["recommended"]
+
+    def _apply(self, record: Dict[str, Any]):
+        old = self._rows.get(record["id"])
+        if old is not None:
+            self._add(old, -1)
+        row = contribution(record)
+        self._rows[record["id"]] = row
+        self._add(row, 1)
+
+    def load(self, records: List[Dict[str, Any]], source: str):
+        with self._lock:
+            self._reset()
+            for record in records:
+                self._apply(record)
+            self.source = source
+            self.loaded_at = time.time()
+
+    def apply(self, record: Dict[str, Any]):
+        """Add or replace one record, e.g. after a PATCH returned it"""
+        with self._lock:
+            self._apply(record)
+
+    def remove(self, record_id: str):
+        with self._lock:
+            row = self._rows.pop(record_id, None)
+            if row is not None:
+                self._add(row, -1)
+
+    def on_mirror_change(self, records: List[Dict[str, Any]], deleted: List[str], replaced: bool):
+        if replaced:
+            self.load(records, "mirror")
+            return
+        for record in records:
+            self.apply(record)
+        for record_id in deleted:
+            self.remove(record_id)
+
+    def fresh(self) -> bool:
+        if self.source == "mirror":
+            return mirror_store.fresh("admin")
+        return self.source is not None and time.time() - self.loaded_at < settings.CACHE_TTL_SECONDS
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            total = len(self._rows)
+            today = datetime.now(timezone.utc).date()
+            days = [(today - timedelta(days=offset)).isoformat() for offset in range(TREND_DAYS - 1, -1, -1)]
+            return {
+                "total": total,
+                "recommended": self.recommended,
+                "average_score": round(self.score_sum / (total or 1), 1),
+                "average_duration_minutes": (
+                    round(self.duration_sum / self.duration_count) if self.duration_count else DEFAULT_DURATION
+                ),
+                "score_distribution": {name: self.buckets[name] for name, _ in SCORE_BUCKETS},
+                "trend": [
+                    {"date": day, "total": self.by_date[day], "recommended": self.recommended_by_date[day]}
+                    for day in days
+                ],
+                "source": self.source,
+                "updated_at": self.loaded_at,
+            }
+
+
+async def current_stats(stats: AdminStats, upstream: UpstreamClients) -> Dict[str, Any]:
+    """The stats, (re)loading them first if they're missing or stale"""
+    if not stats.fresh():
+        mirrored = await asyncio.to_thread(mirror_store.records, "admin")
+        if mirrored is not None:
+            stats.load(mirrored, "mirror")
+        else:
+            cached = admin_cache.get(LIST_KEY)
+            if cached is MISSING:
+                records = await list_all_records(
+                    upstream.airtable_admin,
+                    settings.AIRTABLE_TABLE_ID_ADMIN,
+                    {"view": settings.AIRTABLE_VIEW_ID_ADMIN},
+                )
+                cached = {"records": records}
+                admin_cache.set(LIST_KEY, cached)
+            stats.load(cached["records"], "airtable")
+    return stats.summary()
+
+
+admin_stats = AdminStats()
+mirror_store.subscribe("admin", admin_stats.on_mirror_change)
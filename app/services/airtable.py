@@ -0,0 +1,179 @@
+"""
+Airtable Helpers
+Rate-limited client, pagination, NDJSON streaming and batched writes for Airtable tables
+"""
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+import asyncio
+import json
+import random
+
+import httpx
+
+from app.config import settings
+from app.services.rate_limit import TokenBucket
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class AirtableClient:
+    """
+    Wraps a pooled httpx client for one Airtable base.
+    Every call first takes a token from the base's bucket, so bursts queue up
+    instead of tripping Airtable's per-base limit; 429 responses are retried
+    after `Retry-After` (or jittered exponential backoff) and pause the bucket
+    for every other caller of the same base.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, base_id: str, bucket: TokenBucket):
+        self._client = client
+        self.base_id = base_id
+        self.bucket = bucket
+        self.throttled = 0
+        self.retries = 0
+
+    def _backoff(self, response: httpx.Response, attempt: int) -> float:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return float(retry_after) + random.uniform(0, 1)
+            except ValueError:
+                pass
+        delay = min(settings.AIRTABLE_BACKOFF_MAX, settings.AIRTABLE_BACKOFF_BASE * 2 ** attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        attempt = 0
+        while True:
+            await self.bucket.acquire()
+            response = await self._client.request(method, url, **kwargs)
+            if response.status_code != 429 or attempt >= settings.AIRTABLE_MAX_RETRIES:
+                return response
+
+            self.throttled += 1
+            self.retries += 1
+            delay = self._backoff(response, attempt)
+            print(f"Airtable rate limited base {self.base_id}, retrying in {delay:.1f}s")
+            self.bucket.pause(delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"throttled": self.throttled, "retries": self.retries}
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+async def iter_record_pages(
+    client: AirtableClient, table_id: str, params: Optional[Dict[str, Any]] = None
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Yield each page of records, following Airtable's `offset` cursor to the end"""
+    params = dict(params or {})
+    while True:
+        response = await client.get(f"/{table_id}", params=params)
+        response.raise_for_status()
+        data = response.json()
+        yield data.get("records", [])
+
+        offset = data.get("offset")
+        if not offset:
+            break
+        params["offset"] = offset
+
+
+async def list_all_records(
+    client: AirtableClient, table_id: str, params: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """Fetch every record of a table"""
+    records = []
+    async for page in iter_record_pages(client, table_id, params):
+        records.extend(page)
+    return records
+
+
+async def ndjson_lines(
+    first_page: List[Dict[str, Any]],
+    pages: AsyncIterator[List[Dict[str, Any]]],
+    transform: Callable[[Dict[str, Any]], Any] = lambda record: record,
+) -> AsyncIterator[str]:
+    """
+    Emit one JSON document per record as pages arrive.
+    The first page is fetched by the caller so upstream errors can still become
+    a proper HTTP status; later failures end the stream with an error line.
+    """
+    for record in first_page:
+        yield json.dumps(transform(record)) + "\n"
+
+    try:
+        async for page in pages:
+            for record in page:
+                yield json.dumps(transform(record)) + "\n"
+    except httpx.HTTPError as error:
+        print(f"Error streaming Airtable records: {error}")
+        yield json.dumps({"error": "Failed to fetch remaining records"}) + "\n"
+
+
+async def ndjson_from_list(items: List[Any]) -> AsyncIterator[str]:
+    """Emit an already materialized list (e.g. a cache hit) as NDJSON"""
+    for item in items:
+        yield json.dumps(item) + "\n"
+
+
+# Airtable accepts at most this many records per create/update/delete call
+MAX_BATCH_SIZE = 10
+
+
+async def _create_batch(
+    client: AirtableClient, table_id: str, batch: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    response = await client.post(
+        f"/{table_id}",
+        json={"records": [{"fields": fields} for fields in batch]},
+    )
+    if response.status_code >= 400:
+        print(f"Airtable batch create error: {response.text}")
+    response.raise_for_status()
+    return [{"ok": True, "id": record.get("id")} for record in response.json().get("records", [])]
+
+
+async def create_records(
+    client: AirtableClient, table_id: str, fields_list: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Create records in batches of 10 and return one result per input, in order:
+    {"ok": True, "id": ...} or {"ok": False, "error": ...}.
+    Airtable rejects a whole batch if any row is invalid, so a rejected batch is
+    retried row by row to isolate the bad records.
+    """
+    results: List[Dict[str, Any]] = []
+    for start in range(0, len(fields_list), MAX_BATCH_SIZE):
+        batch = fields_list[start:start + MAX_BATCH_SIZE]
+        try:
+            results.extend(await _create_batch(client, table_id, batch))
+            continue
+        except httpx.HTTPStatusError as error:
+            if error.response.status_code != 422 or len(batch) == 1:
+                results.extend({"ok": False, "error": str(error)} for _ in batch)
+                continue
+        except httpx.HTTPError as error:
+            results.extend({"ok": False, "error": str(error)} for _ in batch)
+            continue
+
+        for fields in batch:
+            try:
+                results.extend(await _create_batch(client, table_id, [fields]))
+            except httpx.HTTPError as error:
+                results.append({"ok": False, "error": str(error)})
+    return results
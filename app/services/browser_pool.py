@@ -0,0 +1,128 @@
+"""
+Browser Pool
+Long-lived Chromium instance with a fixed set of authenticated LinkedIn contexts
+"""
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+import asyncio
+
+from fastapi import Request
+from playwright.async_api import async_playwright, Browser, BrowserContext, Playwright
+
+from app.utils.scraper.login import new_browser_context, login_if_needed
+
+
+class _Slot:
+    """One checkout-able context and how many jobs it has served"""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.context: Optional[BrowserContext] = None
+        self.uses = 0
+
+
+class BrowserPool:
+    """
+    Chromium is launched lazily on first checkout and kept alive for the life of
+    the app. Each slot holds one context that is logged in once and reused; it
+    is recycled after `max_uses` jobs, when a job fails, or when the browser
+    has crashed.
+    """
+
+    def __init__(self, size: int, max_uses: int, headless: bool = True):
+        self.size = size
+        self.max_uses = max_uses
+        self.headless = headless
+        self.recycled = 0
+        self.checkouts = 0
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._slots: Optional[asyncio.Queue] = None
+        self._start_lock = asyncio.Lock()
+
+    async def _ensure_browser(self) -> Browser:
+        async with self._start_lock:
+            if self._slots is None:
+                self._slots = asyncio.Queue()
+                for index in range(self.size):
+                    self._slots.put_nowait(_Slot(index))
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            if self._browser is None or not self._browser.is_connected():
+                if self._browser is not None:
+                    print("Browser disconnected, relaunching Chromium...")
+                self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            return self._browser
+
+    async def _new_context(self) -> BrowserContext:
+        browser = await self._ensure_browser()
+        context = await new_browser_context(browser)
+        page = await context.new_page()
+        try:
+            await login_if_needed(page, context)
+        finally:
+            await page.close()
+        return context
+
+    async def _recycle(self, slot: _Slot):
+        if slot.context is not None:
+            try:
+                await slot.context.close()
+            except Exception as e:
+                print(f"Error closing browser context: {e}")
+        slot.context = None
+        slot.uses = 0
+        self.recycled += 1
+
+    @asynccontextmanager
+    async def context(self) -> AsyncIterator[BrowserContext]:
+        """Check out an authenticated context for the duration of one job"""
+        await self._ensure_browser()
+        slot = await self._slots.get()
+        self.checkouts += 1
+        failed = True
+        try:
+            if slot.context is None or not self._browser.is_connected():
+                slot.context = None
+                slot.context = await self._new_context()
+            yield slot.context
+            failed = False
+        finally:
+            slot.uses += 1
+            if failed or slot.uses >= self.max_uses or not self._browser.is_connected():
+                await self._recycle(slot)
+            else:
+                try:
+                    for page in list(slot.context.pages):
+                        await page.close()
+                except Exception:
+                    await self._recycle(slot)
+            self._slots.put_nowait(slot)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "idle": self._slots.qsize() if self._slots is not None else self.size,
+            "checkouts": self.checkouts,
+            "recycled": self.recycled,
+            "browser_running": self._browser is not None and self._browser.is_connected(),
+        }
+
+    async def close(self):
+        if self._slots is not None:
+            while not self._slots.empty():
+                slot = self._slots.get_nowait()
+                if slot.context is not None:
+                    try:
+                        await slot.context.close()
+                    except Exception:
+                        pass
+        if self._browser is not None:
+            await self._browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+
+
+def get_browser_pool(request: Request) -> BrowserPool:
+    """Dependency returning the pool created in the app lifespan"""
+    return request.app.state.browser_pool
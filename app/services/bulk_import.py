@@ -0,0 +1,229 @@
+"""
+Bulk Profile Import
+Cleans a directory of saved LinkedIn HTML across processes, extracts and saves to Airtable in batches
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+import asyncio
+import json
+import os
+import time
+
+from app.config import settings
+from app.services.airtable import MAX_BATCH_SIZE, create_records
+from app.services.candidate_index import candidate_index
+from app.services.profiles import profile_to_fields, record_to_candidate
+from app.services.upstream import UpstreamClients
+from app.utils.reader.extract_profile import extract_profile
+from app.utils.reader.known_fields import extract_known_fields
+from app.utils.reader.process_html import linkedin_clean, profile_url_from_html
+
+HTML_EXTENSIONS = (".html", ".htm")
+
+
+def find_html_files(directory: str) -> List[str]:
+    """Every saved page under `directory`, in a stable order"""
+    paths = []
+    for root, _, names in os.walk(directory):
+        paths.extend(os.path.join(root, name) for name in names if name.lower().endswith(HTML_EXTENSIONS))
+    return sorted(paths)
+
+
+def prepare_file(path: str) -> Tuple[str, str, Dict[str, Any]]:
+    """Read one saved page; returns (profile URL, cleaned text, fields read from markup)"""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        html = f.read()
+    return profile_url_from_html(html), linkedin_clean(html), extract_known_fields(html)
+
+
+class Checkpoint:
+    """
+    Append-only JSON-lines log of finished files, keyed by path relative to
+    the import directory. Failed files are not recorded, so a rerun retries them.
+    A read-only checkpoint skips what is already logged but records nothing.
+    """
+
+    def __init__(self, path: str, read_only: bool = False):
+        self.path = path
+        self._file = None
+        self.done: Set[str] = set()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self.done.add(json.loads(line)["file"])
+                    except (ValueError, KeyError):
+                        continue
+        if read_only:
+            return
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def record(self, entries: List[Dict[str, Any]]):
+        if self._file is None:
+            return
+        for entry in entries:
+            self._file.write(json.dumps(entry) + "\n")
+            self.done.add(entry["file"])
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+class ImportStats:
+    """Counters and per-stage busy time for the throughput summary"""
+
+    def __init__(self, total: int, skipped: int):
+        self.total = total
+        self.skipped = skipped
+        self.cleaned = 0
+        self.extracted = 0
+        self.empty = 0
+        self.saved = 0
+        self.failed = 0
+        self.stage_seconds = {"clean": 0.0, "extract": 0.0, "save": 0.0}
+        self.started = time.monotonic()
+
+    @property
+    def finished(self) -> int:
+        return self.saved + self.empty + self.failed
+
+    def summary(self) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self.started
+        return {
+            "files": self.total,
+            "skipped": self.skipped,
+            "cleaned": self.cleaned,
+            "extracted": self.extracted,
+            "saved": self.saved,
+            "empty": self.empty,
+            "failed": self.failed,
+            "elapsed_seconds": round(elapsed, 1),
+            "files_per_minute": round(self.finished / elapsed * 60, 1) if elapsed else 0.0,
+            "stage_seconds": {stage: round(seconds, 1) for stage, seconds in self.stage_seconds.items()},
+        }
+
+
+class _BatchWriter:
+    """Buffers extracted profiles and writes them to Airtable MAX_BATCH_SIZE at a time"""
+
+    def __init__(self, upstream: UpstreamClients, checkpoint: Checkpoint, stats: ImportStats, dry_run: bool):
+        self.upstream = upstream
+        self.checkpoint = checkpoint
+        self.stats = stats
+        self.dry_run = dry_run
+        self._buffer: List[Tuple[str, Dict[str, Any]]] = []
+        self._lock = asyncio.Lock()
+
+    async def add(self, name: str, fields: Dict[str, Any]):
+        self._buffer.append((name, fields))
+        if len(self._buffer) >= MAX_BATCH_SIZE:
+            await self.flush()
+
+    async def flush(self):
+        async with self._lock:
+            batch, self._buffer = self._buffer, []
+            if not batch:
+                return
+
+            started = time.monotonic()
+            if self.dry_run:
+                results = [{"ok": True, "id": None} for _ in batch]
+            else:
+                results = await create_records(
+                    self.upstream.airtable_scraper,
+                    settings.AIRTABLE_TABLE_ID_SCRAPER,
+                    [fields for _, fields in batch],
+                )
+            self.stats.stage_seconds["save"] += time.monotonic() - started
+
+            entries, saved = [], []
+            for (name, fields), result in zip(batch, results):
+                if result["ok"]:
+                    self.stats.saved += 1
+                    entries.append({"file": name, "status": "saved", "id": result["id"]})
+                    saved.append(record_to_candidate({"id": result["id"], "fields": fields}))
+                else:
+                    self.stats.failed += 1
+                    print(f"Error saving {name} to Airtable: {result['error']}")
+            self.checkpoint.record(entries)
+            if not self.dry_run:
+                await asyncio.to_thread(candidate_index.add, saved)
+
+
+async def bulk_import(
+    directory: str,
+    upstream: UpstreamClients,
+    checkpoint_path: str,
+    workers: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    limit: Optional[int] = None,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """
+    Import every saved profile under `directory` not already in the checkpoint.
+    Cleaning runs on `workers` processes, at most `concurrency` profiles are
+    being extracted at once (the OpenAI client's limits still apply), and
+    Airtable writes are batched. Returns the throughput summary.
+    """
+    workers = workers or os.cpu_count() or 1
+    concurrency = concurrency or settings.OPENAI_MAX_CONCURRENCY
+    # A dry run saves nothing, so it must not mark files as done for the real run
+    checkpoint = Checkpoint(checkpoint_path, read_only=dry_run)
+
+    files = find_html_files(directory)
+    pending = [path for path in files if os.path.relpath(path, directory) not in checkpoint.done]
+    stats = ImportStats(total=len(files), skipped=len(files) - len(pending))
+    if limit:
+        pending = pending[:limit]
+    print(f"Importing {len(pending)} of {len(files)} files ({stats.skipped} already done) with {workers} workers")
+
+    loop = asyncio.get_running_loop()
+    # A file holds a pipeline slot from cleaning until its extraction ends, so
+    # at most this many cleaned pages are in memory: enough to keep the process
+    # pool busy while every extraction slot is taken
+    pipeline_slots = asyncio.Semaphore(workers * 2 + concurrency)
+    extract_slots = asyncio.Semaphore(concurrency)
+    writer = _BatchWriter(upstream, checkpoint, stats, dry_run)
+
+    async def process(path: str):
+        name = os.path.relpath(path, directory)
+        try:
+            async with pipeline_slots:
+                started = time.monotonic()
+                url, clean_text, known = await loop.run_in_executor(executor, prepare_file, path)
+                stats.stage_seconds["clean"] += time.monotonic() - started
+                stats.cleaned += 1
+
+                async with extract_slots:
+                    started = time.monotonic()
+                    profile = await extract_profile(text_content=clean_text, llm=upstream.openai, known=known)
+                    stats.stage_seconds["extract"] += time.monotonic() - started
+        except Exception as e:
+            stats.failed += 1
+            print(f"Failed to import {name}: {e}")
+            return
+
+        if not profile:
+            stats.empty += 1
+            checkpoint.record([{"file": name, "status": "empty"}])
+            return
+
+        stats.extracted += 1
+        await writer.add(name, profile_to_fields(profile, linkedin_url=url))
+        if stats.finished and stats.finished % 100 == 0:
+            print(f"Progress: {stats.summary()}")
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            await asyncio.gather(*(process(path) for path in pending))
+        await writer.flush()
+    finally:
+        checkpoint.close()
+
+    return stats.summary()
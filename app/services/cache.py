@@ -0,0 +1,84 @@
+"""
+In-Process Response Cache
+Size-bounded LRU cache with per-entry TTL for Airtable list and record reads
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Hashable
+import time
+
+from app.config import settings
+
+# Sentinel so that falsy cached values (empty lists) still count as hits
+MISSING = object()
+
+
+class TTLCache:
+    """LRU cache whose entries also expire `ttl` seconds after being stored"""
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return MISSING
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+# Cache keys shared by the routers
+LIST_KEY = "list"
+
+
+def record_key(record_id: str) -> tuple:
+    return ("record", record_id)
+
+
+# One cache per Airtable table
+user_cache = TTLCache("user", settings.CACHE_MAX_ENTRIES, settings.CACHE_TTL_SECONDS)
+admin_cache = TTLCache("admin", settings.CACHE_MAX_ENTRIES, settings.CACHE_TTL_SECONDS)
+scraper_cache = TTLCache("scraper", settings.CACHE_MAX_ENTRIES, settings.CACHE_TTL_SECONDS)
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    return {cache.name: cache.stats() for cache in (user_cache, admin_cache, scraper_cache)}
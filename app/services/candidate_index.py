@@ -0,0 +1,205 @@
+"""
+Local Candidate Index
+SQLite FTS5 index over scraped profiles, so searches can be answered without going to LinkedIn
+"""
+from typing import Any, Dict, Iterable, List, Optional
+import asyncio
+import json
+import re
+import sqlite3
+
+from app.config import settings
+from app.services.airtable import list_all_records
+from app.services.mirror import mirror_store
+from app.services.profiles import record_to_candidate
+from app.services.upstream import UpstreamClients
+from app.utils.sqlite_store import SQLiteStore
+
+# Searchable columns and their bm25 weights; id and candidate are stored only
+COLUMNS = ("name", "headline", "titles", "companies", "skills", "location")
+WEIGHTS = (1.0, 2.0, 4.0, 1.0, 3.0, 2.0)
+
+WORD = re.compile(r"\w+")
+
+
+def _entries(value: Any) -> List[Dict[str, Any]]:
+    return [entry for entry in value if isinstance(entry, dict)] if isinstance(value, list) else []
+
+
+def _values(entries: List[Dict[str, Any]], *keys: str) -> str:
+    """Join the first present key of each entry; experience has used both naming styles"""
+    values = []
+    for entry in entries:
+        for key in keys:
+            if entry.get(key):
+                values.append(str(entry[key]))
+                break
+    return " | ".join(values)
+
+
+def index_document(candidate: Dict[str, Any]) -> Dict[str, str]:
+    """Searchable text for a candidate in the shape returned by record_to_candidate"""
+    experience = _entries(candidate.get("Experience"))
+    skills = candidate.get("Skills") or []
+    return {
+        "name": str(candidate.get("Full Name") or ""),
+        "headline": str(candidate.get("Headline") or ""),
+        "titles": _values(experience, "title", "Job Title"),
+        "companies": _values(experience, "company", "Company"),
+        "skills": ", ".join(str(skill) for skill in skills) if isinstance(skills, list) else str(skills),
+        "location": _values(experience, "location", "Location"),
+    }
+
+
+def _phrase(text: str) -> Optional[str]:
+    """An FTS5 prefix phrase for free text, with all query syntax stripped"""
+    words = WORD.findall(text.lower())
+    return '"' + " ".join(words) + '"*' if words else None
+
+
+def _all_words(text: str) -> List[str]:
+    return [phrase for phrase in (_phrase(word) for word in WORD.findall(text)) if phrase]
+
+
+def match_query(
+    role: Optional[str] = None, skills: Optional[str] = None, location: Optional[str] = None
+) -> Optional[str]:
+    """
+    Every role word must appear in a title or the headline and every location
+    word in a location; any one skill is enough, with more skills ranking higher
+    """
+    clauses = []
+    role_words = _all_words(role or "")
+    if role_words:
+        clauses.append("{titles headline} : (" + " AND ".join(role_words) + ")")
+    skill_phrases = [phrase for phrase in (_phrase(skill) for skill in (skills or "").split(",")) if phrase]
+    if skill_phrases:
+        clauses.append("{skills titles headline} : (" + " OR ".join(skill_phrases) + ")")
+    location_words = _all_words(location or "")
+    if location_words:
+        clauses.append("{location} : (" + " AND ".join(location_words) + ")")
+    return " AND ".join(clauses) or None
+
+
+class CandidateIndex(SQLiteStore):
+    """
+    One row per Airtable record, replaced whenever the record is saved again.
+    """
+
+    SCHEMA = f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS candidates USING fts5(
+            id UNINDEXED, {", ".join(COLUMNS)}, candidate UNINDEXED,
+            tokenize = 'unicode61 remove_diacritics 2'
+        );
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.searches = 0
+
+    def _write(self, db: sqlite3.Connection, candidates: List[Dict[str, Any]]):
+        # Airtable has no headline field, so re-indexing a record keeps the one scraped with it
+        stored = {}
+        missing = [candidate["id"] for candidate in candidates if not candidate.get("Headline")]
+        for start in range(0, len(missing), 500):
+            chunk = missing[start:start + 500]
+            stored.update(db.execute(
+                f"SELECT id, candidate FROM candidates WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+            ).fetchall())
+
+        rows = []
+        for candidate in candidates:
+            headline = json.loads(stored[candidate["id"]]).get("Headline") if candidate["id"] in stored else None
+            if headline:
+                candidate = {**candidate, "Headline": headline}
+            document = index_document(candidate)
+            rows.append((candidate["id"], *(document[column] for column in COLUMNS), json.dumps(candidate)))
+        db.executemany("DELETE FROM candidates WHERE id = ?", [(row[0],) for row in rows])
+        db.executemany(f"INSERT INTO candidates VALUES ({', '.join('?' * (len(COLUMNS) + 2))})", rows)
+
+    def add(self, candidates: Iterable[Dict[str, Any]]):
+        """Index or re-index candidates; each needs the Airtable record `id`"""
+        candidates = [candidate for candidate in candidates if candidate.get("id")]
+        if not candidates:
+            return
+        with self._lock:
+            db = self._connect()
+            with db:
+                self._write(db, candidates)
+
+    def replace(self, candidates: Iterable[Dict[str, Any]]):
+        """Make the index hold exactly these candidates"""
+        candidates = [candidate for candidate in candidates if candidate.get("id")]
+        keep = {candidate["id"] for candidate in candidates}
+        with self._lock:
+            db = self._connect()
+            with db:
+                gone = [(row[0],) for row in db.execute("SELECT id FROM candidates") if row[0] not in keep]
+                db.executemany("DELETE FROM candidates WHERE id = ?", gone)
+                self._write(db, candidates)
+
+    def on_mirror_change(self, records: List[Dict[str, Any]], deleted: List[str], replaced: bool):
+        """Follow the mirrored scraper table, including edits and deletes made elsewhere"""
+        candidates = [record_to_candidate(record) for record in records]
+        if replaced:
+            self.replace(candidates)
+            return
+        self.add(candidates)
+        for record_id in deleted:
+            self.remove(record_id)
+
+    def remove(self, candidate_id: str):
+        with self._lock:
+            db = self._connect()
+            db.execute("DELETE FROM candidates WHERE id = ?", (candidate_id,))
+            db.commit()
+
+    def search(
+        self,
+        role: Optional[str] = None,
+        skills: Optional[str] = None,
+        location: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """Best matches first, each candidate with its bm25 `score` (lower is better)"""
+        query = match_query(role, skills, location)
+        if query is None:
+            return []
+        weights = ", ".join(str(weight) for weight in (0.0, *WEIGHTS, 0.0))
+        with self._lock:
+            self.searches += 1
+            rows = self._connect().execute(
+                f"""
+                SELECT candidate, bm25(candidates, {weights}) AS score FROM candidates
+                WHERE candidates MATCH ? ORDER BY score LIMIT ?
+                """,
+                (query, limit),
+            ).fetchall()
+        return [{**json.loads(candidate), "score": round(score, 4)} for candidate, score in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"documents": self.count(), "searches": self.searches}
+
+
+async def backfill_index(index: CandidateIndex, upstream: UpstreamClients):
+    """
+    Build the index from the scraper table if it is empty, e.g. on first start.
+    Once the mirror has loaded the table, its changes keep the index current.
+    """
+    if await asyncio.to_thread(index.count):
+        return
+    try:
+        records = await list_all_records(upstream.airtable_scraper, settings.AIRTABLE_TABLE_ID_SCRAPER)
+    except Exception as e:
+        print(f"Error backfilling candidate index: {e}")
+        return
+    await asyncio.to_thread(index.add, [record_to_candidate(record) for record in records])
+    print(f"Indexed {len(records)} scraped candidates")
+
+
+candidate_index = CandidateIndex(settings.CANDIDATE_INDEX_PATH)
+mirror_store.subscribe("scraper", candidate_index.on_mirror_change)
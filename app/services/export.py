@@ -0,0 +1,124 @@
+"""
+Bulk Resume Export
+Renders many scraped candidates' resumes in parallel and streams them out as a ZIP archive
+"""
+from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
+import io
+import re
+import time
+import zipfile
+
+from app.config import settings
+from app.services.airtable import list_all_records
+from app.services.pdf import PdfRenderer, resume_filename
+from app.services.profiles import record_to_candidate
+from app.services.upstream import UpstreamClients
+
+RECORD_ID = re.compile(r"^rec[A-Za-z0-9]+$")
+
+# Record IDs per filterByFormula request, keeping the query string short
+IDS_PER_REQUEST = 50
+
+
+class _ZipSink(io.RawIOBase):
+    """Write-only, non-seekable file that hands out what was written since the last drain"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+async def fetch_candidates(
+    upstream: UpstreamClients, ids: Optional[List[str]] = None, formula: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Scraped candidates by record ID, or matching an Airtable filterByFormula"""
+    client, table_id = upstream.airtable_scraper, settings.AIRTABLE_TABLE_ID_SCRAPER
+    if ids is None:
+        params = {"filterByFormula": formula} if formula else None
+        return [record_to_candidate(record) for record in await list_all_records(client, table_id, params)]
+
+    invalid = [record_id for record_id in ids if not RECORD_ID.match(record_id)]
+    if invalid:
+        raise ValueError(f"Invalid record IDs: {', '.join(invalid[:5])}")
+
+    records = []
+    for start in range(0, len(ids), IDS_PER_REQUEST):
+        chunk = ids[start:start + IDS_PER_REQUEST]
+        formula = "OR(" + ",".join(f"RECORD_ID()='{record_id}'" for record_id in chunk) + ")"
+        records.extend(await list_all_records(client, table_id, {"filterByFormula": formula}))
+
+    # Keep the caller's order
+    by_id = {record["id"]: record for record in records}
+    return [record_to_candidate(by_id[record_id]) for record_id in ids if record_id in by_id]
+
+
+def _unique_name(name: str, used: Dict[str, int]) -> str:
+    count = used.get(name, 0)
+    used[name] = count + 1
+    if count == 0:
+        return name
+    stem, dot, extension = name.rpartition(".")
+    return f"{stem}_{count + 1}{dot}{extension}"
+
+
+async def zip_resumes(candidates: List[Dict[str, Any]], renderer: PdfRenderer) -> AsyncIterator[bytes]:
+    """
+    Yield a ZIP archive of resume PDFs as each one finishes rendering. Only a
+    window of renders is in flight at a time and every finished PDF is written
+    out immediately, so memory stays flat however many candidates are exported.
+    """
+    sink = _ZipSink()
+    # PDFs are already compressed, so store them as-is
+    archive = zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED)
+    window = max(1, renderer.workers * 2)
+    used_names: Dict[str, int] = {}
+    errors: List[str] = []
+
+    async def render(candidate: Dict[str, Any]):
+        try:
+            return candidate, await renderer.render(candidate), None
+        except Exception as e:
+            return candidate, None, e
+
+    queue = iter(candidates)
+    pending = {asyncio.ensure_future(render(candidate)) for candidate in _take(queue, window)}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                candidate, pdf, error = task.result()
+                if error is not None:
+                    errors.append(f"{candidate.get('Full Name') or candidate.get('id')}: {error}")
+                    continue
+                info = zipfile.ZipInfo(_unique_name(resume_filename(candidate), used_names), time.localtime()[:6])
+                archive.writestr(info, pdf)
+                yield sink.drain()
+            pending |= {asyncio.ensure_future(render(candidate)) for candidate in _take(queue, len(done))}
+
+        if errors:
+            archive.writestr(zipfile.ZipInfo("errors.txt", time.localtime()[:6]), "\n".join(errors))
+        archive.close()
+        yield sink.drain()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def _take(iterator, count: int):
+    for _ in range(count):
+        item = next(iterator, None)
+        if item is None:
+            return
+        yield item
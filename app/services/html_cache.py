@@ -0,0 +1,135 @@
+"""
+Raw HTML Cache
+Gzip-compressed on-disk store of scraped profile HTML, keyed by canonical profile URL
+"""
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+import gzip
+import hashlib
+import os
+import threading
+import time
+
+from app.config import settings
+
+
+def canonical_profile_url(url: str) -> str:
+    """
+    Normalize a LinkedIn profile URL so every variant of the same profile maps
+    to one key: https scheme, www host, lowercase /in/<slug>, no query,
+    fragment, trailing slash or /details/... suffix.
+    """
+    parts = urlsplit(url.strip() if "://" in url else f"https://{url.strip()}")
+    host = parts.netloc.lower()
+    if host.endswith("linkedin.com"):
+        host = "www.linkedin.com"
+
+    segments = [segment for segment in parts.path.lower().split("/") if segment]
+    if len(segments) >= 2 and segments[0] == "in":
+        segments = segments[:2]
+    return f"https://{host}/{'/'.join(segments)}"
+
+
+class HtmlCache:
+    """
+    Files are named by the SHA-256 of the canonical URL. Entries older than
+    `max_age` seconds are treated as misses, and the oldest files are evicted
+    once the directory grows past `max_bytes`.
+    """
+
+    def __init__(self, directory: str, max_age: float, max_bytes: int):
+        self.directory = directory
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha256(canonical_profile_url(url).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{key}.html.gz")
+
+    def get(self, url: str) -> Optional[str]:
+        path = self._path(url)
+        try:
+            age = time.time() - os.path.getmtime(path)
+            if age > self.max_age:
+                self.misses += 1
+                return None
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                html = f.read()
+        except (OSError, EOFError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return html
+
+    def put(self, url: str, html: str):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(url)
+        data = gzip.compress(html.encode("utf-8"), compresslevel=6)
+
+        # Write to a temp file first so readers never see a partial entry
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+
+        with self._lock:
+            total = self._scan_total()
+            try:
+                total -= os.path.getsize(path)
+            except OSError:
+                pass
+            os.replace(tmp_path, path)
+            self._total_bytes = total + len(data)
+            self.writes += 1
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _scan_total(self) -> int:
+        if self._total_bytes is None:
+            self._total_bytes = sum(entry.stat().st_size for entry in self._entries())
+        return self._total_bytes
+
+    def _entries(self):
+        try:
+            return [entry for entry in os.scandir(self.directory) if entry.name.endswith(".html.gz")]
+        except FileNotFoundError:
+            return []
+
+    def _evict(self):
+        """Remove the least recently written entries until under the size bound"""
+        for entry in sorted(self._entries(), key=lambda entry: entry.stat().st_mtime):
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+            except OSError:
+                continue
+            self._total_bytes -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self._scan_total()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "size_bytes": total,
+            "max_bytes": self.max_bytes,
+            "max_age": self.max_age,
+        }
+
+
+html_cache = HtmlCache(
+    settings.HTML_CACHE_DIR,
+    max_age=settings.HTML_CACHE_MAX_AGE_HOURS * 3600,
+    max_bytes=settings.HTML_CACHE_MAX_MB * 1024 * 1024,
+)
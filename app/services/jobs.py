@@ -0,0 +1,248 @@
+"""
+Scrape Job Queue
+SQLite-backed job store and a fixed pool of async workers for scrape/search jobs
+"""
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import json
+import sqlite3
+import time
+import uuid
+
+from fastapi import Request
+
+from app.utils.sqlite_store import SQLiteStore
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+# A handler receives the job payload and a callback for partial results
+JobHandler = Callable[[Dict[str, Any], Callable[[Any], None]], Awaitable[Any]]
+
+
+class JobStore(SQLiteStore):
+    """Persists jobs so queued and interrupted work survives a restart"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            status TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            partial TEXT NOT NULL DEFAULT '[]',
+            result TEXT,
+            error TEXT,
+            created_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL
+        );
+    """
+    ROW_FACTORY = sqlite3.Row
+
+    def _row(self, row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["partial"] = json.loads(job["partial"])
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        return job
+
+    def _get(self, db: sqlite3.Connection, job_id: str) -> Optional[Dict[str, Any]]:
+        return self._row(db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def create(self, kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            db = self._connect()
+            db.execute(
+                "INSERT INTO jobs (id, kind, status, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, kind, QUEUED, json.dumps(payload), time.time()),
+            )
+            db.commit()
+            return self._get(db, job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._get(self._connect(), job_id)
+
+    def list(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        with self._lock:
+            db = self._connect()
+            if status:
+                rows = db.execute(
+                    "SELECT * FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?", (status, limit)
+                )
+            else:
+                rows = db.execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,))
+            return [self._row(row) for row in rows.fetchall()]
+
+    def mark_running(self, job_id: str):
+        with self._lock:
+            db = self._connect()
+            db.execute("UPDATE jobs SET status = ?, started_at = ? WHERE id = ?", (RUNNING, time.time(), job_id))
+            db.commit()
+
+    def append_partial(self, job_id: str, item: Any):
+        with self._lock:
+            db = self._connect()
+            db.execute(
+                "UPDATE jobs SET partial = json_insert(partial, '$[#]', json(?)) WHERE id = ?",
+                (json.dumps(item), job_id),
+            )
+            db.commit()
+
+    def finish(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None):
+        with self._lock:
+            db = self._connect()
+            db.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                (status, json.dumps(result) if result is not None else None, error, time.time(), job_id),
+            )
+            db.commit()
+
+    def requeue_unfinished(self) -> List[str]:
+        """Reset jobs interrupted by a shutdown and return every queued ID, oldest first"""
+        with self._lock:
+            db = self._connect()
+            db.execute("UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?", (QUEUED, RUNNING))
+            db.commit()
+            rows = db.execute("SELECT id FROM jobs WHERE status = ? ORDER BY created_at", (QUEUED,))
+            return [row["id"] for row in rows.fetchall()]
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._connect().execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status")
+            return {row["status"]: row["n"] for row in rows.fetchall()}
+
+
+class JobQueue:
+    """
+    Runs jobs on a fixed number of worker tasks, so no matter how many callers
+    submit work, at most `workers` scrapes hold a browser context at once.
+    Store calls run in threads to keep SQLite off the event loop.
+    """
+
+    def __init__(self, store: JobStore, handlers: Dict[str, JobHandler], workers: int):
+        self.store = store
+        self.handlers = handlers
+        self.workers = workers
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._done: Dict[str, asyncio.Event] = {}
+        self._stopping = False
+
+    async def start(self):
+        for job_id in await asyncio.to_thread(self.store.requeue_unfinished):
+            self._queue.put_nowait(job_id)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job type: {kind}")
+        job = await asyncio.to_thread(self.store.create, kind, payload)
+        self._queue.put_nowait(job["id"])
+        return job
+
+    async def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job is None or job["status"] in FINISHED:
+            return job
+
+        # A queued job is skipped when dequeued; a running one is interrupted
+        await asyncio.to_thread(self.store.finish, job_id, CANCELLED)
+        task = self._running.get(job_id)
+        if task is not None:
+            task.cancel()
+        else:
+            self._notify(job_id)
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def wait(self, job_id: str) -> Dict[str, Any]:
+        """Block until the job has finished and return it"""
+        event = self._done.setdefault(job_id, asyncio.Event())
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job is not None and job["status"] not in FINISHED:
+            await event.wait()
+        self._done.pop(job_id, None)
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    def _notify(self, job_id: str):
+        event = self._done.get(job_id)
+        if event is not None:
+            event.set()
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str):
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job is None or job["status"] != QUEUED:
+            return
+
+        await asyncio.to_thread(self.store.mark_running, job_id)
+        # Handlers report partial results synchronously; each write waits for
+        # the one before it so results are stored in the order reported
+        writes: List[asyncio.Task] = []
+
+        async def write_partial(item: Any, previous: Optional[asyncio.Task]):
+            if previous is not None:
+                await asyncio.wait([previous])
+            await asyncio.to_thread(self.store.append_partial, job_id, item)
+
+        def report(item: Any):
+            writes.append(asyncio.create_task(write_partial(item, writes[-1] if writes else None)))
+
+        task = asyncio.create_task(self.handlers[job["kind"]](job["payload"], report))
+        self._running[job_id] = task
+        try:
+            result = await task
+            if writes:
+                await asyncio.wait(writes)
+            job = await asyncio.to_thread(self.store.get, job_id)
+            if job["status"] != CANCELLED:
+                await asyncio.to_thread(self.store.finish, job_id, SUCCEEDED, result)
+        except asyncio.CancelledError:
+            # Cancelling the worker also cancels the awaited handler task, so
+            # check the flag rather than the task to tell a shutdown apart
+            if self._stopping:
+                # Leave the job as running so it is requeued on restart
+                task.cancel()
+                raise
+            await asyncio.to_thread(self.store.finish, job_id, CANCELLED)
+        except Exception as e:
+            print(f"Job {job_id} failed: {e}")
+            await asyncio.to_thread(self.store.finish, job_id, FAILED, None, str(e))
+        finally:
+            self._running.pop(job_id, None)
+            self._notify(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queue_depth": self._queue.qsize(),
+            "running": len(self._running),
+            "jobs": self.store.counts(),
+        }
+
+
+def get_job_queue(request: Request) -> JobQueue:
+    """Dependency returning the queue created in the app lifespan"""
+    return request.app.state.job_queue
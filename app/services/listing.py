@@ -0,0 +1,224 @@
+"""
+Record Listing
+Sorting, filtering and cursor pagination for the candidate list routes, pushed down to Airtable where it can be
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+import re
+
+from fastapi import HTTPException
+
+from app.models.listing import ListQuery
+from app.services.airtable import AirtableClient, list_all_records
+from app.services.cache import LIST_KEY, MISSING, TTLCache
+
+# Airtable can't sort on a record's creation time, only on fields
+CREATED_TIME = "createdTime"
+
+# Field names end up inside {braces} in formulas, so only plain names are allowed
+FIELD_NAME = re.compile(r"^[\w .-]+$")
+
+
+class TableSpec(NamedTuple):
+    """Which fields of a table the list filters apply to"""
+
+    search_fields: Tuple[str, ...]
+    default_sort: str
+    status_field: Optional[str] = None
+    position_field: Optional[str] = None
+    date_field: Optional[str] = None
+
+
+USER_TABLE = TableSpec(
+    search_fields=("Name", "email", "skills", "profession"),
+    default_sort=CREATED_TIME,
+    position_field="profession",
+)
+
+ADMIN_TABLE = TableSpec(
+    search_fields=("candidateName", "candidateEmail", "positionApplied"),
+    default_sort="reportGeneratedAt",
+    status_field="status",
+    position_field="positionApplied",
+    date_field="reportGeneratedAt",
+)
+
+
+def validate_query(query: ListQuery, spec: TableSpec) -> ListQuery:
+    """Reject options the table can't honour, and fill in its default sort"""
+    if query.sort is not None and not FIELD_NAME.match(query.sort):
+        raise HTTPException(status_code=400, detail="Invalid sort field")
+    for option, field in (("status", spec.status_field), ("position", spec.position_field), ("since_days", spec.date_field)):
+        if getattr(query, option) is not None and field is None:
+            raise HTTPException(status_code=400, detail=f"Filtering by {option} is not supported here")
+    if query.sort is None:
+        query = query.model_copy(update={"sort": spec.default_sort})
+    return query
+
+
+# Status filters follow the admin dashboard's badge colours
+def status_class(status: Any) -> str:
+    status = str(status or "").lower().strip()
+    if ("select" in status or "recommend" in status) and "not" not in status and "reject" not in status:
+        return "recommended"
+    if "reject" in status or "not recommend" in status or "not select" in status:
+        return "not-recommended"
+    return "pending"
+
+
+def _string(text: str) -> str:
+    """An Airtable formula string literal"""
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _lower(field: str) -> str:
+    return f"LOWER({{{field}}}&\"\")"
+
+
+def _status_formula(field: str, status: str) -> str:
+    value = _lower(field)
+    recommended = (
+        f"AND(OR(FIND(\"select\", {value}), FIND(\"recommend\", {value})), "
+        f"NOT(FIND(\"not\", {value})), NOT(FIND(\"reject\", {value})))"
+    )
+    not_recommended = (
+        f"OR(FIND(\"reject\", {value}), FIND(\"not recommend\", {value}), FIND(\"not select\", {value}))"
+    )
+    if status == "recommended":
+        return recommended
+    if status == "not-recommended":
+        return f"AND(NOT({recommended}), {not_recommended})"
+    return f"NOT(OR({recommended}, {not_recommended}))"
+
+
+def airtable_formula(query: ListQuery, spec: TableSpec) -> Optional[str]:
+    """The query's filters as a filterByFormula expression"""
+    clauses = []
+    if query.q:
+        term = _string(query.q.lower())
+        clauses.append("OR(" + ", ".join(f"FIND({term}, {_lower(field)})" for field in spec.search_fields) + ")")
+    if query.status:
+        clauses.append(_status_formula(spec.status_field, query.status))
+    if query.position:
+        clauses.append(f"FIND({_string(query.position.lower())}, {_lower(spec.position_field)})")
+    if query.since_days is not None:
+        # Undated records count as recent, as they always have on the dashboard
+        field = f"{{{spec.date_field}}}"
+        clauses.append(f"OR({field} = BLANK(), IS_AFTER({field}, DATEADD(NOW(), -{query.since_days}, \"days\")))")
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else "AND(" + ", ".join(clauses) + ")"
+
+
+def _parse_date(value: Any) -> Optional[datetime]:
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def matches(record: Dict[str, Any], query: ListQuery, spec: TableSpec) -> bool:
+    """Local equivalent of airtable_formula, for records served from the mirror"""
+    fields = record.get("fields", {})
+    if query.q:
+        term = query.q.lower()
+        if not any(term in str(fields.get(field) or "").lower() for field in spec.search_fields):
+            return False
+    if query.status and status_class(fields.get(spec.status_field)) != query.status:
+        return False
+    if query.position and query.position.lower() not in str(fields.get(spec.position_field) or "").lower():
+        return False
+    if query.since_days is not None and fields.get(spec.date_field):
+        date = _parse_date(fields[spec.date_field])
+        if date is not None and date < datetime.now(timezone.utc) - timedelta(days=query.since_days):
+            return False
+    return True
+
+
+def _sort_key(value: Any):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return (1, str(value).lower())
+    return (0, value)
+
+
+def sort_records(records: List[Dict[str, Any]], field: str, direction: str) -> List[Dict[str, Any]]:
+    """Sort like Airtable: by the field's value, with empty values last either way"""
+    def value(record):
+        return record.get(CREATED_TIME) if field == CREATED_TIME else record.get("fields", {}).get(field)
+
+    present = [record for record in records if value(record) not in (None, "")]
+    missing = [record for record in records if value(record) in (None, "")]
+    present.sort(key=lambda record: _sort_key(value(record)), reverse=direction == "desc")
+    return present + missing
+
+
+def page_local(
+    records: List[Dict[str, Any]], query: ListQuery, spec: TableSpec, filtered: bool = False
+) -> Dict[str, Any]:
+    """Filter, sort and slice records held locally; the cursor is the next row's position"""
+    if not filtered:
+        records = [record for record in records if matches(record, query, spec)]
+    records = sort_records(records, query.sort, query.direction)
+    if query.page_size is None:
+        return {"records": records, "offset": None}
+
+    start = int(query.cursor or 0)
+    end = start + query.page_size
+    return {"records": records[start:end], "offset": str(end) if end < len(records) else None}
+
+
+async def list_records(
+    client: AirtableClient,
+    table_id: str,
+    query: ListQuery,
+    spec: TableSpec,
+    params: Optional[Dict[str, Any]] = None,
+    local: Optional[List[Dict[str, Any]]] = None,
+    cache: Optional[TTLCache] = None,
+) -> Dict[str, Any]:
+    """
+    One page of records and the cursor for the next, as {"records", "offset"}.
+    Mirrored records (`local`) are paged in process. Otherwise filters, sort
+    and page size go to Airtable, except a createdTime sort, which Airtable
+    can't do: that pages the table's full list from `cache` (fetching and
+    caching it under LIST_KEY on a miss) so later pages cost no requests.
+    Airtable cursors are passed through; local cursors are row numbers.
+    """
+    query = validate_query(query, spec)
+    params = dict(params or {})
+    formula = airtable_formula(query, spec)
+    airtable_cursor = query.cursor is not None and not query.cursor.isdigit()
+
+    if local is not None and not airtable_cursor:
+        return page_local(local, query, spec)
+
+    if not airtable_cursor and (query.sort == CREATED_TIME or query.cursor is not None):
+        if cache is not None:
+            cached = cache.get(LIST_KEY)
+            if cached is MISSING:
+                cached = {"records": await list_all_records(client, table_id, params)}
+                cache.set(LIST_KEY, cached)
+            return page_local(cached["records"], query, spec)
+        if formula:
+            params["filterByFormula"] = formula
+        records = await list_all_records(client, table_id, params)
+        return page_local(records, query, spec, filtered=True)
+
+    if formula:
+        params["filterByFormula"] = formula
+
+    params["sort[0][field]"] = query.sort
+    params["sort[0][direction]"] = query.direction
+    if query.page_size is None:
+        return {"records": await list_all_records(client, table_id, params), "offset": None}
+
+    params["pageSize"] = query.page_size
+    if query.cursor:
+        params["offset"] = query.cursor
+    response = await client.get(f"/{table_id}", params=params)
+    if response.status_code == 422:
+        raise HTTPException(status_code=400, detail=response.json().get("error", "Invalid list query"))
+    response.raise_for_status()
+    data = response.json()
+    return {"records": data.get("records", []), "offset": data.get("offset")}
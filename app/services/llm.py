@@ -0,0 +1,169 @@
+"""
+OpenAI Client
+Process-wide async OpenAI client with a pooled transport, concurrency cap and tokens-per-minute limit
+"""
+from typing import Any, Dict, List, Optional
+import asyncio
+import math
+import random
+import re
+import time
+
+import httpx
+import openai
+from openai import AsyncOpenAI
+
+from app.config import settings
+from app.services.rate_limit import TokenBucket
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset(value: str) -> float:
+    """Parse OpenAI reset durations such as "1m30.5s", "6s" or "250ms" into seconds"""
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in _DURATION_PART.findall(value))
+
+
+def estimate_tokens(messages: List[Dict[str, Any]]) -> int:
+    """Rough prompt size at ~4 characters per token"""
+    return math.ceil(sum(len(str(message.get("content", ""))) for message in messages) / 4)
+
+
+class LLMClient:
+    """
+    Every completion first waits for a slot (at most `max_concurrency` in
+    flight) and then for its estimated tokens from a bucket refilled at
+    `tokens_per_minute`. The estimate is settled against the reported usage,
+    and a 429 pauses all callers until the reset given in the response headers.
+    """
+
+    def __init__(self, api_key: str, max_concurrency: int, tokens_per_minute: int):
+        self.api_key = api_key
+        self._client: Optional[AsyncOpenAI] = None
+        self.max_concurrency = max_concurrency
+        self.bucket = TokenBucket(tokens_per_minute / 60, tokens_per_minute)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.requests = 0
+        self.in_flight = 0
+        self.waiting = 0
+        self.throttled = 0
+        self.retries = 0
+        self.tokens_used = 0
+        self.queue_seconds_total = 0.0
+        self.queue_seconds_max = 0.0
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        # Created on first use so the app starts without an API key configured
+        if self._client is None:
+            self._client = AsyncOpenAI(
+                api_key=self.api_key,
+                http_client=httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=self.max_concurrency,
+                        max_keepalive_connections=self.max_concurrency,
+                        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+                    ),
+                    timeout=httpx.Timeout(settings.OPENAI_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT),
+                ),
+                # Retries are handled here so they also respect the shared limits
+                max_retries=0,
+            )
+        return self._client
+
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> float:
+        headers = response.headers
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000 + random.uniform(0, 0.5)
+        if headers.get("retry-after"):
+            try:
+                return float(headers["retry-after"]) + random.uniform(0, 0.5)
+            except ValueError:
+                pass
+
+        # Wait for whichever limit is exhausted to reset
+        resets = [
+            parse_reset(headers.get(f"x-ratelimit-reset-{kind}", ""))
+            for kind in ("tokens", "requests")
+            if headers.get(f"x-ratelimit-remaining-{kind}") == "0"
+        ]
+        if any(resets):
+            return max(resets) + random.uniform(0, 0.5)
+
+        delay = min(settings.OPENAI_BACKOFF_MAX, settings.OPENAI_BACKOFF_BASE * 2 ** attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    async def complete(self, **kwargs):
+        """chat.completions.create under the shared concurrency and token limits"""
+        estimate = estimate_tokens(kwargs.get("messages", [])) + settings.OPENAI_COMPLETION_TOKENS_ESTIMATE
+        attempt = 0
+        while True:
+            queued_at = time.monotonic()
+            self.waiting += 1
+            try:
+                await self._semaphore.acquire()
+            finally:
+                self.waiting -= 1
+            try:
+                await self.bucket.acquire(estimate)
+                queued = time.monotonic() - queued_at
+                self.queue_seconds_total += queued
+                self.queue_seconds_max = max(self.queue_seconds_max, queued)
+                self.requests += 1
+                self.in_flight += 1
+                try:
+                    response = await self.client.chat.completions.create(**kwargs)
+                finally:
+                    self.in_flight -= 1
+            except openai.RateLimitError as e:
+                if attempt >= settings.OPENAI_MAX_RETRIES:
+                    raise
+                self.throttled += 1
+                self.retries += 1
+                delay = self._retry_delay(e.response, attempt)
+                print(f"OpenAI rate limited, retrying in {delay:.1f}s")
+                self.bucket.pause(delay)
+            else:
+                if response.usage is not None:
+                    self.tokens_used += response.usage.total_tokens
+                    self.bucket.adjust(response.usage.total_tokens - estimate)
+                return response
+            finally:
+                self._semaphore.release()
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting + self.bucket.waiting,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "tokens_used": self.tokens_used,
+            "tokens_per_minute": round(self.bucket.rate * 60),
+            "queue_seconds_avg": round(self.queue_seconds_total / self.requests, 3) if self.requests else 0.0,
+            "queue_seconds_max": round(self.queue_seconds_max, 3),
+        }
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+
+def llm_client() -> LLMClient:
+    """Build a client from settings; the app keeps one on UpstreamClients"""
+    return LLMClient(
+        settings.OPENAI_API_KEY,
+        max_concurrency=settings.OPENAI_MAX_CONCURRENCY,
+        tokens_per_minute=settings.OPENAI_TPM_LIMIT,
+    )
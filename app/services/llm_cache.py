@@ -0,0 +1,106 @@
+"""
+LLM Extraction Cache
+SQLite store of extraction results keyed by a hash of the model, prompt and cleaned text
+"""
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import sqlite3
+import time
+
+from app.config import settings
+from app.utils.sqlite_store import SQLiteStore
+
+
+def extraction_key(model: str, prompt: str, text: str) -> str:
+    """Any change to the model, the prompt or the input text yields a new key"""
+    digest = hashlib.sha256()
+    for part in (model, prompt, text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ExtractionCache(SQLiteStore):
+    """
+    Entries older than `max_age` seconds are treated as misses and purged, and
+    the least recently used rows are dropped once there are more than
+    `max_entries`.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS extractions (
+            key TEXT PRIMARY KEY,
+            result TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            used_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path: str, max_age: float, max_entries: int):
+        super().__init__(path)
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            db = self._connect()
+            row = db.execute(
+                "SELECT result, created_at FROM extractions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or time.time() - row[1] > self.max_age:
+                self.misses += 1
+                return None
+            db.execute("UPDATE extractions SET used_at = ? WHERE key = ?", (time.time(), key))
+            db.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, result: Any):
+        now = time.time()
+        with self._lock:
+            db = self._connect()
+            db.execute(
+                "INSERT OR REPLACE INTO extractions (key, result, created_at, used_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(result), now, now),
+            )
+            self.writes += 1
+            self._evict(db, now)
+            db.commit()
+
+    def _evict(self, db: sqlite3.Connection, now: float):
+        expired = db.execute("DELETE FROM extractions WHERE created_at < ?", (now - self.max_age,))
+        self.evictions += expired.rowcount
+        overflow = db.execute(
+            """
+            DELETE FROM extractions WHERE key IN (
+                SELECT key FROM extractions ORDER BY used_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        )
+        self.evictions += overflow.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._connect().execute("SELECT COUNT(*) FROM extractions").fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "max_age": self.max_age,
+        }
+
+
+extraction_cache = ExtractionCache(
+    settings.LLM_CACHE_PATH,
+    max_age=settings.LLM_CACHE_MAX_AGE_DAYS * 86400,
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+)
@@ -0,0 +1,294 @@
+"""
+Airtable Mirror
+Local SQLite copy of the user, admin and scraper tables, kept current by a background sync
+"""
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from datetime import datetime, timezone
+import asyncio
+import json
+import sqlite3
+import time
+
+from fastapi import Request
+
+from app.config import settings
+from app.services.airtable import list_all_records
+from app.services.upstream import UpstreamClients
+from app.utils.sqlite_store import SQLiteStore
+
+TABLES = ("user", "admin", "scraper")
+
+# Called with (changed records, deleted record IDs, whether the table was replaced)
+MirrorListener = Callable[[List[Dict[str, Any]], List[str], bool], None]
+
+
+def _record(row: sqlite3.Row) -> Dict[str, Any]:
+    """A mirrored row in the shape Airtable returns it"""
+    record = {"id": row["id"], "fields": json.loads(row["fields"])}
+    if row["created_time"]:
+        record["createdTime"] = row["created_time"]
+    return record
+
+
+class MirrorStore(SQLiteStore):
+    """
+    Records of every mirrored table, in Airtable's listing order. Readers
+    fall back to Airtable until this process has stored a full listing of the
+    table (what is on disk may predate edits made while the app was down), and
+    again whenever the last successful sync is a sweep interval old.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS records (
+            tbl TEXT NOT NULL,
+            id TEXT NOT NULL,
+            fields TEXT NOT NULL,
+            created_time TEXT,
+            position INTEGER NOT NULL,
+            PRIMARY KEY (tbl, id)
+        );
+        CREATE INDEX IF NOT EXISTS records_position ON records (tbl, position);
+        CREATE TABLE IF NOT EXISTS tables (
+            tbl TEXT PRIMARY KEY,
+            synced_at REAL NOT NULL,
+            loaded_at REAL NOT NULL
+        );
+    """
+    ROW_FACTORY = sqlite3.Row
+
+    # Deletions made through the API are remembered this long, so a sync that
+    # started before the delete can't bring the record back
+    TOMBSTONE_SECONDS = 3600
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._replaced: Set[str] = set()
+        self._deleted: Dict[Tuple[str, str], float] = {}
+        self._listeners: Dict[str, List[MirrorListener]] = {}
+
+    def subscribe(self, table: str, listener: MirrorListener):
+        """Have `listener` called after every committed change to `table`"""
+        self._listeners.setdefault(table, []).append(listener)
+
+    def _notify(self, table: str, records: List[Dict[str, Any]], deleted: List[str], replaced: bool):
+        for listener in self._listeners.get(table, []):
+            listener(records, deleted, replaced)
+
+    def _live(self, table: str, records: List[Dict[str, Any]], synced_at: Optional[float]) -> List[Dict[str, Any]]:
+        if synced_at is None or not self._deleted:
+            return records
+        return [record for record in records if self._deleted.get((table, record["id"]), 0) < synced_at]
+
+    def replace(self, table: str, records: List[Dict[str, Any]], synced_at: float):
+        """Store a full listing; anything not in it has been deleted upstream"""
+        with self._lock:
+            records = self._live(table, records, synced_at)
+            db = self._connect()
+            with db:
+                db.execute("DELETE FROM records WHERE tbl = ?", (table,))
+                db.executemany(
+                    "INSERT INTO records (tbl, id, fields, created_time, position) VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (table, record["id"], json.dumps(record.get("fields", {})), record.get("createdTime"), position)
+                        for position, record in enumerate(records)
+                    ],
+                )
+                db.execute(
+                    "INSERT OR REPLACE INTO tables (tbl, synced_at, loaded_at) VALUES (?, ?, ?)",
+                    (table, synced_at, synced_at),
+                )
+            self._replaced.add(table)
+        self._notify(table, records, [], True)
+
+    def upsert(self, table: str, records: List[Dict[str, Any]], synced_at: Optional[float] = None):
+        """Apply changed records in place; new ones go after the last known record"""
+        with self._lock:
+            records = self._live(table, records, synced_at)
+            db = self._connect()
+            with db:
+                for record in records:
+                    updated = db.execute(
+                        "UPDATE records SET fields = ?, created_time = COALESCE(?, created_time) WHERE tbl = ? AND id = ?",
+                        (json.dumps(record.get("fields", {})), record.get("createdTime"), table, record["id"]),
+                    )
+                    if updated.rowcount == 0:
+                        db.execute(
+                            """
+                            INSERT INTO records (tbl, id, fields, created_time, position)
+                            SELECT ?, ?, ?, ?, COALESCE(MAX(position), -1) + 1 FROM records WHERE tbl = ?
+                            """,
+                            (table, record["id"], json.dumps(record.get("fields", {})), record.get("createdTime"), table),
+                        )
+                if synced_at is not None:
+                    db.execute("UPDATE tables SET synced_at = ? WHERE tbl = ?", (synced_at, table))
+        self._notify(table, records, [], False)
+
+    def delete(self, table: str, record_id: str):
+        now = time.time()
+        with self._lock:
+            self._deleted = {
+                key: deleted_at for key, deleted_at in self._deleted.items()
+                if now - deleted_at < self.TOMBSTONE_SECONDS
+            }
+            self._deleted[(table, record_id)] = now
+            db = self._connect()
+            with db:
+                db.execute("DELETE FROM records WHERE tbl = ? AND id = ?", (table, record_id))
+        self._notify(table, [], [record_id], False)
+
+    def loaded(self, table: str) -> Optional[Dict[str, float]]:
+        """When the table was last fully loaded and last synced, or None before the first load"""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT synced_at, loaded_at FROM tables WHERE tbl = ?", (table,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def replaced_since_start(self, table: str) -> bool:
+        """Whether this process has stored a full listing of the table"""
+        return table in self._replaced
+
+    def fresh(self, table: str) -> bool:
+        """Whether readers may be served the table from the mirror"""
+        if not settings.AIRTABLE_MIRROR_ENABLED or not self.replaced_since_start(table):
+            return False
+        state = self.loaded(table)
+        return state is not None and time.time() - state["synced_at"] < settings.AIRTABLE_MIRROR_SWEEP_SECONDS
+
+    def records(self, table: str) -> Optional[List[Dict[str, Any]]]:
+        """Every record of the table, or None if it isn't fresh enough to serve"""
+        if not self.fresh(table):
+            return None
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT id, fields, created_time FROM records WHERE tbl = ? ORDER BY position", (table,)
+            ).fetchall()
+        return [_record(row) for row in rows]
+
+    def get(self, table: str, record_id: str) -> Optional[Dict[str, Any]]:
+        """
+        One record of the table. Returns None if the table isn't fresh enough to
+        serve or the record isn't mirrored, so the caller asks Airtable instead.
+        """
+        if not self.fresh(table):
+            return None
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT id, fields, created_time FROM records WHERE tbl = ? AND id = ?", (table, record_id)
+            ).fetchone()
+        return _record(row) if row else None
+
+    def count(self, table: str) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM records WHERE tbl = ?", (table,)).fetchone()[0]
+
+
+def _modified_since(timestamp: float) -> str:
+    since = datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    return f"IS_AFTER(LAST_MODIFIED_TIME(), DATETIME_PARSE('{since}'))"
+
+
+class MirrorSync:
+    """
+    One sync loop per configured table. The first pass in each process loads
+    the whole table,
+    then every `interval` seconds only records whose LAST_MODIFIED_TIME() is
+    after the previous poll (less an overlap for clock skew) are fetched.
+    Airtable doesn't report deletions, so every `sweep_interval` seconds the
+    table is listed in full again and records missing from it are dropped.
+    """
+
+    def __init__(self, store: MirrorStore, upstream: UpstreamClients, interval: float, sweep_interval: float):
+        self.store = store
+        self.upstream = upstream
+        self.interval = interval
+        self.sweep_interval = sweep_interval
+        self._tasks: List[asyncio.Task] = []
+        self._stats: Dict[str, Dict[str, Any]] = {
+            table: {"syncs": 0, "full_loads": 0, "changes": 0, "errors": 0, "last_error": None, "last_duration_ms": None}
+            for table in TABLES
+        }
+
+    def _source(self, table: str):
+        if table == "user":
+            return self.upstream.airtable_user, settings.AIRTABLE_TABLE_ID_USER, {}
+        if table == "admin":
+            return self.upstream.airtable_admin, settings.AIRTABLE_TABLE_ID_ADMIN, {"view": settings.AIRTABLE_VIEW_ID_ADMIN}
+        return self.upstream.airtable_scraper, settings.AIRTABLE_TABLE_ID_SCRAPER, {}
+
+    def start(self):
+        for table in TABLES:
+            if self._source(table)[1]:
+                self._tasks.append(asyncio.create_task(self._run(table)))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self, table: str):
+        while True:
+            try:
+                await self.sync(table)
+            except Exception as e:
+                print(f"Error syncing Airtable mirror for {table}: {e}")
+                self._stats[table]["errors"] += 1
+                self._stats[table]["last_error"] = str(e)
+            await asyncio.sleep(self.interval)
+
+    async def sync(self, table: str):
+        """Run one sync pass: a full load when the sweep is due, else an incremental poll"""
+        client, table_id, params = self._source(table)
+        stats = self._stats[table]
+        started = time.time()
+        state = await asyncio.to_thread(self.store.loaded, table)
+
+        if (
+            state is None
+            or not self.store.replaced_since_start(table)
+            or started - state["loaded_at"] >= self.sweep_interval
+        ):
+            records = await list_all_records(client, table_id, params)
+            await asyncio.to_thread(self.store.replace, table, records, started)
+            stats["full_loads"] += 1
+        else:
+            since = state["synced_at"] - settings.AIRTABLE_MIRROR_OVERLAP_SECONDS
+            records = await list_all_records(
+                client, table_id, {**params, "filterByFormula": _modified_since(since)}
+            )
+            await asyncio.to_thread(self.store.upsert, table, records, started)
+
+        stats["syncs"] += 1
+        stats["changes"] += len(records)
+        stats["last_error"] = None
+        stats["last_duration_ms"] = round((time.time() - started) * 1000, 1)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        tables = {}
+        for table in TABLES:
+            state = self.store.loaded(table)
+            tables[table] = {
+                **self._stats[table],
+                "loaded": state is not None,
+                "serving": self.store.fresh(table),
+                "records": self.store.count(table),
+                # How far behind Airtable the mirror may be
+                "lag_seconds": round(now - state["synced_at"], 1) if state else None,
+                "last_full_load_seconds_ago": round(now - state["loaded_at"], 1) if state else None,
+            }
+        return {
+            "enabled": settings.AIRTABLE_MIRROR_ENABLED,
+            "interval": self.interval,
+            "sweep_interval": self.sweep_interval,
+            "tables": tables,
+        }
+
+
+def get_mirror_sync(request: Request) -> MirrorSync:
+    """Dependency returning the mirror sync created in the app lifespan"""
+    return request.app.state.mirror_sync
+
+
+mirror_store = MirrorStore(settings.AIRTABLE_MIRROR_PATH)
@@ -0,0 +1,219 @@
+"""
+PDF Resume Rendering
+Renders candidate resumes with ReportLab in a worker process pool and caches them by payload hash
+"""
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+import asyncio
+import hashlib
+import io
+import json
+
+from fastapi import Request
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import StyleSheet1, getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+from app.services.cache import MISSING, TTLCache
+
+# Built once per worker process by the pool initializer
+_styles: Optional[StyleSheet1] = None
+
+
+def _init_worker():
+    global _styles
+    _styles = getSampleStyleSheet()
+
+
+def _first(entry: Dict[str, Any], *keys: str) -> str:
+    """The first present key; entries saved before the strict schema use Title Case names"""
+    for key in keys:
+        if entry.get(key):
+            return str(entry[key])
+    return ""
+
+
+def render_resume(body: Dict[str, Any]) -> bytes:
+    """Build the resume PDF for a candidate payload; runs in a worker process"""
+    if _styles is None:
+        _init_worker()
+    styles = _styles
+
+    # Extract candidate data - define all variables at the start
+    name = body.get("Full Name", body.get("Name", "Candidate"))
+    email = body.get("Email", "")
+    phone = body.get("Phone", "")
+    linkedin_url = body.get("linkedin_url", "")
+    skills = body.get("Skills", [])
+    education = body.get("Education", "")
+    experience = body.get("Experience", "")
+    projects = body.get("Projects", "")
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    story = []
+
+    story.append(Paragraph(f"<b>{name}</b>", styles["Title"]))
+    story.append(Spacer(1, 12))
+
+    # Contact Info
+    if email or phone:
+        contact_text = f"<b>Contact:</b> {email}"
+        if phone:
+            contact_text += f" | {phone}"
+        story.append(Paragraph(contact_text, styles["Normal"]))
+        story.append(Spacer(1, 12))
+
+    # LinkedIn
+    if linkedin_url:
+        story.append(Paragraph(f"<b>LinkedIn:</b> {linkedin_url}", styles["Normal"]))
+        story.append(Spacer(1, 12))
+
+    # Skills
+    if skills:
+        skills_text = ", ".join(skills) if isinstance(skills, list) else str(skills)
+        story.append(Paragraph("<b>Skills:</b>", styles["Heading2"]))
+        story.append(Paragraph(skills_text, styles["Normal"]))
+        story.append(Spacer(1, 12))
+
+    # Education
+    if education:
+        story.append(Paragraph("<b>Education:</b>", styles["Heading2"]))
+        if isinstance(education, list):
+            for edu in education:
+                if isinstance(edu, dict):
+                    edu_text = (
+                        f"{_first(edu, 'school', 'Institution')} - {_first(edu, 'degree', 'Degree')} "
+                        f"({_first(edu, 'start_date', 'Start Date')} - {_first(edu, 'end_date', 'End Date')})"
+                    )
+                else:
+                    edu_text = str(edu)
+                story.append(Paragraph(edu_text, styles["Normal"]))
+                story.append(Spacer(1, 6))
+        else:
+            edu_text = str(education).replace("\n", "<br/>")
+            story.append(Paragraph(edu_text, styles["Normal"]))
+        story.append(Spacer(1, 12))
+
+    # Experience
+    if experience:
+        story.append(Paragraph("<b>Experience:</b>", styles["Heading2"]))
+        if isinstance(experience, list):
+            for exp in experience:
+                if isinstance(exp, dict):
+                    exp_text = (
+                        f"{_first(exp, 'title', 'Job Title')} at {_first(exp, 'company', 'Company')} "
+                        f"({_first(exp, 'start_date', 'Start Date')} - {_first(exp, 'end_date', 'End Date')})"
+                    )
+                else:
+                    exp_text = str(exp)
+                story.append(Paragraph(exp_text, styles["Normal"]))
+                story.append(Spacer(1, 6))
+        else:
+            exp_text = str(experience).replace("\n", "<br/>")
+            story.append(Paragraph(exp_text, styles["Normal"]))
+        story.append(Spacer(1, 12))
+
+    # Projects
+    if projects:
+        story.append(Paragraph("<b>Projects:</b>", styles["Heading2"]))
+        proj_text = str(projects).replace("\n", "<br/>")
+        story.append(Paragraph(proj_text, styles["Normal"]))
+
+    # Build PDF
+    doc.build(story)
+    return buffer.getvalue()
+
+
+def resume_filename(body: Dict[str, Any]) -> str:
+    """Create safe filename from candidate name"""
+    name = body.get("Full Name", body.get("Name", "Candidate"))
+    safe_name = "".join(c for c in str(name) if c.isalnum() or c in (' ', '-', '_')).strip()
+    safe_name = safe_name.replace(' ', '_')
+    return f"{safe_name}_Resume.pdf"
+
+
+def payload_key(body: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(body, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class PdfRenderer:
+    """
+    At most `workers` resumes render at once, each in its own process so the
+    event loop never runs ReportLab. Identical payloads are served from the
+    cache, and concurrent requests for the same payload share one render.
+    """
+
+    def __init__(self, workers: int, cache_size: int, cache_ttl: float):
+        self.workers = workers
+        self.cache = TTLCache("pdf", cache_size, cache_ttl)
+        self.renders = 0
+        self.restarts = 0
+        self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    async def start(self):
+        """
+        Start the workers now, before the app has spawned other threads, so
+        the first download doesn't pay for process startup
+        """
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._executor, _init_worker) for _ in range(self.workers)))
+
+    async def render(self, body: Dict[str, Any]) -> bytes:
+        key = payload_key(body)
+        pdf = self.cache.get(key)
+        if pdf is not MISSING:
+            return pdf
+
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._render(body))
+            pending.add_done_callback(lambda future: self._finish(key, future))
+            self._pending[key] = pending
+        # Shielded so a disconnecting client doesn't cancel a render others await
+        return await asyncio.shield(pending)
+
+    async def _render(self, body: Dict[str, Any]) -> bytes:
+        """Render in the pool; if a worker died and broke it, rebuild the pool and retry once"""
+        loop = asyncio.get_running_loop()
+        executor = self._executor
+        try:
+            return await loop.run_in_executor(executor, render_resume, body)
+        except BrokenProcessPool:
+            self._restart(executor)
+            return await loop.run_in_executor(self._executor, render_resume, body)
+
+    def _restart(self, broken: ProcessPoolExecutor):
+        # Renders that failed on the same broken pool share one replacement
+        if self._executor is not broken:
+            return
+        print("PDF worker pool broke, starting a new one")
+        # Its workers are gone, so waiting is immediate and lets the pool release its pipes cleanly
+        broken.shutdown(wait=True, cancel_futures=True)
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        self.restarts += 1
+
+    def _finish(self, key: str, future: asyncio.Future):
+        self._pending.pop(key, None)
+        if not future.cancelled() and future.exception() is None:
+            self.renders += 1
+            self.cache.set(key, future.result())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "renders": self.renders,
+            "restarts": self.restarts,
+            "in_flight": len(self._pending),
+            "cache": self.cache.stats(),
+        }
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_pdf_renderer(request: Request) -> PdfRenderer:
+    """Dependency returning the renderer created in the app lifespan"""
+    return request.app.state.pdf_renderer
@@ -0,0 +1,91 @@
+"""
+Scraped Profile Mapping
+Converts between extracted profile dicts and Airtable scraper-table records
+"""
+from typing import Any, Dict, List, Optional
+import json
+
+
+def _entries_json(entries: Any, limit: int) -> str:
+    """
+    Serialize entries to at most `limit` characters without cutting the JSON:
+    descriptions are dropped first, then trailing entries
+    """
+    text = json.dumps(entries)
+    if len(text) <= limit or not isinstance(entries, list):
+        return text if len(text) <= limit else ""
+    entries = [
+        {key: value for key, value in entry.items() if key != "description"} if isinstance(entry, dict) else entry
+        for entry in entries
+    ]
+    while entries:
+        text = json.dumps(entries)
+        if len(text) <= limit:
+            return text
+        entries = entries[:-1]
+    return ""
+
+
+def _json_list(text: Any) -> List[Any]:
+    """Parse a stored entry list; values cut mid-JSON by older saves read as empty"""
+    if not text:
+        return []
+    try:
+        value = json.loads(text)
+    except (TypeError, ValueError):
+        return []
+    return value if isinstance(value, list) else []
+
+
+def profile_to_fields(profile: Dict[str, Any], linkedin_url: Optional[str] = None) -> Dict[str, Any]:
+    """Map an extracted profile to the scraper table's Airtable fields"""
+    # Convert skills to string
+    skills_str = ""
+    if "Skills" in profile:
+        skills = profile["Skills"]
+        if isinstance(skills, list):
+            skills_str = ", ".join(str(s) for s in skills)
+        else:
+            skills_str = str(skills)
+
+    if linkedin_url is None:
+        linkedin_url = str(profile.get("linkedin_url", ""))
+
+    # Use exact Airtable field names (lowercase with underscores)
+    fields = {
+        "full_name": str(profile.get("Full Name", ""))[:100],
+        "email": str(profile.get("Email", ""))[:100],
+        "phone": str(profile.get("Phone", ""))[:50],
+        "linkedin_url": linkedin_url[:500],
+        "skills": skills_str[:1000] if skills_str else "",
+    }
+
+    # Only add optional fields if they have data
+    education = _entries_json(profile["Education"], 1000) if profile.get("Education") else ""
+    if education:
+        fields["education"] = education
+    experience = _entries_json(profile["Experience"], 2000) if profile.get("Experience") else ""
+    if experience:
+        fields["experience"] = experience
+    if profile.get("Projects"):
+        fields["projects"] = str(profile["Projects"])[:1000]
+    if profile.get("URLs"):
+        fields["urls"] = str(profile["URLs"])[:500]
+
+    return fields
+
+
+def record_to_candidate(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Transform an Airtable record to match frontend expectations"""
+    fields = record.get("fields", {})
+    return {
+        "id": record.get("id"),
+        "Full Name": fields.get("full_name", ""),
+        "Email": fields.get("email", ""),
+        "Phone": fields.get("phone", ""),
+        "linkedin_url": fields.get("linkedin_url", ""),
+        "Skills": fields.get("skills", "").split(", ") if fields.get("skills") else [],
+        "Education": _json_list(fields.get("education")),
+        "Experience": _json_list(fields.get("experience")),
+        "Projects": fields.get("projects", ""),
+    }
@@ -0,0 +1,74 @@
+"""
+Rate Limiting
+Async token bucket used to keep upstream calls under a requests- or tokens-per-second limit
+"""
+from typing import Any, Dict
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Refills `rate` tokens per second up to `capacity`.
+    Callers that find the bucket empty wait in FIFO order instead of failing.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.waiting = 0
+        self.delayed = 0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1):
+        """Wait until `amount` tokens are available and take them (at most `capacity`)"""
+        amount = min(amount, self.capacity)
+        self.waiting += 1
+        try:
+            async with self._lock:
+                was_delayed = False
+                while True:
+                    now = time.monotonic()
+                    if now < self.paused_until:
+                        delay = self.paused_until - now
+                    else:
+                        self._refill(now)
+                        if self.tokens >= amount:
+                            self.tokens -= amount
+                            return
+                        delay = (amount - self.tokens) / self.rate
+
+                    if not was_delayed:
+                        self.delayed += 1
+                        was_delayed = True
+                    await asyncio.sleep(delay)
+        finally:
+            self.waiting -= 1
+
+    def adjust(self, amount: float):
+        """Take `amount` more tokens after the fact, or give them back if negative"""
+        now = time.monotonic()
+        if now > self.updated:
+            self._refill(now)
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+    def pause(self, seconds: float):
+        """Hold back every caller for `seconds`, e.g. after the upstream answered 429"""
+        now = time.monotonic()
+        self.paused_until = max(self.paused_until, now + seconds)
+        self.tokens = 0
+        self.updated = max(self.updated, self.paused_until)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rate": self.rate,
+            "queue_depth": self.waiting,
+            "delayed": self.delayed,
+        }
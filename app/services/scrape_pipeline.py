@@ -0,0 +1,158 @@
+"""
+Scrape Pipeline
+Scrape -> clean -> extract -> save, shared by the scraper routes and job workers
+"""
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+
+from app.config import settings
+from app.models.profile import ScrapedProfile
+from app.services.airtable import create_records
+from app.services.browser_pool import BrowserPool
+from app.services.cache import scraper_cache, LIST_KEY
+from app.services.candidate_index import candidate_index
+from app.services.html_cache import html_cache
+from app.services.mirror import mirror_store
+from app.services.profiles import profile_to_fields, record_to_candidate
+from app.services.upstream import UpstreamClients
+from app.utils.reader.debug_dump import dump_scrape
+from app.utils.reader.extract_profile import extract_profile
+from app.utils.reader.known_fields import extract_known_fields
+from app.utils.reader.process_html import linkedin_clean
+from app.utils.scraper.login import scrape_linkedin
+from app.utils.scraper.search import search_candidates
+from app.utils.timing import PhaseTimer
+
+
+def indexed_candidate(record_id: str, profile: Dict[str, Any], fields: Dict[str, Any]) -> Dict[str, Any]:
+    """A saved record as the candidate index stores it, keeping the headline Airtable doesn't"""
+    candidate = record_to_candidate({"id": record_id, "fields": fields})
+    if profile.get("Headline"):
+        candidate["Headline"] = profile["Headline"]
+    return candidate
+
+
+async def run_scrape(
+    url: str, upstream: UpstreamClients, pool: BrowserPool, force_refresh: bool = False
+) -> Dict[str, Any]:
+    """Scrape a single profile and save it; returns {"profile": ..., "timings": ...}"""
+    timer = PhaseTimer()
+    scraped = ScrapedProfile(url=url)
+
+    # STEP 1: SCRAPE LINKEDIN (cached HTML, else a warm context from the browser pool)
+    if not force_refresh:
+        with timer.phase("html_cache"):
+            scraped.html = await asyncio.to_thread(html_cache.get, url)
+
+    if scraped.html is None:
+        scraped.html, scrape_timings = await scrape_linkedin(url, pool)
+        timer.update(scrape_timings)
+        await asyncio.to_thread(html_cache.put, url, scraped.html)
+
+    # STEP 2: CLEAN HTML and read the fields the markup gives us directly (run in thread)
+    with timer.phase("clean"):
+        scraped.clean_text = await asyncio.to_thread(linkedin_clean, scraped.html)
+        scraped.known_fields = await asyncio.to_thread(extract_known_fields, scraped.html)
+
+    # STEP 3: AI EXTRACTION (shared OpenAI client, text passed in memory)
+    with timer.phase("extract"):
+        scraped.profile = await extract_profile(
+            text_content=scraped.clean_text, llm=upstream.openai, known=scraped.known_fields
+        )
+    profile_data = scraped.profile
+
+    # STEP 4: Save to Airtable
+    if profile_data:
+        with timer.phase("save"):
+            try:
+                airtable_fields = profile_to_fields(profile_data, linkedin_url=url)
+
+                print(f"Saving to Airtable with fields: {list(airtable_fields.keys())}")
+
+                response = await upstream.airtable_scraper.post(
+                    f"/{settings.AIRTABLE_TABLE_ID_SCRAPER}",
+                    json={"fields": airtable_fields},
+                )
+
+                if response.status_code != 200:
+                    error_detail = response.text
+                    print(f"Airtable error response: {error_detail}")
+                    print(f"Attempted to save fields: {airtable_fields}")
+
+                response.raise_for_status()
+                record = response.json()
+                scraper_cache.delete(LIST_KEY)
+                await asyncio.to_thread(mirror_store.upsert, "scraper", [record])
+                await asyncio.to_thread(
+                    candidate_index.add, [indexed_candidate(record["id"], profile_data, airtable_fields)]
+                )
+                print("Successfully saved to Airtable!")
+
+            except Exception as e:
+                print(f"Error saving to Airtable: {e}")
+                # Don't fail the whole request if Airtable save fails
+
+    scraped.timings = timer.as_dict()
+    await asyncio.to_thread(dump_scrape, scraped)
+    print(f"Scrape pipeline timings for {url} (ms): {scraped.timings}")
+    return {"profile": profile_data, "timings": scraped.timings}
+
+
+async def run_search(
+    role: Optional[str],
+    skills: Optional[str],
+    location: Optional[str],
+    experience: Optional[str],
+    upstream: UpstreamClients,
+    pool: BrowserPool,
+    on_profile: Optional[Callable[[Dict[str, Any]], None]] = None,
+    force_refresh: bool = False,
+) -> List[Dict[str, Any]]:
+    """Search LinkedIn, scrape the hits and save them to Airtable in batches"""
+    # Search and scrape with a warm context from the browser pool
+    profiles = await search_candidates(
+        role, skills, location, experience, pool,
+        on_profile=on_profile, html_cache=html_cache, force_refresh=force_refresh, llm=upstream.openai,
+    )
+
+    # Save all profiles to Airtable in batches, reporting the outcome per profile
+    if profiles and isinstance(profiles, list):
+        fields = [profile_to_fields(profile) for profile in profiles]
+        results = await create_records(upstream.airtable_scraper, settings.AIRTABLE_TABLE_ID_SCRAPER, fields)
+        saved, records = [], []
+        for profile, profile_fields, result in zip(profiles, fields, results):
+            if result["ok"]:
+                profile["id"] = result["id"]
+                records.append({"id": result["id"], "fields": profile_fields})
+                saved.append(indexed_candidate(result["id"], profile, profile_fields))
+                print(f"Saved profile: {profile.get('Full Name', 'Unknown')}")
+            else:
+                profile["airtable_error"] = result["error"]
+                print(f"Error saving profile to Airtable: {result['error']}")
+        if saved:
+            scraper_cache.delete(LIST_KEY)
+            await asyncio.to_thread(mirror_store.upsert, "scraper", records)
+            await asyncio.to_thread(candidate_index.add, saved)
+
+    return profiles
+
+
+def job_handlers(upstream: UpstreamClients, pool: BrowserPool) -> Dict[str, Any]:
+    """Job types understood by the scrape job queue"""
+
+    async def scrape_job(payload: Dict[str, Any], report: Callable[[Any], None]):
+        return await run_scrape(payload["url"], upstream, pool, force_refresh=payload.get("force_refresh", False))
+
+    async def search_job(payload: Dict[str, Any], report: Callable[[Any], None]):
+        return await run_search(
+            payload.get("role"),
+            payload.get("skills"),
+            payload.get("location"),
+            payload.get("experience"),
+            upstream,
+            pool,
+            on_profile=report,
+            force_refresh=payload.get("force_refresh", False),
+        )
+
+    return {"scrape": scrape_job, "search": search_job}
@@ -0,0 +1,105 @@
+"""
+Upstream HTTP Clients
+Long-lived, pooled httpx clients for every external service the API talks to
+"""
+from typing import Any, Dict
+from fastapi import Request
+import httpx
+
+from app.config import settings
+from app.services.airtable import AirtableClient
+from app.services.llm import LLMClient, llm_client
+from app.services.rate_limit import TokenBucket
+
+AIRTABLE_API_URL = "https://api.airtable.com/v0"
+RETELL_API_URL = "https://api.retellai.com"
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+def _timeout(total: float) -> httpx.Timeout:
+    return httpx.Timeout(total, connect=settings.HTTP_CONNECT_TIMEOUT)
+
+
+def _airtable_client(base_id: str, api_key: str) -> httpx.AsyncClient:
+    """Keep-alive client bound to one Airtable base; requests use the table ID as path"""
+    return httpx.AsyncClient(
+        base_url=f"{AIRTABLE_API_URL}/{base_id}",
+        headers={
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        },
+        limits=_limits(),
+        timeout=_timeout(settings.HTTP_TIMEOUT),
+    )
+
+
+class UpstreamClients:
+    """One keep-alive connection pool per upstream, shared by all requests"""
+
+    def __init__(self):
+        # Airtable limits are per base, so tables sharing a base share a bucket
+        self.airtable_buckets: Dict[str, TokenBucket] = {}
+        self.airtable_user = self._airtable(
+            settings.AIRTABLE_BASE_ID_USER, settings.AIRTABLE_API_KEY_USER
+        )
+        self.airtable_admin = self._airtable(
+            settings.AIRTABLE_BASE_ID_ADMIN, settings.AIRTABLE_API_KEY_ADMIN
+        )
+        self.airtable_scraper = self._airtable(
+            settings.AIRTABLE_BASE_ID_SCRAPER, settings.AIRTABLE_API_KEY_SCRAPER
+        )
+        self.retell = httpx.AsyncClient(
+            base_url=RETELL_API_URL,
+            headers={"Content-Type": "application/json"},
+            limits=_limits(),
+            timeout=_timeout(settings.HTTP_TIMEOUT),
+        )
+        # n8n webhooks are full URLs, so this client has no base_url
+        self.n8n = httpx.AsyncClient(
+            limits=_limits(),
+            timeout=_timeout(settings.N8N_TIMEOUT),
+        )
+        self.openai: LLMClient = llm_client()
+
+    def _airtable(self, base_id: str, api_key: str) -> AirtableClient:
+        bucket = self.airtable_buckets.get(base_id)
+        if bucket is None:
+            bucket = TokenBucket(settings.AIRTABLE_RATE_LIMIT, settings.AIRTABLE_BURST)
+            self.airtable_buckets[base_id] = bucket
+        return AirtableClient(_airtable_client(base_id, api_key), base_id, bucket)
+
+    def airtable_stats(self) -> Dict[str, Dict[str, Any]]:
+        stats = {}
+        for name in ("user", "admin", "scraper"):
+            client = getattr(self, f"airtable_{name}")
+            stats[name] = {"base_id": client.base_id, **client.bucket.stats(), **client.stats()}
+        return stats
+
+    async def aclose(self):
+        for client in (
+            self.airtable_user,
+            self.airtable_admin,
+            self.airtable_scraper,
+            self.retell,
+            self.n8n,
+            self.openai,
+        ):
+            await client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+
+def get_upstream(request: Request) -> UpstreamClients:
+    """Dependency returning the clients created in the app lifespan"""
+    return request.app.state.upstream
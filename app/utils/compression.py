@@ -0,0 +1,47 @@
+"""
+Response Compression
+Gzip middleware that leaves streamed and already-compressed responses alone
+"""
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import Message, Receive, Scope, Send
+
+# NDJSON is streamed page by page and gzip would hold lines back until its
+# buffer fills; archives, PDFs and images are compressed already
+SKIP_CONTENT_TYPES = ("application/x-ndjson", "application/zip", "application/pdf", "image/")
+
+
+def accepts_encoding(accept_encoding: str, coding: str) -> bool:
+    """Whether an Accept-Encoding header allows `coding`, honouring q=0"""
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        if name.strip().lower() == coding:
+            quality = params.replace(" ", "").lower().removeprefix("q=")
+            try:
+                return not params or float(quality) > 0
+            except ValueError:
+                return True
+    return False
+
+
+class _Responder(GZipResponder):
+    async def send_with_gzip(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            await super().send_with_gzip(message)
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            if content_type.startswith(SKIP_CONTENT_TYPES):
+                # Treated like a response that already has a Content-Encoding
+                self.content_encoding_set = True
+            return
+        await super().send_with_gzip(message)
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """GZipMiddleware, minus the content types in SKIP_CONTENT_TYPES"""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and accepts_encoding(Headers(scope=scope).get("Accept-Encoding", ""), "gzip"):
+            responder = _Responder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
@@ -0,0 +1,40 @@
+"""
+HTTP Caching Helpers
+Weak ETags and 304 Not Modified handling for JSON API responses
+"""
+from typing import Any, Optional
+import hashlib
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+
+def weak_etag(body: bytes) -> str:
+    return 'W/"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison against an If-None-Match header, which may list several tags"""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def json_with_etag(request: Request, content: Any) -> Response:
+    """
+    Render `content` as JSON with a weak ETag; a client that already holds
+    this exact body gets an empty 304 instead. Cache-Control: no-cache lets
+    browsers keep the body but makes them revalidate on every use.
+    """
+    response = JSONResponse(content)
+    etag = weak_etag(response.body)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return response
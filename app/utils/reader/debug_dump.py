@@ -0,0 +1,28 @@
+"""
+Scrape Debug Dumps
+Writes a scrape's cleaned text and extracted profile to SCRAPE_DEBUG_DIR for inspection
+"""
+import json
+import os
+
+from app.config import settings
+from app.models.profile import ScrapedProfile
+from app.services.html_cache import canonical_profile_url
+
+
+def dump_scrape(scraped: ScrapedProfile):
+    """No-op unless SCRAPE_DEBUG_DIR is set; files are named by profile slug"""
+    if not settings.SCRAPE_DEBUG_DIR:
+        return
+
+    slug = canonical_profile_url(scraped.url).rstrip("/").rsplit("/", 1)[-1] or "profile"
+    os.makedirs(settings.SCRAPE_DEBUG_DIR, exist_ok=True)
+    base = os.path.join(settings.SCRAPE_DEBUG_DIR, slug)
+    try:
+        if scraped.clean_text is not None:
+            with open(f"{base}.clean.md", "w", encoding="utf-8") as f:
+                f.write(scraped.clean_text)
+        with open(f"{base}.profile.json", "w", encoding="utf-8") as f:
+            json.dump({"url": scraped.url, "profile": scraped.profile, "timings": scraped.timings}, f, indent=2)
+    except OSError as e:
+        print(f"Could not write debug dump for {scraped.url}: {e}")
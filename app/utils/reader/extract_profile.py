@@ -2,57 +2,201 @@
 Profile Data Extraction using OpenAI
 Extracts structured data from cleaned LinkedIn profile text
 """
+from typing import Optional
+import asyncio
 import openai
 import json
-import os
 from dotenv import load_dotenv
+from pydantic import ValidationError
+
+from app.models.profile import CandidateProfile
+from app.services.llm import LLMClient, llm_client
+from app.services.llm_cache import extraction_cache, extraction_key
+from app.utils.reader.json_repair import repair_json
+from app.utils.reader.process_html import split_clean_sections
 
 load_dotenv()
-# client = OpenAI(api_key=os.getenv("OPENAI_API_KEY")) # Lazy load instead
 
-def get_client():
-    from openai import OpenAI
-    import httpx
-    # Manually create httpx client to bypass version incompatibility 
-    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=httpx.Client())
+EXTRACTION_MODEL = "gpt-4o-mini"
+
+
+# Strict JSON schema for the profile model, so the API constrains the output to it
+PROFILE_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "candidate_profile",
+        "strict": True,
+        "schema": openai.pydantic_function_tool(CandidateProfile)["function"]["parameters"],
+    },
+}
 
-def safe_json(text: str):
-    """Try multiple ways to convert text to JSON safely."""
-    text = text.strip()
 
-    # 1. Direct attempt
+def parse_profile(text: str):
+    """Validate model output against the profile schema, repairing it locally if needed."""
     try:
-        return json.loads(text)
-    except:
+        return CandidateProfile.model_validate_json(text).to_dict()
+    except ValidationError:
         pass
 
-    # 2. Extract JSON inside text (best method)
-    import re
-    match = re.search(r'\{.*\}', text, re.DOTALL)
-    if match:
-        try:
-            return json.loads(match.group(0))
-        except:
-            pass
-
-    # 3. Use LLM to convert to JSON
-    client = get_client()
-    fixed = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{
-            "role": "user",
-            "content": f"Convert the following into valid JSON only:\n{text}"
-        }]
+    try:
+        data = repair_json(text)
+    except ValueError as e:
+        print(f"Could not parse model output: {e}")
+        return None
+
+    try:
+        return CandidateProfile.model_validate(data).to_dict()
+    except ValidationError as e:
+        print(f"Extracted profile does not match schema, returning as parsed: {e}")
+        return data if isinstance(data, dict) else None
+
+
+ALL_FIELDS = ["Full Name", "Headline", "Email", "Phone", "Skills", "Education", "Experience", "Projects", "URLs"]
+
+# Fields each cleaned section is asked for; other sections get the full list
+SECTION_FIELDS = {
+    "Contact Info": ["Full Name", "Email", "Phone", "URLs"],
+    "Skills": ["Skills"],
+    "Experience": ["Experience"],
+}
+
+# Scalars are taken from the first section in this order that has a value
+SCALAR_PRIORITY = {
+    "Full Name": ["Profile", "Contact Info"],
+    "Headline": ["Profile"],
+    "Email": ["Contact Info", "Profile"],
+    "Phone": ["Contact Info", "Profile"],
+}
+
+# Lists come from their dedicated page when it yielded anything, since the
+# main profile only shows the first few entries
+LIST_SECTIONS = {"Skills": "Skills", "Experience": "Experience"}
+
+# Sections longer than this are split at line boundaries into separate calls
+MAX_SECTION_CHARS = 60000
+
+
+def chunk_text(text: str, limit: int = MAX_SECTION_CHARS):
+    """Split text into pieces of at most `limit` characters, preferring line breaks"""
+    chunks, current, size = [], [], 0
+    for line in text.splitlines():
+        while len(line) > limit:
+            chunks.append(line[:limit])
+            line = line[limit:]
+        if size + len(line) + 1 > limit and current:
+            chunks.append("\n".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def section_fields(section: str, known=None):
+    """Fields to ask the model for in a section, leaving out ones already known"""
+    return [field for field in SECTION_FIELDS.get(section, ALL_FIELDS) if field not in (known or {})]
+
+
+def section_prompts(section: str, fields):
+    """System prompt and user prompt template focused on some fields of one profile section"""
+    fields = "\n".join(f"- {field}" for field in fields)
+
+    system_prompt = (
+        "You are an AI assistant that extracts LinkedIn profile data from raw text.\n"
+        f"The text is the {section} section of a profile. Extract the following fields\n"
+        "into a pure JSON object and leave every other field empty:\n"
+        f"{fields}\n"
     )
 
-    cleaned = fixed.choices[0].message.content.strip()
+    prompt_template = (
+        f"Extract the following fields from the LinkedIn {section} text and return JSON only:\n"
+        f"{fields}\n"
+        "\n"
+        "TEXT:\n"
+        "{text_content}\n"
+    )
+    return system_prompt, prompt_template
 
-    # final attempt
-    return json.loads(cleaned)
 
+async def extract_section(llm: LLMClient, section: str, fields, text_content: str):
+    """Run one extraction call for a section (or chunk of one), using the cache"""
+    system_prompt, prompt_template = section_prompts(section, fields)
+    prompt = prompt_template.format(text_content=text_content)
 
-def extract_profile(path="reader/clean_profile.md", text_content=None):    
-    if not text_content:
+    # Identical cleaned text under the same prompt and model costs no tokens
+    schema = json.dumps(PROFILE_RESPONSE_FORMAT, sort_keys=True)
+    cache_key = extraction_key(EXTRACTION_MODEL, system_prompt + prompt_template + schema, text_content)
+    cached = await asyncio.to_thread(extraction_cache.get, cache_key)
+    if cached is not None:
+        print(f"Extraction cache hit for {section}, skipping LLM call")
+        return cached
+
+    response = await llm.complete(
+        model=EXTRACTION_MODEL,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ],
+        response_format=PROFILE_RESPONSE_FORMAT,
+        temperature=0
+    )
+
+    message = response.choices[0].message
+    raw = message.content
+    if not raw:
+        print(f"Model returned no content for {section}: {getattr(message, 'refusal', None)}")
+        return None
+    print(f"\nRAW MODEL OUTPUT ({section}) --->\n", raw)
+
+    # One model call per chunk: malformed or truncated output is repaired locally
+    result = parse_profile(raw)
+    if result and response.choices[0].finish_reason != "length":
+        await asyncio.to_thread(extraction_cache.put, cache_key, result)
+    return result
+
+
+def _merge_list(values):
+    merged, seen = [], set()
+    for value in values:
+        key = value.casefold() if isinstance(value, str) else json.dumps(value, sort_keys=True)
+        if key not in seen:
+            seen.add(key)
+            merged.append(value)
+    return merged
+
+
+def merge_profiles(parts):
+    """Merge (section, profile) results into a single profile"""
+    merged = {}
+    for field, order in SCALAR_PRIORITY.items():
+        ranked = sorted(parts, key=lambda part: order.index(part[0]) if part[0] in order else len(order))
+        for _, profile in ranked:
+            if profile.get(field):
+                merged[field] = profile[field]
+                break
+
+    for field in ALL_FIELDS:
+        if field in SCALAR_PRIORITY:
+            continue
+        dedicated = [profile.get(field) or [] for section, profile in parts if section == LIST_SECTIONS.get(field)]
+        sources = dedicated if any(dedicated) else [profile.get(field) or [] for _, profile in parts]
+        merged[field] = _merge_list(value for values in sources if isinstance(values, list) for value in values)
+    return merged
+
+
+async def extract_profile(
+    path="reader/clean_profile.md", text_content=None, llm: Optional[LLMClient] = None, known=None
+):
+    """
+    Extract a profile from cleaned text. `path` is only read when no text is
+    given, which is meant for running this module by hand. Pass the app's
+    shared `llm` client; without one a temporary client is used.
+    `known` holds fields already read from the HTML (see extract_known_fields);
+    the model is not asked for them and their values win over its output.
+    """
+    known = {field: value for field, value in (known or {}).items() if value is not None}
+    if text_content is None:
         try:
             with open(path, "r", encoding="utf-8") as f:
                 text_content = f.read()
@@ -63,57 +207,31 @@ def extract_profile(path="reader/clean_profile.md", text_content=None):
     if not text_content:
         return None
 
-    # Truncate text content to avoid token limits (approx 100k characters -> ~25k tokens)
-    # This is conservative to stay well within TPM limits
-    if len(text_content) > 100000:
-        print(f"Warning: Text content too long ({len(text_content)} chars). Truncating to 100,000 chars.")
-        text_content = text_content[:100000]
-
-    system_prompt = """
-    You are an AI assistant that extracts LinkedIn profile data from raw text.
-    Extract the following fields into a pure JSON object:
-    - Full Name
-    - Email
-    - Phone
-    - Skills
-    - Education
-    - Experience
-    - Projects
-    - URLs
-    """
-
-    prompt = f"""
-Extract the following fields from the LinkedIn text and return JSON only:
-- Full Name
-- Email
-- Phone
-- Skills
-- Education
-- Experience
-- Projects
-- URLs
-
-TEXT:
-{text_content}
-"""
-
-    client = get_client()
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0
-    )
-
-    raw = response.choices[0].message.content
-    print("\nRAW MODEL OUTPUT --->\n", raw)
-
-    return safe_json(raw)
+    # Every section (and every chunk of an oversized one) is a separate call,
+    # so nothing is truncated and latency is bounded by the largest section.
+    # The client's semaphore and token budget bound how many run at once
+    jobs = [
+        (section, fields, chunk)
+        for section, body in split_clean_sections(text_content)
+        if (fields := section_fields(section, known))
+        for chunk in chunk_text(body)
+    ]
+    if not jobs:
+        return dict(known) if any(known.values()) else None
+
+    if llm is None:
+        async with llm_client() as llm:
+            results = await asyncio.gather(*(extract_section(llm, *job) for job in jobs))
+    else:
+        results = await asyncio.gather(*(extract_section(llm, *job) for job in jobs))
+
+    parts = [(section, result) for (section, _, _), result in zip(jobs, results) if result]
+    if not parts:
+        return dict(known) if any(known.values()) else None
+    return {**merge_profiles(parts), **known}
 
 
 if __name__ == "__main__":
-    result = extract_profile()
+    result = asyncio.run(extract_profile())
     print("\nFINAL JSON --->")
     print(json.dumps(result, indent=4))
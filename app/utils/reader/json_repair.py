@@ -0,0 +1,97 @@
+"""
+Tolerant JSON Parsing
+Recovers model output that is fenced, has trailing commas or was cut off mid-object
+"""
+from typing import Any, List
+import json
+import re
+
+_STRING = r'"(?:[^"\\]|\\.)*"'
+_COMPLETE_VALUE = re.compile(r'(?:true|false|null|-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?|"|[}\]])$')
+
+
+def _strip_trailing_comma(out: List[str]):
+    while out and out[-1].isspace():
+        out.pop()
+    if out and out[-1] == ",":
+        out.pop()
+
+
+def _drop_dangling(text: str, closer: str) -> str:
+    """Remove a member left incomplete by truncation so the container can be closed"""
+    text = text.rstrip().rstrip(",").rstrip()
+    if not text.endswith(("{", "[", ":")) and not _COMPLETE_VALUE.search(text):
+        # Partial literal such as `tru` or `12.`
+        text = re.sub(r"[A-Za-z0-9.+-]+$", "", text).rstrip().rstrip(",").rstrip()
+    if text.endswith(":"):
+        text = re.sub(_STRING + r"\s*:$", "", text).rstrip().rstrip(",").rstrip()
+    elif closer == "}":
+        # A key with no colon or value yet
+        text = re.sub(r"([{,])\s*" + _STRING + "$", r"\1", text).rstrip().rstrip(",").rstrip()
+    return text
+
+
+def _balance(text: str) -> str:
+    """Drop trailing commas and stray closers, then close anything left open"""
+    out: List[str] = []
+    stack: List[str] = []
+    in_string = False
+    escape = False
+
+    for ch in text:
+        if in_string:
+            out.append(ch)
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+
+        if ch == '"':
+            in_string = True
+            out.append(ch)
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+            out.append(ch)
+        elif ch in "}]":
+            _strip_trailing_comma(out)
+            if stack and stack[-1] == ch:
+                stack.pop()
+                out.append(ch)
+                if not stack:
+                    break
+        else:
+            out.append(ch)
+
+    if in_string:
+        if escape:
+            out.pop()
+        out.append('"')
+
+    repaired = "".join(out)
+    while stack:
+        closer = stack.pop()
+        repaired = _drop_dangling(repaired, closer) + closer
+    return repaired
+
+
+def repair_json(text: str) -> Any:
+    """
+    Parse JSON from model output without another model call. Handles markdown
+    fences, prose around the object, trailing commas and output truncated at
+    the token limit. Raises ValueError if nothing can be recovered.
+    """
+    text = re.sub(r"^```(?:json)?|```$", "", text.strip(), flags=re.MULTILINE).strip()
+    starts = [index for index in (text.find("{"), text.find("[")) if index != -1]
+    if not starts:
+        raise ValueError("No JSON object found in model output")
+    text = text[min(starts):]
+
+    try:
+        return json.JSONDecoder().raw_decode(text)[0]
+    except ValueError:
+        pass
+
+    return json.loads(_balance(text))
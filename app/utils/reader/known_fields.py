@@ -0,0 +1,101 @@
+"""
+Rule-Based Field Extraction
+Reads name, headline and contact details straight from LinkedIn markup so the LLM isn't asked for them
+"""
+import re
+
+from app.utils.reader.process_html import MAIN_SECTION, split_html_sections
+
+try:
+    from lxml import etree
+except ImportError:  # Without lxml every field is left to the LLM
+    etree = None
+
+PHONE = re.compile(r"\+?\d[\d\s().-]{6,}\d")
+EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+CONTACT_HEADINGS = {"email", "phone", "website", "websites", "profile", "your profile", "address", "im", "birthday", "connected"}
+
+
+def _text(element):
+    return " ".join("".join(element.itertext()).split())
+
+
+def _parse(html):
+    parser = etree.HTMLParser(remove_comments=True, no_network=True, huge_tree=True)
+    return etree.fromstring(html, parser)
+
+
+def _top_card(root):
+    fields = {}
+    names = [_text(h1) for h1 in root.iter("h1")]
+    names = [name for name in names if name]
+    if names:
+        fields["Full Name"] = names[0]
+
+    headlines = root.xpath("//div[contains(concat(' ', normalize-space(@class), ' '), ' text-body-medium ')]")
+    headlines = [_text(div) for div in headlines]
+    headlines = [headline for headline in headlines if headline]
+    if headlines:
+        fields["Headline"] = headlines[0]
+    return fields
+
+
+def _contact_modal(root):
+    """
+    Email, phone and URLs from the contact info modal. When the modal's
+    sections were recognised, missing values are reported as empty so the
+    LLM cannot invent them.
+    """
+    headings = {_text(heading).casefold(): heading for heading in root.xpath("//h3 | //h2")}
+    recognised = bool(CONTACT_HEADINGS & set(headings))
+
+    emails = [href[len("mailto:"):].split("?")[0] for href in root.xpath("//a[starts-with(@href, 'mailto:')]/@href")]
+    phones = [href[len("tel:"):] for href in root.xpath("//a[starts-with(@href, 'tel:')]/@href")]
+
+    # Phone and email are often plain text under their section heading
+    for name, pattern, found in (("phone", PHONE, phones), ("email", EMAIL, emails)):
+        heading = headings.get(name)
+        if heading is not None and not found:
+            section = heading.getparent()
+            found.extend(match.group(0).strip() for match in pattern.finditer(_text(section)))
+
+    urls = []
+    for href in root.xpath("//a[starts-with(@href, 'http')]/@href"):
+        # Skip LinkedIn navigation, but keep profile links
+        if "linkedin.com" in href and "linkedin.com/in/" not in href:
+            continue
+        if href not in urls:
+            urls.append(href)
+
+    fields = {}
+    if emails or recognised:
+        fields["Email"] = emails[0] if emails else ""
+    if phones or recognised:
+        fields["Phone"] = phones[0] if phones else ""
+    if urls or recognised:
+        fields["URLs"] = urls
+    return fields
+
+
+def extract_known_fields(html):
+    """
+    Fields that can be read from the scraped HTML without the LLM, keyed like
+    CandidateProfile's aliases. An empty value means the field is known to be
+    absent from the profile.
+    """
+    if etree is None or not html:
+        return {}
+
+    fields = {}
+    for name, part in split_html_sections(html):
+        try:
+            root = _parse(part)
+        except (etree.ParserError, ValueError):
+            continue
+        if root is None:
+            continue
+        if name == MAIN_SECTION:
+            fields.update(_top_card(root))
+        elif name == "Contact Info":
+            fields.update(_contact_modal(root))
+    return fields
@@ -2,43 +2,171 @@
 HTML Processing for LinkedIn Profiles
 Cleans and extracts text from raw HTML
 """
-from bs4 import BeautifulSoup
 import re
 
-def linkedin_clean(html):
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree
+except ImportError:  # Fall back to html.parser below
+    etree = None
+
+DROP_TAGS = ["script", "style", "svg", "img", "video", "audio", "iframe", "noscript", "input", "form", "footer", "header", "nav", "button", "code"]
+
+# LinkedIn UI chrome that never carries profile data (compared case-insensitively)
+BOILERPLATE_LINES = {
+    "send profile in a message", "save to pdf", "request a recommendation", "recommend",
+    "follow", "unfollow", "connect", "message", "send", "repost", "like", "comment",
+    "remove connection", "report / block", "about this profile", "more profiles for you",
+    "people you may know", "people also viewed", "show details", "show all", "show more",
+    "see more", "…see more", "show credential", "status is offline", "status is online",
+    "1st", "2nd", "3rd", "1st degree connection", "second degree connection",
+    "third degree connection", "hashtag", "free insight from sales navigator",
+    "unlock more insights about leads", "improve outreach with sales insights",
+    "1 month free. easy to cancel. no penalties or fees.", "nothing to see for now",
+    "published weekly",
+}
+BOILERPLATE_PATTERNS = re.compile(
+    r"^(?:show all \d+ \w+|try sales navigator.*|.* viewed your profile in the past \d+ days"
+    r"|reach out to .* to understand their buying needs\.?)$"
+)
+
+# Markers scrape_profile_content puts before each extra page it appends
+SECTION_MARKER = re.compile(r"<!--\s*(CONTACT INFO|SKILLS PAGE|EXPERIENCE PAGE) START\s*-->")
+SECTION_NAMES = {"CONTACT INFO": "Contact Info", "SKILLS PAGE": "Skills", "EXPERIENCE PAGE": "Experience"}
+MAIN_SECTION = "Profile"
+SECTION_HEADER = re.compile(
+    r"^## (" + "|".join(re.escape(name) for name in [MAIN_SECTION, *SECTION_NAMES.values()]) + r")$",
+    re.MULTILINE,
+)
+
+# Saved pages declare their own URL in the head; body links point at other profiles
+PAGE_URL = re.compile(
+    r"<(?:link[^>]*rel=[\"']canonical[\"'][^>]*href|meta[^>]*property=[\"']og:url[\"'][^>]*content)=[\"']([^\"']+)[\"']",
+    re.IGNORECASE,
+)
+
+# A line equal to the one before it is dropped (LinkedIn renders each visible
+# text again for screen readers). Short lines are kept when they repeat further
+# apart, since job titles, companies and places legitimately do; lines at least
+# LONG_LINE chars long are dropped on any repeat, which removes headlines from
+# "People also viewed"
+LONG_LINE = 40
+
+
+def _text_lxml(html):
+    parser = etree.HTMLParser(remove_comments=True, remove_pis=True, no_network=True, huge_tree=True)
+    root = etree.fromstring(html, parser)
+    if root is None:
+        return []
+    etree.strip_elements(root, *DROP_TAGS, with_tail=False)
+    return root.itertext()
+
+
+def _text_html_parser(html):
     soup = BeautifulSoup(html, "html.parser")
-    
-    # Remove script and style elements
-    for tag in soup(["script", "style", "svg", "img", "video", "audio", "iframe", "noscript", "input", "form", "footer", "header", "nav", "button", "code"]):
+    for tag in soup(DROP_TAGS):
         tag.decompose()
-        
-    # Remove all attributes to save space? No, sometimes id/class is useful but text extraction ignores it.
-    
+    return soup.stripped_strings
+
+
+def _line_key(line):
+    return line.strip(" ·•|,-").casefold()
+
+
+def dedupe_lines(texts):
+    """Drop boilerplate, short fragments, immediate repeats and repeated long lines"""
     lines = []
-    for text in soup.stripped_strings:
-        if len(text) > 2:
-            lines.append(text)
+    previous = None
+    seen_long = set()
+    for text in texts:
+        line = " ".join(text.split())
+        if len(line) <= 2:
+            continue
+        key = _line_key(line)
+        if key in BOILERPLATE_LINES or BOILERPLATE_PATTERNS.match(key):
+            continue
+        if key == previous or key in seen_long:
+            continue
+        previous = key
+        if len(key) >= LONG_LINE:
+            seen_long.add(key)
+        lines.append(line)
+    return lines
+
+
+def _texts(html):
+    if etree is not None:
+        try:
+            return _text_lxml(html)
+        except (etree.ParserError, ValueError) as e:
+            print(f"lxml could not parse HTML, falling back to html.parser: {e}")
+    return _text_html_parser(html)
+
+
+def split_html_sections(html):
+    """Split combined scrape HTML on its page markers into (section name, html) pairs"""
+    parts = SECTION_MARKER.split(html)
+    sections = [(MAIN_SECTION, parts[0])]
+    for marker, part in zip(parts[1::2], parts[2::2]):
+        sections.append((SECTION_NAMES[marker], part))
+    return sections
+
+
+def split_clean_sections(text):
+    """
+    Split cleaned text back into (section name, text) pairs. Text without
+    section headers is returned as a single main section.
+    """
+    parts = SECTION_HEADER.split(text)
+    sections = []
+    if parts[0].strip():
+        sections.append((MAIN_SECTION, parts[0].strip()))
+    for name, body in zip(parts[1::2], parts[2::2]):
+        if body.strip():
+            sections.append((name, body.strip()))
+    return sections
+
 
-    clean = "\n".join(lines)
+def linkedin_clean(html):
+    """
+    Clean each scraped page separately and join them under "## <Section>"
+    headers, so extraction can treat the sections independently.
+    """
+    sections = []
+    for name, part in split_html_sections(html):
+        lines = dedupe_lines(_texts(part))
+        if lines:
+            sections.append(f"## {name}\n" + "\n".join(lines))
+
+    clean = "\n\n".join(sections)
     return clean
 
 
+def profile_url_from_html(html):
+    """The profile URL a saved page declares (canonical link or og:url), if any"""
+    for match in PAGE_URL.finditer(html, 0, 200000):
+        if "linkedin.com/in/" in match.group(1):
+            return match.group(1)
+    return ""
+
+
 if __name__ == "__main__":
     import sys
     if len(sys.argv) < 2:
-        print("Usage: python process_html.py <html_file>")
+        print("Usage: python process_html.py <html_file> [output_file]")
         sys.exit(1)
-    
+    output = sys.argv[2] if len(sys.argv) > 2 else "clean_profile.md"
+
     # Read HTML from file
     with open(sys.argv[1], "r", encoding="utf-8") as f:
         html = f.read()
-    
+
     # Clean the HTML
     clean = linkedin_clean(html)
-    
-    # Write to clean_profile.md
-    with open("clean_profile.md", "w", encoding="utf-8") as f:
+
+    # Write to the output file (clean_profile.md by default)
+    with open(output, "w", encoding="utf-8") as f:
         f.write(clean)
-    
-    print("Cleaned profile saved to clean_profile.md")
 
+    print(f"Cleaned profile saved to {output}")
@@ -2,139 +2,180 @@
 LinkedIn Login and Profile Scraping
 Handles LinkedIn authentication and profile content extraction
 """
-from playwright.sync_api import sync_playwright, Page, BrowserContext
+from playwright.async_api import Page, BrowserContext, TimeoutError as PlaywrightTimeoutError
+from typing import Dict, NamedTuple
 import json
-import time
 import os
 from pathlib import Path
 from dotenv import load_dotenv
 
+from app.utils.timing import PhaseTimer
+
 load_dotenv()
 
 EMAIL = os.getenv("LINKEDIN_EMAIL")
 PASSWORD = os.getenv("LINKEDIN_PASSWORD")
 SESSION_FILE = "session.json"
 
-def safe_click(page, selector, timeout=3000):
+# Selectors that mean a page has rendered its main content
+PROFILE_READY_SELECTOR = "main h1, h1.text-heading-xlarge"
+DETAILS_READY_SELECTOR = "main section, main .pvs-list"
+
+
+class ScrapeResult(NamedTuple):
+    html: str
+    timings: Dict[str, float]
+
+
+async def wait_for(page, selector, timeout=10000):
+    """Wait for a selector, returning False instead of raising on timeout"""
     try:
-        page.locator(selector).click(timeout=timeout)
-        time.sleep(1)
+        await page.wait_for_selector(selector, timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+async def safe_click(page, selector, timeout=3000):
+    try:
+        await page.locator(selector).click(timeout=timeout)
+        await page.wait_for_load_state("domcontentloaded")
     except:
         pass
 
-def scroll_full_page(page):
-    height = page.evaluate("document.body.scrollHeight")
-    for i in range(0, height, 800):
-        page.evaluate(f"window.scrollTo(0, {i});")
-        time.sleep(0.5)
+async def scroll_full_page(page, step=800, settle_timeout=1500, max_steps=60):
+    """
+    Scroll to the bottom until the document height stops growing.
+    Intermediate steps only trigger lazy loading; the page is considered settled
+    once the bottom is reached and the height does not grow within `settle_timeout`.
+    """
+    height = await page.evaluate("document.body.scrollHeight")
+    position = 0
+    for _ in range(max_steps):
+        position = min(position + step, height)
+        await page.evaluate(f"window.scrollTo(0, {position});")
+        if position < height:
+            continue
 
-def get_browser_context(p, headless=True):
-    browser = p.chromium.launch(headless=headless)
-    context = None
+        try:
+            await page.wait_for_function(
+                f"document.body.scrollHeight > {height}", timeout=settle_timeout
+            )
+        except PlaywrightTimeoutError:
+            break
+        height = await page.evaluate("document.body.scrollHeight")
+
+async def new_browser_context(browser):
+    context = await browser.new_context()
     if os.path.exists(SESSION_FILE):
         try:
             with open(SESSION_FILE, "r") as f:
                 cookies = json.load(f)
-            context = browser.new_context()
-            context.add_cookies(cookies)
+            await context.add_cookies(cookies)
             print("Loaded session cookies.")
         except Exception as e:
             print(f"Failed to load session: {e}")
     
-    if not context:
-        context = browser.new_context()
-    
-    return browser, context
+    return context
 
-def login_if_needed(page, context):
-    page.goto("https://www.linkedin.com/login")
-    time.sleep(2)
+async def login_if_needed(page, context):
+    await page.goto("https://www.linkedin.com/login", wait_until="domcontentloaded")
+    # Logged-in sessions are redirected away from the login form
+    await wait_for(page, "#username, .global-nav", timeout=10000)
 
     if "login" in page.url:
         print("Logging in...")
         if not EMAIL or not PASSWORD:
             raise ValueError("LinkedIn credentials not found in environment variables.")
             
-        page.fill("#username", EMAIL)
-        page.fill("#password", PASSWORD)
-        page.click("button[type=submit]")
-        time.sleep(4)
+        await page.fill("#username", EMAIL)
+        await page.fill("#password", PASSWORD)
+        try:
+            async with page.expect_navigation(wait_until="domcontentloaded", timeout=15000):
+                await page.click("button[type=submit]")
+        except PlaywrightTimeoutError:
+            print("No navigation after login submit, continuing.")
         
         # Save cookies after login
-        cookies = context.cookies()
+        cookies = await context.cookies()
         with open(SESSION_FILE, "w") as f:
             json.dump(cookies, f)
         print("Saved session cookies.")
 
-def scrape_profile_content(page, url):
+async def scrape_profile_content(page, url):
+    """Capture the profile, contact info, skills and experience HTML with per-phase timings"""
+    timer = PhaseTimer()
+
     print(f"Navigating to {url}...")
-    page.goto(url)
-    time.sleep(5)
+    with timer.phase("profile_load"):
+        await page.goto(url, wait_until="domcontentloaded")
+        await wait_for(page, PROFILE_READY_SELECTOR)
 
-    scroll_full_page(page)
+    with timer.phase("profile_scroll"):
+        await scroll_full_page(page)
 
     # Contact Info
     contact_html = ""
-    try:
-        print("Clicking 'Contact info'...")
-        contact_btn = None
-        if page.locator("a[id='top-card-text-details-contact-info']").count() > 0:
-            contact_btn = page.locator("a[id='top-card-text-details-contact-info']")
-        elif page.locator("a[href*='overlay/contact-info']").count() > 0:
-            contact_btn = page.locator("a[href*='overlay/contact-info']")
-        elif page.locator("a:has-text('Contact info')").count() > 0:
-            contact_btn = page.locator("a:has-text('Contact info')").first
-        
-        if contact_btn:
-            contact_btn.click(timeout=3000)
-            time.sleep(2)
-            
-            try:
-                contact_modal = page.locator("div[role='dialog']").first
-                if contact_modal.count() > 0:
-                    contact_html = contact_modal.inner_html()
-                    print("Captured contact info HTML.")
-                else:
-                    contact_div = page.locator("div:has-text('Contact info')").last
-                    if contact_div.count() > 0:
-                        contact_html = contact_div.inner_html()
-            except:
-                pass
-
-            page.locator("button[aria-label='Dismiss']").first.click(timeout=3000)
-        else:
-            print("Contact info button not found.")
+    with timer.phase("contact_info"):
+        try:
+            print("Clicking 'Contact info'...")
+            contact_btn = None
+            if await page.locator("a[id='top-card-text-details-contact-info']").count() > 0:
+                contact_btn = page.locator("a[id='top-card-text-details-contact-info']")
+            elif await page.locator("a[href*='overlay/contact-info']").count() > 0:
+                contact_btn = page.locator("a[href*='overlay/contact-info']")
+            elif await page.locator("a:has-text('Contact info')").count() > 0:
+                contact_btn = page.locator("a:has-text('Contact info')").first
             
-    except Exception as e:
-        print(f"Contact info error: {e}")
-        pass
-
-
-    scroll_full_page(page)
+            if contact_btn:
+                await contact_btn.click(timeout=3000)
+                await wait_for(page, "div[role='dialog']", timeout=5000)
+                
+                try:
+                    contact_modal = page.locator("div[role='dialog']").first
+                    if await contact_modal.count() > 0:
+                        contact_html = await contact_modal.inner_html()
+                        print("Captured contact info HTML.")
+                    else:
+                        contact_div = page.locator("div:has-text('Contact info')").last
+                        if await contact_div.count() > 0:
+                            contact_html = await contact_div.inner_html()
+                except:
+                    pass
+
+                await page.locator("button[aria-label='Dismiss']").first.click(timeout=3000)
+            else:
+                print("Contact info button not found.")
+                
+        except Exception as e:
+            print(f"Contact info error: {e}")
+            pass
 
     # EXPAND ALL SECTIONS
-    for label in [
-        "Show more", 
-        "See more",
-        "Show all experiences",
-        "Show all education",
-        "Show all activities",
-        "Show all about",
-        "Show all projects",
-        "Show all recommendations",
-        "Show all skills"
-    ]:
-        buttons = page.locator(f"button:has-text('{label}')")
-        count = buttons.count()
-        for i in range(count):
-            try:
-                page.locator(f"button:has-text('{label}')").nth(i).click(timeout=2000)
-                time.sleep(0.5)
-            except:
-                pass
-    
-    # Capture Main Profile HTML
-    main_html = page.content()
+    with timer.phase("expand_sections"):
+        await scroll_full_page(page)
+        for label in [
+            "Show more", 
+            "See more",
+            "Show all experiences",
+            "Show all education",
+            "Show all activities",
+            "Show all about",
+            "Show all projects",
+            "Show all recommendations",
+            "Show all skills"
+        ]:
+            buttons = page.locator(f"button:has-text('{label}')")
+            count = await buttons.count()
+            for i in range(count):
+                try:
+                    # Expanders toggle in place, so the click itself is the only wait needed
+                    await page.locator(f"button:has-text('{label}')").nth(i).click(timeout=2000)
+                except:
+                    pass
+        
+        # Capture Main Profile HTML
+        main_html = await page.content()
+
     skills_html = ""
     experience_html = ""
     
@@ -142,30 +183,32 @@ def scrape_profile_content(page, url):
     base_url = url.split("?")[0].rstrip("/")
 
     # SKILLS
-    try:
-        skills_url = f"{base_url}/details/skills/"
-        print(f"Navigating directly to skills page: {skills_url}")
-        page.goto(skills_url)
-        time.sleep(3)
-        scroll_full_page(page)
-        skills_html = page.content()
-        print("Captured skills page HTML.")
-    except Exception as e:
-        print(f"Error navigating to skills page: {e}")
-        pass
+    with timer.phase("skills_page"):
+        try:
+            skills_url = f"{base_url}/details/skills/"
+            print(f"Navigating directly to skills page: {skills_url}")
+            await page.goto(skills_url, wait_until="domcontentloaded")
+            await wait_for(page, DETAILS_READY_SELECTOR)
+            await scroll_full_page(page)
+            skills_html = await page.content()
+            print("Captured skills page HTML.")
+        except Exception as e:
+            print(f"Error navigating to skills page: {e}")
+            pass
 
     # EXPERIENCE
-    try:
-        experience_url = f"{base_url}/details/experience/"
-        print(f"Navigating directly to experience page: {experience_url}")
-        page.goto(experience_url)
-        time.sleep(3)
-        scroll_full_page(page)
-        experience_html = page.content()
-        print("Captured experience page HTML.")
-    except Exception as e:
-        print(f"Error navigating to experience page: {e}")
-        pass
+    with timer.phase("experience_page"):
+        try:
+            experience_url = f"{base_url}/details/experience/"
+            print(f"Navigating directly to experience page: {experience_url}")
+            await page.goto(experience_url, wait_until="domcontentloaded")
+            await wait_for(page, DETAILS_READY_SELECTOR)
+            await scroll_full_page(page)
+            experience_html = await page.content()
+            print("Captured experience page HTML.")
+        except Exception as e:
+            print(f"Error navigating to experience page: {e}")
+            pass
     
     # Combine all parts
     full_html = main_html
@@ -177,17 +220,16 @@ def scrape_profile_content(page, url):
 
     if experience_html:
         full_html += "\n\n<!-- EXPERIENCE PAGE START -->\n\n" + experience_html
-        
-    return full_html
-
-def scrape_linkedin(url):
-    with sync_playwright() as p:
-        browser, context = get_browser_context(p)
-        page = context.new_page()
 
-        login_if_needed(page, context)
-        full_html = scrape_profile_content(page, url)
-
-        browser.close()
-        return full_html
+    timings = timer.as_dict()
+    print(f"Scrape timings for {url} (ms): {timings}")
+    return ScrapeResult(full_html, timings)
 
+async def scrape_linkedin(url, pool):
+    """Scrape one profile using an authenticated context checked out of the browser pool"""
+    async with pool.context() as context:
+        page = await context.new_page()
+        try:
+            return await scrape_profile_content(page, url)
+        finally:
+            await page.close()
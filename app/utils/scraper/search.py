@@ -2,30 +2,87 @@
 LinkedIn Candidate Search
 Searches LinkedIn for candidates and scrapes their profiles
 """
-from playwright.sync_api import sync_playwright
-import time
+import asyncio
 import urllib.parse
-from app.utils.scraper.login import get_browser_context, login_if_needed, scrape_profile_content
+from app.config import settings
+from app.models.profile import ScrapedProfile
+from app.utils.scraper.login import scrape_profile_content, scroll_full_page
 from app.utils.reader.process_html import linkedin_clean
+from app.utils.reader.known_fields import extract_known_fields
 from app.utils.reader.extract_profile import extract_profile
+from app.utils.reader.debug_dump import dump_scrape
+from app.utils.timing import PhaseTimer
 
-def search_candidates(role, skills, location, experience, max_profiles=3):
+async def scrape_and_extract(context, url, semaphore, on_profile=None, html_cache=None, force_refresh=False, llm=None):
+    """
+    Scrape one profile in a new tab, then clean and extract it.
+    The semaphore only covers the browser work, so extraction of this profile
+    overlaps with the scraping of the next one. Profiles found in `html_cache`
+    skip the browser entirely unless `force_refresh` is set. Extraction calls
+    go through the shared `llm` client, which enforces the OpenAI limits.
+    """
+    print(f"Processing candidate: {url}")
+    try:
+        timer = PhaseTimer()
+        scraped = ScrapedProfile(url=url)
+        if html_cache is not None and not force_refresh:
+            with timer.phase("html_cache"):
+                scraped.html = await asyncio.to_thread(html_cache.get, url)
+
+        if scraped.html is None:
+            async with semaphore:
+                page = await context.new_page()
+                try:
+                    # Scrape raw HTML
+                    scraped.html, timings = await scrape_profile_content(page, url)
+                finally:
+                    await page.close()
+            timer.update(timings)
+            if html_cache is not None:
+                await asyncio.to_thread(html_cache.put, url, scraped.html)
+
+        # Clean HTML and read the fields the markup gives us directly
+        with timer.phase("clean"):
+            scraped.clean_text = await asyncio.to_thread(linkedin_clean, scraped.html)
+            scraped.known_fields = await asyncio.to_thread(extract_known_fields, scraped.html)
+
+        # Extract Data using LLM
+        with timer.phase("extract"):
+            scraped.profile = await extract_profile(
+                text_content=scraped.clean_text, llm=llm, known=scraped.known_fields
+            )
+
+        scraped.timings = timer.as_dict()
+        await asyncio.to_thread(dump_scrape, scraped)
+        data = scraped.profile
+        if data:
+            data["linkedin_url"] = url
+            data["timings"] = scraped.timings
+            if on_profile:
+                on_profile(data)
+        return data
+
+    except Exception as e:
+        print(f"Failed to process {url}: {e}")
+        return None
+
+
+async def search_candidates(
+    role, skills, location, experience, pool, max_profiles=3, concurrency=None,
+    on_profile=None, html_cache=None, force_refresh=False, llm=None,
+):
     """
     Search for candidates on LinkedIn and scrape their profiles.
+    Uses an authenticated context checked out of the browser pool and scrapes
+    up to `concurrency` profiles at once (SCRAPER_CONCURRENCY by default).
+    `on_profile` is called with each profile as soon as it has been extracted.
     """
-    profiles_data = []
+    semaphore = asyncio.Semaphore(concurrency or settings.SCRAPER_CONCURRENCY)
     
-    with sync_playwright() as p:
-        browser, context = get_browser_context(p)
-        page = context.new_page()
+    async with pool.context() as context:
+        page = await context.new_page()
 
-        # 1. Login
-        try:
-            login_if_needed(page, context)
-        except Exception as e:
-            print(f"Login failed: {e}")
-            browser.close()
-            return {"error": f"Login failed: {str(e)}"}
+        # 1. Login is handled by the pool when the context is created
 
         # 2. Construct Search URL
         # Format: https://www.linkedin.com/search/results/people/?keywords=role%20skills&geoUrn=...
@@ -40,8 +97,7 @@ def search_candidates(role, skills, location, experience, max_profiles=3):
         search_url = f"https://www.linkedin.com/search/results/people/?keywords={encoded_query}&origin=GLOBAL_SEARCH_HEADER"
         
         print(f"Searching URL: {search_url}")
-        page.goto(search_url)
-        time.sleep(5)
+        await page.goto(search_url, wait_until="domcontentloaded")
         
         # 3. Extract Profile URLs
         # Only get the top N profiles
@@ -51,20 +107,15 @@ def search_candidates(role, skills, location, experience, max_profiles=3):
             # Wait for results to load - Increased timeout to 30 seconds
             # Also check for potential "No results found" or "Sign in" redirects
             try:
-                # Wait longer and try to scroll to trigger lazy loading
-                time.sleep(3)
-                page.evaluate("window.scrollTo(0, 500)")
-                time.sleep(2)
-                
                 # Try to wait for any search results container
-                page.wait_for_selector("div.search-results-container, main.scaffold-layout__main, div.search-results__list", timeout=30000)
+                await page.wait_for_selector("div.search-results-container, main.scaffold-layout__main, div.search-results__list", timeout=30000)
                 print("Search results container found!")
                 
             except Exception as e:
                 print(f"Timeout waiting for results. Current URL: {page.url}")
-                print(f"Page Title: {page.title()}")
+                print(f"Page Title: {await page.title()}")
                 # Dump a snippet of HTML to debug
-                print(f"Page Content Snippet: {page.content()[:500]}...")
+                print(f"Page Content Snippet: {(await page.content())[:500]}...")
                 # If we are on login page, we failed
                 if "login" in page.url or "authwall" in page.url:
                     print("Redirected to login/authwall.")
@@ -73,27 +124,26 @@ def search_candidates(role, skills, location, experience, max_profiles=3):
                 # Try to continue anyway - maybe results are there
                 print("Continuing despite timeout...")
 
-            # Scroll to load more results
-            page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            time.sleep(2)
+            # Scroll until lazy-loaded results stop appearing
+            await scroll_full_page(page)
 
             # Try multiple selector strategies for links
             # Strategy 1: Look for profile links in search results
             links = page.locator("a[href*='/in/'][href*='linkedin.com']")
             
-            if links.count() == 0:
+            if await links.count() == 0:
                  print("Primary link selector failed, trying fallback...")
                  # Strategy 2: Any link containing /in/
                  links = page.locator("a[href*='/in/']")
 
-            count = links.count()
+            count = await links.count()
             
             print(f"Found {count} potential profile links on search page.")
             
             if count == 0:
                 print("No profile links found. Saving page HTML for debugging...")
                 with open("debug_search_page.html", "w", encoding="utf-8") as f:
-                    f.write(page.content())
+                    f.write(await page.content())
                 print("Saved to debug_search_page.html")
             
             seen_urls = set()
@@ -102,7 +152,7 @@ def search_candidates(role, skills, location, experience, max_profiles=3):
                     break
                     
                 try:
-                    href = links.nth(i).get_attribute("href")
+                    href = await links.nth(i).get_attribute("href")
                     # Filter out garbage links, ensure it's a profile
                     # Profile links usually contain /in/ and do not contain 'miniProfile' or similar logic if redundant
                     if href and "/in/" in href:
@@ -124,33 +174,30 @@ def search_candidates(role, skills, location, experience, max_profiles=3):
         except Exception as e:
             print(f"Error extracting search results: {e}")
             
-        # 4. Scrape Each Profile
-        for url in profile_links:
-            print(f"Processing candidate: {url}")
-            try:
-                # Scrape raw HTML
-                raw_html = scrape_profile_content(page, url)
-                
-                # Clean HTML
-                clean_text = linkedin_clean(raw_html)
-                
-                # Extract Data using LLM
-                # We pass text directly now
-                data = extract_profile(text_content=clean_text)
-                
-                if data:
-                    data["linkedin_url"] = url 
-                    profiles_data.append(data)
-                    
-            except Exception as e:
-                print(f"Failed to process {url}: {e}")
-                
-        browser.close()
+        await page.close()
+
+        # 4. Scrape profiles concurrently, each in its own tab of the shared context
+        results = await asyncio.gather(
+            *(
+                scrape_and_extract(context, url, semaphore, on_profile, html_cache, force_refresh, llm)
+                for url in profile_links
+            )
+        )
+        profiles_data = [data for data in results if data]
 
     return profiles_data
 
 if __name__ == "__main__":
     # Test
-    res = search_candidates("Software Engineer", "Python", "San Francisco", "")
+    from app.services.browser_pool import BrowserPool
+
+    async def main():
+        pool = BrowserPool(size=1, max_uses=1, headless=True)
+        try:
+            return await search_candidates("Software Engineer", "Python", "San Francisco", "", pool)
+        finally:
+            await pool.close()
+
+    res = asyncio.run(main())
     import json
     print(json.dumps(res, indent=2))
@@ -0,0 +1,44 @@
+"""
+SQLite Store Base
+Lazily opened SQLite database shared between the event loop and worker threads
+"""
+from typing import Any, Optional
+import os
+import sqlite3
+import threading
+
+
+class SQLiteStore:
+    """
+    Subclasses set SCHEMA (and ROW_FACTORY if they want one) and hold
+    `self._lock` around every use of `self._connect()`: callers reach the
+    store from worker threads, so access is serialized, and the database
+    file and its directory are only created on first use.
+    """
+
+    SCHEMA = ""
+    ROW_FACTORY: Optional[Any] = None
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            if self.ROW_FACTORY is not None:
+                db.row_factory = self.ROW_FACTORY
+            db.executescript(self.SCHEMA)
+            db.commit()
+            self._db = db
+        return self._db
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,158 @@
+"""
+Static Assets
+StaticFiles that serves precompressed, content-versioned copies of the front-end files
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from mimetypes import guess_type
+import gzip
+import hashlib
+import os
+import re
+
+from starlette.datastructures import Headers, QueryParams
+from starlette.responses import Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from app.utils.compression import accepts_encoding
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+COMPRESSIBLE = {".html", ".css", ".js", ".json", ".svg", ".txt"}
+
+# Local stylesheet and script references in the pages, with any ?v= they carry
+ASSET_REF = re.compile(r'\b((?:href|src)=")([\w./-]+\.(?:css|js))(?:\?v=[^"]*)?(")')
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+@dataclass
+class _File:
+    key: Tuple[int, int]
+    raw: bytes
+    version: str
+    # Encoded bodies for the body tagged `tag`; pages change tag when an asset they reference does
+    tag: str = ""
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+
+class AssetFiles(StaticFiles):
+    """
+    Text assets are read once per change and compressed once per encoding,
+    then served from memory. Pages get their stylesheet and script URLs
+    rewritten to `?v=<content hash>`; a request carrying the current hash is
+    cacheable for `max_age` as immutable, anything else (pages included)
+    is `no-cache` and revalidated with its ETag.
+    """
+
+    def __init__(self, *args, min_size: int = 1024, max_age: int = 31536000, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.min_size = min_size
+        self.max_age = max_age
+        self._files: Dict[str, _File] = {}
+
+    def _read(self, full_path: str, stat_result: Optional[os.stat_result] = None) -> Optional[_File]:
+        try:
+            stat_result = stat_result or os.stat(full_path)
+        except OSError:
+            return None
+        key = (stat_result.st_mtime_ns, stat_result.st_size)
+        cached = self._files.get(full_path)
+        if cached is None or cached.key != key:
+            with open(full_path, "rb") as f:
+                raw = f.read()
+            cached = self._files[full_path] = _File(key, raw, _digest(raw))
+        return cached
+
+    def _versioned(self, page_path: str, match: re.Match) -> str:
+        ref = match.group(2)
+        root = os.path.realpath(self.directory)
+        target = os.path.realpath(os.path.join(os.path.dirname(page_path), ref))
+        if os.path.commonpath([root, target]) != root:
+            return match.group(0)
+        asset = self._read(target)
+        if asset is None:
+            return match.group(0)
+        return f"{match.group(1)}{ref}?v={asset.version}{match.group(3)}"
+
+    def _body(self, full_path: str, file: _File) -> Tuple[bytes, str]:
+        if not full_path.endswith(".html"):
+            return file.raw, file.version
+        page = ASSET_REF.sub(lambda match: self._versioned(full_path, match), file.raw.decode("utf-8"))
+        body = page.encode("utf-8")
+        return body, _digest(body)
+
+    def _encode(self, file: _File, body: bytes, tag: str, encoding: str) -> bytes:
+        if file.tag != tag:
+            file.tag, file.encoded = tag, {}
+        if encoding not in file.encoded:
+            if encoding == "br":
+                file.encoded[encoding] = brotli.compress(body)
+            elif encoding == "gzip":
+                file.encoded[encoding] = gzip.compress(body, compresslevel=9, mtime=0)
+            else:
+                file.encoded[encoding] = body
+        return file.encoded[encoding]
+
+    def _encodings(self, body: bytes) -> List[str]:
+        if len(body) < self.min_size:
+            return ["identity"]
+        return (["br"] if brotli else []) + ["gzip", "identity"]
+
+    def precompress(self):
+        """Read and compress every text asset up front, so first requests don't pay for it"""
+        for dirpath, _, filenames in os.walk(self.directory):
+            for name in filenames:
+                full_path = os.path.join(dirpath, name)
+                if os.path.splitext(name)[1] not in COMPRESSIBLE:
+                    continue
+                file = self._read(full_path)
+                if file is None:
+                    continue
+                body, tag = self._body(full_path, file)
+                for encoding in self._encodings(body):
+                    self._encode(file, body, tag, encoding)
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        full_path = str(full_path)
+        if os.path.splitext(full_path)[1] not in COMPRESSIBLE:
+            return super().file_response(full_path, stat_result, scope, status_code)
+
+        file = self._read(full_path, stat_result)
+        body, tag = self._body(full_path, file)
+        request_headers = Headers(scope=scope)
+        accept_encoding = request_headers.get("accept-encoding", "")
+        encoding = next(
+            coding for coding in self._encodings(body) if coding == "identity" or accepts_encoding(accept_encoding, coding)
+        )
+
+        versioned = QueryParams(scope.get("query_string", b"")).get("v") == file.version
+        headers = {
+            "ETag": f'"{tag}"' if encoding == "identity" else f'"{tag}-{encoding}"',
+            "Cache-Control": (
+                f"public, max-age={self.max_age}, immutable"
+                if versioned and not full_path.endswith(".html")
+                else "no-cache"
+            ),
+            "Vary": "Accept-Encoding",
+        }
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        if self.is_not_modified(Headers(headers=headers), request_headers):
+            return NotModifiedResponse(Headers(headers=headers))
+
+        content = self._encode(file, body, tag, encoding)
+        media_type = guess_type(full_path)[0] or "text/plain"
+        return Response(content, status_code=status_code, headers=headers, media_type=media_type)
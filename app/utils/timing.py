@@ -0,0 +1,41 @@
+"""
+Phase Timing
+Collects per-phase wall-clock durations for pipeline reports
+"""
+from contextlib import contextmanager
+from typing import Dict
+import time
+
+
+class PhaseTimer:
+    """Accumulates milliseconds spent in named phases, in first-seen order"""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.phases[name] = round(self.phases.get(name, 0.0) + elapsed, 1)
+
+    def update(self, phases: Dict[str, float]):
+        """Merge phases reported by another timer (its "total" is recomputed here)"""
+        for name, elapsed in phases.items():
+            if name == "total":
+                continue
+            self.phases[name] = round(self.phases.get(name, 0.0) + elapsed, 1)
+
+    def as_dict(self) -> Dict[str, float]:
+        return {**self.phases, "total": round(sum(self.phases.values()), 1)}
+
+    def server_timing(self) -> str:
+        return server_timing(self.phases)
+
+
+def server_timing(timings: Dict[str, float]) -> str:
+    """Format phase timings as a Server-Timing header value"""
+    return ", ".join(f"{name};dur={elapsed}" for name, elapsed in timings.items() if name != "total")
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Bulk-import a directory of saved LinkedIn profile HTML into the scraper table
+"""
+import argparse
+import asyncio
+import json
+
+from app.services.bulk_import import bulk_import
+from app.services.upstream import UpstreamClients
+
+
+async def main(args):
+    async with UpstreamClients() as upstream:
+        return await bulk_import(
+            args.directory,
+            upstream,
+            checkpoint_path=args.checkpoint,
+            workers=args.workers,
+            concurrency=args.concurrency,
+            limit=args.limit,
+            dry_run=args.dry_run,
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("directory", help="Directory searched recursively for .html/.htm files")
+    parser.add_argument("--checkpoint", default="data/import_checkpoint.jsonl",
+                        help="Progress file; files listed here are skipped on rerun")
+    parser.add_argument("--workers", type=int, help="Cleaning processes (default: all cores)")
+    parser.add_argument("--concurrency", type=int, help="Profiles extracted at once (default: OPENAI_MAX_CONCURRENCY)")
+    parser.add_argument("--limit", type=int, help="Import at most this many new files")
+    parser.add_argument("--dry-run", action="store_true", help="Clean and extract without writing to Airtable")
+    summary = asyncio.run(main(parser.parse_args()))
+    print("📊 Import summary:")
+    print(json.dumps(summary, indent=2))
@@ -1,8 +1,12 @@
 
 class AdminDashboard {
     constructor() {
-        this.candidates = [];
+        this.stats = null;
         this.filteredCandidates = [];
+        // The table shows one server-sorted, server-filtered page at a time
+        this.pageSize = 25;
+        this.cursor = null;
+        this.searchTimer = null;
         this.charts = {};
         this.apiBaseUrl = window.location.origin; // Use current domain
         this.securityInitialized = false;
@@ -20,86 +24,105 @@ class AdminDashboard {
     setupEventListeners() {
         const searchInput = document.getElementById('searchInput');
         if (searchInput) {
-            searchInput.addEventListener('input', (e) => {
-                this.filterCandidates(e.target.value);
+            searchInput.addEventListener('input', () => {
+                clearTimeout(this.searchTimer);
+                this.searchTimer = setTimeout(() => this.loadTable(), 300);
             });
         }
 
         ['statusFilter', 'positionFilter', 'dateFilter'].forEach(id => {
             const el = document.getElementById(id);
             if (el) {
-                el.addEventListener('change', () => this.applyFilters());
+                el.addEventListener('change', () => this.loadTable());
             }
         });
+
+        const loadMore = document.getElementById('loadMoreCandidates');
+        if (loadMore) {
+            loadMore.addEventListener('click', () => this.loadTable(true));
+        }
     }
 
-    async loadData() {
-        try {
-            console.log('Loading candidates from backend API...');
+    loadData() {
+        this.loadTable();
+        this.loadAnalytics();
+    }
 
-            const response = await fetch(`${this.apiBaseUrl}/api/admin/candidates`, {
-                method: 'GET',
-                headers: {
-                    "Content-Type": "application/json",
-                },
-            });
+    toRow(record) {
+        return {
+            id: record.id,
+            ...record.fields,
+            interviewDate: record.fields.reportGeneratedAt || new Date().toISOString().split('T')[0]
+        };
+    }
+
+    listParams() {
+        const params = new URLSearchParams({ sort: 'reportGeneratedAt', direction: 'desc', page_size: this.pageSize });
+        const value = id => (document.getElementById(id) || {}).value || '';
+
+        const search = value('searchInput').trim();
+        if (search) params.set('q', search);
+        if (value('statusFilter')) params.set('status', value('statusFilter'));
+        if (value('positionFilter')) params.set('position', value('positionFilter'));
+
+        const days = { today: 1, week: 7, month: 30, quarter: 90 }[value('dateFilter')];
+        if (days) params.set('since_days', days);
+        return params;
+    }
 
-            console.log('Response status:', response.status);
+    // One page of the table; `append` adds the next page below the current rows
+    async loadTable(append = false) {
+        try {
+            const params = this.listParams();
+            if (append && this.cursor) params.set('cursor', this.cursor);
 
+            const response = await fetch(`${this.apiBaseUrl}/api/admin/candidates?${params}`);
             if (!response.ok) {
-                const errorText = await response.text();
-                console.error('Response error:', errorText);
+                console.error('Response error:', await response.text());
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
 
             const data = await response.json();
-            console.log('Raw data received:', data);
-            console.log('Number of records:', data.records?.length || 0);
+            const rows = (data.records || []).map(record => this.toRow(record));
+            this.filteredCandidates = append ? this.filteredCandidates.concat(rows) : rows;
+            this.cursor = data.offset || null;
 
-            if (!data.records || data.records.length === 0) {
-                console.warn('No records found');
+            const filtered = ['q', 'status', 'position', 'since_days'].some(key => params.has(key));
+            if (this.filteredCandidates.length === 0 && !filtered) {
                 this.handleNoData();
-                return;
+            } else {
+                this.renderTable();
             }
+        } catch (error) {
+            console.error('Error loading data:', error);
+            this.cursor = null;
+            this.handleError(error);
+        }
 
-            this.candidates = data.records.map(record => ({
-                id: record.id,
-                ...record.fields,
-                interviewDate: record.fields.reportGeneratedAt || new Date().toISOString().split('T')[0]
-            }));
-
-            console.log('Processed candidates:', this.candidates);
-
-            this.filteredCandidates = [...this.candidates];
+        const loadMore = document.getElementById('loadMoreCandidates');
+        if (loadMore) loadMore.style.display = this.cursor ? 'block' : 'none';
+    }
 
-            // Sort by date descending (latest first)
-            this.filteredCandidates.sort((a, b) => new Date(b.interviewDate) - new Date(a.interviewDate));
+    // Summary cards and charts come precomputed from the server
+    async loadAnalytics() {
+        try {
+            const response = await fetch(`${this.apiBaseUrl}/api/admin/stats`);
+            if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
 
+            this.stats = await response.json();
             this.updateAnalytics();
             this.initializeCharts();
-            this.renderTable();
-
         } catch (error) {
-            console.error('Error loading data:', error);
-            this.handleError(error);
+            console.error('Error loading analytics:', error);
         }
     }
 
     updateAnalytics() {
-        const total = this.candidates.length;
-        const recommended = this.candidates.filter(c =>
-            c.status && c.status.toLowerCase().includes('select')
-        ).length;
-
-        const averageScore = this.candidates.reduce((sum, c) =>
-            sum + (parseFloat(c.overallScore) || 0), 0) / (total || 1);
-
-        const averageDuration = this.calculateAverageDuration();
-
-        this.animateCounter('totalCandidates', total);
-        this.animateCounter('recommendedCandidates', recommended);
-        this.animateValue('averageScore', averageScore.toFixed(1));
-        this.animateValue('averageDuration', `${averageDuration}m`);
+        const stats = this.stats;
+        this.animateCounter('totalCandidates', stats.total);
+        this.animateCounter('recommendedCandidates', stats.recommended);
+        this.animateValue('averageScore', stats.average_score.toFixed(1));
+        this.animateValue('averageDuration', `${stats.average_duration_minutes}m`);
     }
 
     animateCounter(elementId, target) {
@@ -126,20 +149,6 @@ class AdminDashboard {
         }, 500);
     }
 
-    calculateAverageDuration() {
-        const durations = this.candidates
-            .map(c => c.interviewDuration)
-            .filter(d => d)
-            .map(d => {
-                const match = d.match(/(\d+):(\d+)/);
-                return match ? parseInt(match[1]) : 25;
-            });
-
-        return durations.length > 0
-            ? Math.round(durations.reduce((a, b) => a + b, 0) / durations.length)
-            : 25;
-    }
-
     initializeCharts() {
         this.createTrendsChart();
         this.createScoresChart();
@@ -150,54 +159,16 @@ class AdminDashboard {
         if (!canvas) return;
         const ctx = canvas.getContext('2d');
 
-        // Group interviews by date
-        const dateGroups = {};
-
-        this.candidates.forEach(candidate => {
-            const dateStr = candidate.reportGeneratedAt;
-            if (!dateStr) return;
-
-            // Extract just the date part (YYYY-MM-DD)
-            const date = dateStr.split('T')[0];
+        // Daily totals for the last 30 days, oldest first
+        const last30Days = this.stats.trend.map(day => day.date);
 
-            if (!dateGroups[date]) {
-                dateGroups[date] = {
-                    total: 0,
-                    recommended: 0
-                };
-            }
-
-            dateGroups[date].total++;
-
-            // Check if recommended
-            if (candidate.status && candidate.status.toLowerCase().includes('select')) {
-                dateGroups[date].recommended++;
-            }
-        });
-
-        // Get last 30 days
-        const today = new Date();
-        const last30Days = [];
-        for (let i = 29; i >= 0; i--) {
-            const date = new Date(today);
-            date.setDate(date.getDate() - i);
-            const dateStr = date.toISOString().split('T')[0];
-            last30Days.push(dateStr);
-        }
-
-        // Prepare data arrays
         const labels = last30Days.map(dateStr => {
             const date = new Date(dateStr);
             return `${date.getMonth() + 1}/${date.getDate()}`;
         });
 
-        const interviewsData = last30Days.map(dateStr => {
-            return dateGroups[dateStr] ? dateGroups[dateStr].total : 0;
-        });
-
-        const recommendedData = last30Days.map(dateStr => {
-            return dateGroups[dateStr] ? dateGroups[dateStr].recommended : 0;
-        });
+        const interviewsData = this.stats.trend.map(day => day.total);
+        const recommendedData = this.stats.trend.map(day => day.recommended);
 
         if (this.charts.trends) this.charts.trends.destroy();
 
@@ -267,21 +238,14 @@ class AdminDashboard {
         if (!canvas) return;
         const ctx = canvas.getContext('2d');
 
+        const distribution = this.stats.score_distribution;
         const scoreRanges = {
-            'Excellent (45-50)': 0,
-            'Good (35-44.9)': 0,
-            'Fair (25-34.9)': 0,
-            'Poor (0-24.9)': 0
+            'Excellent (45-50)': distribution.excellent,
+            'Good (35-44.9)': distribution.good,
+            'Fair (25-34.9)': distribution.fair,
+            'Poor (0-24.9)': distribution.poor
         };
 
-        this.candidates.forEach(candidate => {
-            const score = parseFloat(candidate.overallScore) || 0;
-            if (score >= 45) scoreRanges['Excellent (45-50)']++;
-            else if (score >= 35) scoreRanges['Good (35-44.9)']++;
-            else if (score >= 25) scoreRanges['Fair (25-34.9)']++;
-            else scoreRanges['Poor (0-24.9)']++;
-        });
-
         if (this.charts.scores) this.charts.scores.destroy();
 
         this.charts.scores = new Chart(ctx, {
@@ -315,12 +279,9 @@ class AdminDashboard {
         if (!tbody) return;
         tbody.innerHTML = '';
 
-        // Ensure sorting is maintained (latest first)
-        this.filteredCandidates.sort((a, b) => new Date(b.interviewDate) - new Date(a.interviewDate));
-
         this.filteredCandidates.forEach((candidate, index) => {
             const row = document.createElement('tr');
-            row.style.animationDelay = `${index * 0.05}s`;
+            row.style.animationDelay = `${(index % this.pageSize) * 0.05}s`;
 
             row.innerHTML = `
                 <td>
@@ -348,69 +309,6 @@ class AdminDashboard {
     
 
     
-    // Override critical methods with security checks
-    loadData() {
-
-        
-        // Original loadData logic with security monitoring
-        try {
-            console.log('Loading candidates from backend API...');
-
-            const response = fetch(`${this.apiBaseUrl}/api/admin/candidates`, {
-                method: 'GET',
-                headers: {
-                    "Content-Type": "application/json",
-                },
-            });
-
-            response.then(response => {
-                console.log('Response status:', response.status);
-
-                if (!response.ok) {
-                    const errorText = response.text();
-                    console.error('Response error:', errorText);
-                    throw new Error(`HTTP error! status: ${response.status}`);
-                }
-
-                return response.json();
-            }).then(data => {
-                console.log('Raw data received:', data);
-                console.log('Number of records:', data.records?.length || 0);
-
-                if (!data.records || data.records.length === 0) {
-                    console.warn('No records found');
-                    this.handleNoData();
-                    return;
-                }
-
-                this.candidates = data.records.map(record => ({
-                    id: record.id,
-                    ...record.fields,
-                    interviewDate: record.fields.reportGeneratedAt || new Date().toISOString().split('T')[0]
-                }));
-
-                console.log('Processed candidates:', this.candidates);
-
-                this.filteredCandidates = [...this.candidates];
-
-                // Sort by date descending (latest first)
-                this.filteredCandidates.sort((a, b) => new Date(b.interviewDate) - new Date(a.interviewDate));
-
-                this.updateAnalytics();
-                this.initializeCharts();
-                this.renderTable();
-
-            }).catch(error => {
-                console.error('Error loading data:', error);
-                this.handleError(error);
-            });
-
-        } catch (error) {
-            console.error('Error loading data:', error);
-            this.handleError(error);
-        }
-    }
-
     formatScore(score) {
         if (!score) return '<span class="score-badge score-poor">N/A</span>';
 
@@ -455,76 +353,6 @@ class AdminDashboard {
         }
     }
 
-    filterCandidates(searchTerm) {
-        const term = searchTerm.toLowerCase().trim();
-
-        this.filteredCandidates = this.candidates.filter(candidate => {
-            return (
-                (candidate.candidateName || '').toLowerCase().includes(term) ||
-                (candidate.candidateEmail || '').toLowerCase().includes(term) ||
-                (candidate.positionApplied || '').toLowerCase().includes(term)
-            );
-        });
-
-        this.renderTable();
-    }
-
-    applyFilters() {
-        const statusFilter = document.getElementById('statusFilter').value;
-        const positionFilter = document.getElementById('positionFilter').value;
-        const dateFilter = document.getElementById('dateFilter').value;
-        const searchInput = document.getElementById('searchInput');
-        const searchTerm = searchInput ? searchInput.value : '';
-
-        this.filteredCandidates = this.candidates.filter(candidate => {
-            if (statusFilter && candidate.status) {
-                const status = candidate.status.toLowerCase();
-                if (statusFilter === 'recommended' && !status.includes('select') && !status.includes('recommend')) return false;
-                if (statusFilter === 'not-recommended' && !status.includes('reject')) return false;
-                if (statusFilter === 'pending' && (status.includes('select') || status.includes('reject'))) return false;
-            }
-
-            if (positionFilter && candidate.positionApplied) {
-                const position = candidate.positionApplied.toLowerCase();
-                if (!position.includes(positionFilter.toLowerCase())) return false;
-            }
-
-            if (dateFilter !== 'all') {
-                const candidateDate = new Date(candidate.interviewDate || new Date());
-                const now = new Date();
-                const daysDiff = Math.floor((now - candidateDate) / (1000 * 60 * 60 * 24));
-
-                switch (dateFilter) {
-                    case 'today':
-                        if (daysDiff > 0) return false;
-                        break;
-                    case 'week':
-                        if (daysDiff > 7) return false;
-                        break;
-                    case 'month':
-                        if (daysDiff > 30) return false;
-                        break;
-                    case 'quarter':
-                        if (daysDiff > 90) return false;
-                        break;
-                }
-            }
-
-            if (searchTerm) {
-                const term = searchTerm.toLowerCase();
-                return (
-                    (candidate.candidateName || '').toLowerCase().includes(term) ||
-                    (candidate.candidateEmail || '').toLowerCase().includes(term) ||
-                    (candidate.positionApplied || '').toLowerCase().includes(term)
-                );
-            }
-
-            return true;
-        });
-
-        this.renderTable();
-    }
-
     handleNoData() {
         const tbody = document.getElementById('candidatesTableBody');
         if (!tbody) return;
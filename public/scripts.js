@@ -1,39 +1,56 @@
-// Load User Data from Backend
-async function loadUserData() {
+// Candidates are fetched a page at a time, sorted and filtered by the server
+const USER_PAGE_SIZE = 24;
+let allUsers = [];
+let userCursor = null;
+let userSearchTerm = "";
+
+function userListParams() {
+    const params = new URLSearchParams({ sort: "createdTime", direction: "desc" });
+    if (userSearchTerm) params.set("q", userSearchTerm);
+    return params;
+}
+
+// Load User Data from Backend; `append` fetches the next page
+async function loadUserData(append = false) {
     const loading = document.getElementById("loading");
     const userGrid = document.getElementById("userGrid");
     const emptyState = document.getElementById("emptyState");
 
     loading.style.display = "block";
-    userGrid.innerHTML = "";
+    if (!append) {
+        userCursor = null;
+        userGrid.innerHTML = "";
+    }
     emptyState.style.display = "none";
 
     try {
-        const response = await fetch('/api/candidates');
+        const params = userListParams();
+        params.set("page_size", USER_PAGE_SIZE);
+        if (append && userCursor) params.set("cursor", userCursor);
+
+        const response = await fetch(`/api/candidates?${params}`);
 
         if (!response.ok) {
             throw new Error("Failed to fetch data from Airtable");
         }
 
         const data = await response.json();
-        allUsers = data.records || [];
-
-        // Sort users by createdTime (descending) to show newest first
-        allUsers.sort((a, b) => {
-            const dateA = new Date(a.createdTime || 0);
-            const dateB = new Date(b.createdTime || 0);
-            return dateB - dateA;
-        });
+        const records = data.records || [];
+        allUsers = append ? allUsers.concat(records) : records;
+        userCursor = data.offset || null;
 
         displayUsers(allUsers);
         updateStats();
     } catch (error) {
         console.error("Error loading data from Airtable:", error);
+        userCursor = null;
         emptyState.style.display = "block";
         document.querySelector("#emptyState h3").textContent = "Error Loading Data";
         document.querySelector("#emptyState p").textContent = "Failed to load candidate data from Airtable. Please check your connection and try again.";
     }
 
+    const loadMore = document.getElementById("loadMoreUsers");
+    if (loadMore) loadMore.style.display = userCursor ? "block" : "none";
     loading.style.display = "none";
 }
 
@@ -250,9 +267,9 @@ function closeModal() {
     document.getElementById("modal").classList.remove("show");
 }
 
-// Update Statistics
+// Update Statistics (for the pages loaded so far)
 function updateStats() {
-    document.getElementById("totalUsers").textContent = allUsers.length;
+    document.getElementById("totalUsers").textContent = allUsers.length + (userCursor ? "+" : "");
 
     let totalQuestions = 0;
     allUsers.forEach((user) => {
@@ -266,24 +283,24 @@ function updateStats() {
     document.getElementById("totalQuestions").textContent = totalQuestions;
 }
 
-// Search Functionality
+// Search Functionality (filtered by the server once typing pauses)
+let searchTimer = null;
 document.getElementById("searchInput").addEventListener("input", (e) => {
-    const searchTerm = e.target.value.toLowerCase();
-    const filtered = allUsers.filter((user) => {
-        const fields = user.fields || user;
-        return (
-            (fields.Name || "").toLowerCase().includes(searchTerm) ||
-            (fields.email || "").toLowerCase().includes(searchTerm) ||
-            (fields.skills || "").toLowerCase().includes(searchTerm) ||
-            (fields.profession || "").toLowerCase().includes(searchTerm)
-        );
-    });
-    displayUsers(filtered);
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(() => {
+        userSearchTerm = e.target.value.trim();
+        loadUserData();
+    }, 300);
 });
 
-// Export Data to CSV
-function exportData() {
-    const csv = convertToCSV(allUsers);
+// Export Data to CSV (every matching candidate, not just the loaded pages)
+async function exportData() {
+    let users = allUsers;
+    if (userCursor) {
+        const response = await fetch(`/api/candidates?${userListParams()}`);
+        if (response.ok) users = (await response.json()).records || [];
+    }
+    const csv = convertToCSV(users);
     const blob = new Blob([csv], { type: "text/csv" });
     const url = window.URL.createObjectURL(blob);
     const a = document.createElement("a");
@@ -838,6 +855,43 @@ function switchScraperTab(tabName) {
     }
 }
 
+// Scrapes run as background jobs: submit one, then poll it until it finishes.
+// `onPartial` receives the results reported so far whenever new ones arrive.
+const JOB_POLL_INTERVAL_MS = 2000;
+
+async function runScraperJob(kind, body, onPartial) {
+    const submitted = await fetch(`/api/scraper/jobs/${kind}`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify(body)
+    });
+    if (!submitted.ok) {
+        const errorText = await submitted.text();
+        throw new Error(errorText || `Failed to start ${kind}`);
+    }
+
+    let job = await submitted.json();
+    let seen = 0;
+    while (!["succeeded", "failed", "cancelled"].includes(job.status)) {
+        await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+        const response = await fetch(`/api/scraper/jobs/${job.job_id}`);
+        if (!response.ok) {
+            throw new Error(`Failed to check ${kind} progress`);
+        }
+        job = await response.json();
+        const partial = job.partial_results || [];
+        if (onPartial && partial.length > seen) {
+            seen = partial.length;
+            onPartial(partial);
+        }
+    }
+
+    if (job.status !== "succeeded") {
+        throw new Error(job.error || `The ${kind} was ${job.status}`);
+    }
+    return job.result;
+}
+
 // Scrape Single Profile
 async function scrapeSingleProfile() {
     const url = document.getElementById("linkedinUrlInput").value.trim();
@@ -857,18 +911,8 @@ async function scrapeSingleProfile() {
     resultElement.innerHTML = "";
 
     try {
-        const response = await fetch("/api/scraper/scrape", {
-            method: "POST",
-            headers: { "Content-Type": "application/json" },
-            body: JSON.stringify({ url })
-        });
-
-        if (!response.ok) {
-            const errorText = await response.text();
-            throw new Error(errorText || "Failed to scrape profile");
-        }
-
-        const data = await response.json();
+        const result = await runScraperJob("scrape", { url });
+        const data = result.profile;
         loadingElement.classList.remove("show");
         
         // Display result
@@ -906,18 +950,15 @@ async function searchLinkedInCandidates() {
     resultElement.innerHTML = "";
 
     try {
-        const response = await fetch("/api/scraper/search", {
-            method: "POST",
-            headers: { "Content-Type": "application/json" },
-            body: JSON.stringify({ role, skills, location, experience })
+        // Show profiles as they are scraped; the final list adds their Airtable IDs
+        const data = await runScraperJob("search", { role, skills, location, experience }, partial => {
+            resultElement.innerHTML = `
+                <h3 style="margin: 20px 0 15px 0;">Scraped ${partial.length} Candidates so far...</h3>
+                <div style="display: grid; gap: 15px;">
+                    ${partial.map(candidate => createCandidateCard(candidate, false)).join('')}
+                </div>
+            `;
         });
-
-        if (!response.ok) {
-            const errorText = await response.text();
-            throw new Error(errorText || "Failed to search candidates");
-        }
-
-        const data = await response.json();
         loadingElement.classList.remove("show");
         
         if (data && data.length > 0) {
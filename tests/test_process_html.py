@@ -0,0 +1,32 @@
+from app.utils.reader.process_html import dedupe_lines
+
+
+def test_repeated_titles_and_companies_are_kept():
+    texts = [
+        "Software Engineer", "Software Engineer",
+        "Google · Full-time", "Google · Full-time",
+        "Bengaluru, Karnataka, India", "Bengaluru, Karnataka, India",
+        "Software Engineer", "Software Engineer",
+        "Infosys · Full-time", "Infosys · Full-time",
+        "Bengaluru, Karnataka, India", "Bengaluru, Karnataka, India",
+        "Intern",
+        "Infosys · Full-time",
+        "Mysuru, Karnataka, India",
+    ]
+    assert dedupe_lines(texts) == [
+        "Software Engineer",
+        "Google · Full-time",
+        "Bengaluru, Karnataka, India",
+        "Software Engineer",
+        "Infosys · Full-time",
+        "Bengaluru, Karnataka, India",
+        "Intern",
+        "Infosys · Full-time",
+        "Mysuru, Karnataka, India",
+    ]
+
+
+def test_boilerplate_and_repeated_long_lines_are_dropped():
+    headline = "Senior Backend Engineer building payment systems at scale"
+    texts = [headline, "Show all", "Connect", "About", "Python", "Kubernetes", "People also viewed", headline]
+    assert dedupe_lines(texts) == [headline, "About", "Python", "Kubernetes"]